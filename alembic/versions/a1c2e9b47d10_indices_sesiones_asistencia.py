@@ -0,0 +1,65 @@
+"""Indices compuestos para sesiones_asistencia y asistencias_estudiantes
+
+Revision ID: a1c2e9b47d10
+Revises: 3f6984d24a63
+Create Date: 2025-08-29 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c2e9b47d10'
+down_revision: Union[str, Sequence[str], None] = '3f6984d24a63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_sesion_docente_periodo_estado',
+            'sesiones_asistencia',
+            ['docente_id', 'periodo_id', 'estado'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_sesion_curso_materia',
+            'sesiones_asistencia',
+            ['curso_id', 'materia_id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_sesion_activa',
+            'sesiones_asistencia',
+            ['docente_id'],
+            postgresql_where=sa.text("estado = 'activa'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_asistencia_sesion_estudiante',
+            'asistencias_estudiantes',
+            ['sesion_id', 'estudiante_id'],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_asistencia_estudiante_presente',
+            'asistencias_estudiantes',
+            ['estudiante_id', 'presente'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_asistencia_estudiante_presente', table_name='asistencias_estudiantes')
+    op.drop_index('ix_asistencia_sesion_estudiante', table_name='asistencias_estudiantes')
+    op.drop_index('ix_sesion_activa', table_name='sesiones_asistencia')
+    op.drop_index('ix_sesion_curso_materia', table_name='sesiones_asistencia')
+    op.drop_index('ix_sesion_docente_periodo_estado', table_name='sesiones_asistencia')
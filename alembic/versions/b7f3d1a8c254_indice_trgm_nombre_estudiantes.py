@@ -0,0 +1,32 @@
+"""Indice trigram para busqueda por nombre de estudiantes
+
+Revision ID: b7f3d1a8c254
+Revises: a1c2e9b47d10
+Create Date: 2025-08-29 11:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7f3d1a8c254'
+down_revision: Union[str, Sequence[str], None] = 'a1c2e9b47d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS estudiantes_nombre_trgm '
+        'ON estudiantes USING gin (nombre gin_trgm_ops)'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP INDEX IF EXISTS estudiantes_nombre_trgm')
@@ -0,0 +1,70 @@
+"""Indices compuestos para los filtros de info-academica
+
+Revision ID: c9e4f2b61a83
+Revises: b7f3d1a8c254
+Create Date: 2025-08-29 14:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e4f2b61a83'
+down_revision: Union[str, Sequence[str], None] = 'b7f3d1a8c254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_evaluacion_est_mat_per_tipo',
+            'evaluaciones',
+            ['estudiante_id', 'materia_id', 'periodo_id', 'tipo_evaluacion_id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_rendimiento_est_mat_per',
+            'rendimiento_final',
+            ['estudiante_id', 'materia_id', 'periodo_id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_prediccion_est_mat_per',
+            'prediccion_rendimiento',
+            ['estudiante_id', 'materia_id', 'periodo_id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_peso_doc_mat_gestion_tipo',
+            'peso_tipo_evaluacion',
+            ['docente_id', 'materia_id', 'gestion_id', 'tipo_evaluacion_id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_inscripcion_est_gestion',
+            'inscripciones',
+            ['estudiante_id', 'gestion_id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_periodo_gestion_fechas',
+            'periodos',
+            ['gestion_id', 'fecha_inicio', 'fecha_fin'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_periodo_gestion_fechas', table_name='periodos')
+    op.drop_index('ix_inscripcion_est_gestion', table_name='inscripciones')
+    op.drop_index('ix_peso_doc_mat_gestion_tipo', table_name='peso_tipo_evaluacion')
+    op.drop_index('ix_prediccion_est_mat_per', table_name='prediccion_rendimiento')
+    op.drop_index('ix_rendimiento_est_mat_per', table_name='rendimiento_final')
+    op.drop_index('ix_evaluacion_est_mat_per_tipo', table_name='evaluaciones')
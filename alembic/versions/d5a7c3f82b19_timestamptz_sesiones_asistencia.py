@@ -0,0 +1,66 @@
+"""Columnas de fecha de sesiones/asistencias a timestamptz
+
+Revision ID: d5a7c3f82b19
+Revises: c9e4f2b61a83
+Create Date: 2025-08-30 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a7c3f82b19'
+down_revision: Union[str, Sequence[str], None] = 'c9e4f2b61a83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Los modelos declaran DateTime(timezone=True) pero la migración inicial
+# creó estas columnas como timestamp sin zona: psycopg2 devolvía datetimes
+# naive y toda comparación contra datetime.now(timezone.utc) lanzaba
+# TypeError. Los valores existentes se grabaron con func.now() del
+# servidor, así que se reinterpretan en la zona del servidor.
+_COLUMNAS = {
+    'sesiones_asistencia': [
+        ('fecha_inicio', False),
+        ('fecha_fin', True),
+        ('fecha_creacion', True),
+        ('fecha_actualizacion', True),
+    ],
+    'asistencias_estudiantes': [
+        ('fecha_marcado', True),
+        ('fecha_creacion', True),
+        ('fecha_actualizacion', True),
+    ],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for tabla, columnas in _COLUMNAS.items():
+        for columna, nullable in columnas:
+            op.alter_column(
+                tabla,
+                columna,
+                type_=sa.DateTime(timezone=True),
+                existing_type=sa.DateTime(),
+                existing_nullable=nullable,
+                postgresql_using=f"{columna} AT TIME ZONE 'UTC'",
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for tabla, columnas in _COLUMNAS.items():
+        for columna, nullable in columnas:
+            op.alter_column(
+                tabla,
+                columna,
+                type_=sa.DateTime(),
+                existing_type=sa.DateTime(timezone=True),
+                existing_nullable=nullable,
+                postgresql_using=f"{columna} AT TIME ZONE 'UTC'",
+            )
@@ -0,0 +1,63 @@
+"""Indices de evaluaciones y periodos declarados en los modelos
+
+Revision ID: e8b5f6d13c47
+Revises: d5a7c3f82b19
+Create Date: 2025-08-30 11:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b5f6d13c47'
+down_revision: Union[str, Sequence[str], None] = 'd5a7c3f82b19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    with op.get_context().autocommit_block():
+        # Índice cubriente de los filtros del router de evaluaciones: el
+        # INCLUDE deja valor/descripcion en el índice para que el detalle
+        # de los resúmenes salga con un index-only scan
+        op.create_index(
+            'ix_eval_est_per_tipo_mat_fec',
+            'evaluaciones',
+            ['estudiante_id', 'periodo_id', 'tipo_evaluacion_id', 'materia_id', 'fecha'],
+            postgresql_include=['valor', 'descripcion'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_periodo_fechas',
+            'periodos',
+            ['fecha_inicio', 'fecha_fin'],
+            postgresql_concurrently=True,
+        )
+        # Barridos por materia+periodo (reenviar notificaciones, listados
+        # masivos por fecha)
+        op.create_index(
+            'ix_eval_materia_periodo',
+            'evaluaciones',
+            ['materia_id', 'periodo_id'],
+            postgresql_concurrently=True,
+        )
+        # Índice funcional del lookup case-insensitive por nombre de tipo
+        op.create_index(
+            'ix_tipoevaluacion_lower_nombre',
+            'tipoevaluaciones',
+            [sa.text('lower(nombre)')],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tipoevaluacion_lower_nombre', table_name='tipoevaluaciones')
+    op.drop_index('ix_eval_materia_periodo', table_name='evaluaciones')
+    op.drop_index('ix_periodo_fechas', table_name='periodos')
+    op.drop_index('ix_eval_est_per_tipo_mat_fec', table_name='evaluaciones')
@@ -5,11 +5,18 @@ from app.auth.auth_handler import verificar_token
 
 class JWTBearer(HTTPBearer):
     async def __call__(self, request: Request):
+        # Varios dependencies (roles + endpoints) instancian JWTBearer por
+        # separado: verificar una sola vez por request y reutilizar el payload
+        payload = getattr(request.state, "jwt_payload", None)
+        if payload is not None:
+            return payload
+
         credentials: HTTPAuthorizationCredentials = await super().__call__(request)
         if credentials:
             payload = verificar_token(credentials.credentials)
             if payload is None:
                 raise HTTPException(status_code=403, detail="Token inválido o expirado")
+            request.state.jwt_payload = payload
             return payload
         else:
             raise HTTPException(status_code=403, detail="Token requerido")
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from cachetools import TTLCache
 from jose import jwt, JWTError
 from dotenv import load_dotenv
 import os
@@ -10,6 +11,12 @@ ALGORITHM = "HS256"
 EXPIRE_MINUTES = 60
 EXPIRE_YEARS = 10
 
+# Tokens ya verificados (token -> payload): requests repetidos del mismo
+# cliente se saltan la verificación de firma durante unos minutos. Los
+# tokens no llevan jti, así que la clave es el token completo; tampoco
+# hay logout del lado del servidor que requiera invalidación explícita.
+_payload_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
 
 def crear_token(data: dict):
     to_encode = data.copy()
@@ -19,8 +26,12 @@ def crear_token(data: dict):
 
 
 def verificar_token(token: str):
+    payload = _payload_cache.get(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        _payload_cache[token] = payload
         return payload
     except JWTError:
         return None
@@ -1,5 +1,7 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.orm import Session
 from app.auth.auth_bearer import JWTBearer
+from app.deps import get_db
 from jose import jwt, JWTError  # type: ignore
 from app.config import settings
 
@@ -23,8 +25,13 @@ def docente_o_admin_required(payload: dict = Depends(JWTBearer())):
     return payload
 
 
-def docente_o_admin_required(payload: dict = Depends(JWTBearer())):
-    """Docentes o administradores"""
+async def docente_o_admin_required(payload: dict = Depends(JWTBearer())):
+    """Docentes o administradores.
+
+    async para que el check (solo lee el payload del JWT, sin tocar la
+    base) corra en el event loop en vez de ocupar un hilo del threadpool
+    en cada request.
+    """
     user_type = payload.get("user_type")
     is_doc = payload.get("is_doc")
 
@@ -87,3 +94,26 @@ def propietario_o_admin(payload: dict = Depends(JWTBearer())):
     Nota: La verificación específica se hace en el endpoint
     """
     return payload
+
+
+def usuario_actual(
+    request: Request,
+    payload: dict = Depends(JWTBearer()),
+    db: Session = Depends(get_db),
+):
+    """Perfil del usuario autenticado, cargado una sola vez por request.
+
+    Los checks de rol de este módulo solo leen el payload del JWT, pero
+    cuando varias dependencias/endpoints necesitan la fila del usuario,
+    cada una dispara su propio SELECT. Memoizar en request.state colapsa
+    esos fetches a uno.
+    """
+    usuario = getattr(request.state, "current_user", None)
+    if usuario is None:
+        from app.services.auth_service import AuthService
+
+        usuario = AuthService.get_user_profile(
+            db, payload.get("user_id"), payload.get("user_type")
+        )
+        request.state.current_user = usuario
+    return usuario
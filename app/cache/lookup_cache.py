@@ -0,0 +1,23 @@
+from cachetools import TTLCache
+from sqlalchemy import event
+
+
+def cache_de_modelo(*modelos, maxsize: int = 64, ttl: int = 60) -> TTLCache:
+    """Crea un TTLCache invalidado por escrituras sobre los modelos dados.
+
+    Para tablas de consulta casi estáticas (cursos, materias, tipos de
+    evaluación) los listados se sirven desde memoria durante el TTL; un
+    insert/update/delete sobre cualquiera de los modelos limpia el cache
+    del proceso. El TTL corto acota la ventana de inconsistencia entre
+    workers, que no comparten memoria.
+    """
+    cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _invalidar(mapper, connection, target):
+        cache.clear()
+
+    for modelo in modelos:
+        for nombre_evento in ("after_insert", "after_update", "after_delete"):
+            event.listen(modelo, nombre_evento, _invalidar)
+
+    return cache
@@ -0,0 +1,36 @@
+from fastapi import Request
+from sqlalchemy.orm import Session
+
+
+class RequestCache:
+    """Cache de objetos por request, keyed por (modelo, pk).
+
+    Evita re-consultar la misma fila (docente/curso/materia) cuando un
+    endpoint la necesita para autorización y de nuevo para la lógica de
+    negocio. El cache vive en request.state y muere con el request, así
+    que no necesita invalidación.
+    """
+
+    def __init__(self):
+        self._objetos = {}
+
+    def get_or_load(self, db: Session, modelo, pk):
+        """Obtiene un objeto por PK, usando el cache del request si ya se cargó"""
+        clave = (modelo, pk)
+        if clave not in self._objetos:
+            # db.get() aprovecha el identity map de la sesión antes de ir a la BD
+            self._objetos[clave] = db.get(modelo, pk)
+        return self._objetos[clave]
+
+    def invalidar(self, modelo, pk):
+        """Descarta una entrada (por si el objeto se modifica en el request)"""
+        self._objetos.pop((modelo, pk), None)
+
+
+def get_request_cache(request: Request) -> RequestCache:
+    """Dependencia FastAPI: un RequestCache compartido por todo el request"""
+    cache = getattr(request.state, "cache", None)
+    if cache is None:
+        cache = RequestCache()
+        request.state.cache = cache
+    return cache
@@ -1,3 +1,5 @@
+from io import BytesIO
+
 import cloudinary
 import cloudinary.uploader # type: ignore
 import os
@@ -16,3 +18,18 @@ def subir_imagen_a_cloudinary(file, nombre_completo: str):
     carpeta = f"perfil/{nombre_completo.replace(' ', '_')}"
     result = cloudinary.uploader.upload(file.file, folder=carpeta)
     return result.get("secure_url")
+
+
+def subir_bytes_a_cloudinary(contenido: bytes, nombre_completo: str):
+    """Sube una imagen ya leída en memoria (para tareas en segundo plano).
+
+    upload_large envía el contenido en chunks multipart, de modo que el
+    SDK no duplica la imagen completa en otro buffer antes del POST.
+    """
+    carpeta = f"perfil/{nombre_completo.replace(' ', '_')}"
+    buffer = BytesIO(contenido)
+    buffer.seek(0)
+    result = cloudinary.uploader.upload_large(
+        buffer, folder=carpeta, chunk_size=6_000_000
+    )
+    return result.get("secure_url")
@@ -1,6 +1,10 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from app.cache.lookup_cache import cache_de_modelo
 from app.models.curso import Curso
-from app.schemas.curso import CursoCreate, CursoUpdate
+from app.schemas.curso import CursoCreate, CursoOut, CursoUpdate
+
+_cache_cursos = cache_de_modelo(Curso)
 
 
 def crear_curso(db: Session, curso: CursoCreate):
@@ -12,7 +16,23 @@ def crear_curso(db: Session, curso: CursoCreate):
 
 
 def obtener_cursos(db: Session):
-    return db.query(Curso).all()
+    cursos = _cache_cursos.get("lista")
+    if cursos is not None:
+        return cursos
+
+    # Proyección de columnas: evita hidratar objetos ORM completos y
+    # model_construct salta la re-validación (los datos vienen de la BD)
+    rows = db.execute(
+        select(Curso.id, Curso.nombre, Curso.nivel, Curso.paralelo, Curso.turno)
+    ).all()
+    cursos = [
+        CursoOut.model_construct(
+            id=r.id, nombre=r.nombre, nivel=r.nivel, paralelo=r.paralelo, turno=r.turno
+        )
+        for r in rows
+    ]
+    _cache_cursos["lista"] = cursos
+    return cursos
 
 
 def obtener_curso_por_id(db: Session, curso_id: int):
@@ -1,4 +1,7 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from app.cache.lookup_cache import cache_de_modelo
+from app.deps import opciones_raiseload
 from app.models.curso import Curso
 from app.models.curso_materia import CursoMateria
 from app.models.docente import Docente
@@ -6,7 +9,7 @@ from app.models.docente_materia import DocenteMateria
 from app.models.estudiante import Estudiante
 from app.models.inscripcion import Inscripcion
 from app.models.materia import Materia
-from app.schemas.docente import DocenteCreate, DocenteUpdate
+from app.schemas.docente import DocenteCreate, DocenteOut, DocenteUpdate
 from passlib.hash import bcrypt  # type: ignore
 
 
@@ -48,12 +51,49 @@ def eliminar_docente(db: Session, docente_id: int):
     return doc
 
 
+_cache_docentes = cache_de_modelo(Docente)
+
+
+def _listar_docentes_por_rol(db: Session, is_doc: bool):
+    docentes = _cache_docentes.get(is_doc)
+    if docentes is not None:
+        return docentes
+
+    # Proyección de columnas (sin contraseña ni hidratación ORM) y
+    # model_construct para saltar la re-validación de datos de la BD
+    rows = db.execute(
+        select(
+            Docente.id,
+            Docente.nombre,
+            Docente.apellido,
+            Docente.telefono,
+            Docente.correo,
+            Docente.genero,
+            Docente.is_doc,
+        ).where(Docente.is_doc == is_doc)
+    ).all()
+    docentes = [
+        DocenteOut.model_construct(
+            id=r.id,
+            nombre=r.nombre,
+            apellido=r.apellido,
+            telefono=r.telefono,
+            correo=r.correo,
+            genero=r.genero,
+            is_doc=r.is_doc,
+        )
+        for r in rows
+    ]
+    _cache_docentes[is_doc] = docentes
+    return docentes
+
+
 def obtener_docentes(db: Session):
-    return db.query(Docente).filter(Docente.is_doc == True).all()
+    return _listar_docentes_por_rol(db, is_doc=True)
 
 
 def obtener_admins(db: Session):
-    return db.query(Docente).filter(Docente.is_doc == False).all()
+    return _listar_docentes_por_rol(db, is_doc=False)
 
 
 def obtener_docente_por_id(db: Session, docente_id: int):
@@ -64,6 +104,7 @@ def obtener_materias_del_docente(db: Session, docente_id: int):
     return (
         db.query(Materia)
         .join(DocenteMateria)
+        .options(*opciones_raiseload())
         .filter(DocenteMateria.docente_id == docente_id)
         .all()
     )
@@ -74,6 +115,7 @@ def obtener_cursos_del_docente(db: Session, docente_id: int):
         db.query(Curso)
         .join(CursoMateria, Curso.id == CursoMateria.curso_id)
         .join(DocenteMateria, CursoMateria.materia_id == DocenteMateria.materia_id)
+        .options(*opciones_raiseload())
         .filter(DocenteMateria.docente_id == docente_id)
         .distinct()
         .all()
@@ -123,6 +165,8 @@ def obtener_estudiantes_de_docente(
     curso_id: int = None,
     materia_id: int = None,
     nombre: str = None,
+    limite: int = 100,
+    offset: int = 0,
 ):
     query = (
         db.query(Estudiante, Curso, Materia)
@@ -139,9 +183,11 @@ def obtener_estudiantes_de_docente(
     if materia_id:
         query = query.filter(Materia.id == materia_id)
     if nombre:
+        # ILIKE con %..% usa el índice GIN pg_trgm de estudiantes.nombre
         query = query.filter(Estudiante.nombre.ilike(f"%{nombre}%"))
 
-    resultados = query.all()
+    # Paginación para acotar el tamaño de la respuesta
+    resultados = query.limit(limite).offset(offset).all()
 
     return [
         {"estudiante": estudiante, "curso": curso, "materia": materia}
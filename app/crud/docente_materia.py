@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
+from app.deps import opciones_raiseload
 from app.models.docente_materia import DocenteMateria
 from app.schemas.docente_materia import AsignacionCreate
 from app.models.docente_materia import DocenteMateria
@@ -27,18 +28,23 @@ def eliminar_asignacion(db: Session, asignacion_id: int):
 
 
 def obtener_materias_por_docente(db: Session, docente_id: int):
+    # El esquema MateriaAsignada serializa .materia: se carga de forma
+    # explícita y raiseload atrapa cualquier otro acceso lazy en dev
     return (
         db.query(DocenteMateria)
         .join(Materia)
+        .options(selectinload(DocenteMateria.materia), *opciones_raiseload())
         .filter(DocenteMateria.docente_id == docente_id)
         .all()
     )
 
 
 def obtener_docentes_por_materia(db: Session, materia_id: int):
+    # El esquema DocenteAsignado serializa .docente
     return (
         db.query(DocenteMateria)
         .join(Docente)
+        .options(selectinload(DocenteMateria.docente), *opciones_raiseload())
         .filter(DocenteMateria.materia_id == materia_id)
         .all()
     )
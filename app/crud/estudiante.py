@@ -1,9 +1,15 @@
 from typing import Optional
 from app.seguridad import hash_contrasena
 from sqlalchemy.orm import Session
+from app.cache.lookup_cache import cache_de_modelo
 from app.models.estudiante import Estudiante
 from app.schemas.estudiante import EstudianteCreate, EstudianteUpdate
 
+# Cache-aside para el lookup por id: se repite en cada endpoint del
+# estudiante (dashboard, curso, materias). Los eventos del mapper lo
+# invalidan ante cualquier escritura sobre Estudiante (PUT/DELETE).
+_cache_estudiantes = cache_de_modelo(Estudiante, maxsize=10_000, ttl=300)
+
 
 def crear_estudiante(db: Session, estudiante: EstudianteUpdate) -> Estudiante:
     """Crear un nuevo estudiante"""
@@ -21,12 +27,33 @@ def crear_estudiante(db: Session, estudiante: EstudianteUpdate) -> Estudiante:
     return db_estudiante
 
 
-def obtener_estudiantes(db: Session):
-    return db.query(Estudiante).all()
+def obtener_estudiantes(db: Session, after_id: int = 0, limit: int = 100):
+    """Página de estudiantes por keyset (id > after_id), acotada en memoria"""
+    return (
+        db.query(Estudiante)
+        .filter(Estudiante.id > after_id)
+        .order_by(Estudiante.id)
+        .limit(limit)
+        .all()
+    )
 
 
 def obtener_estudiante(db: Session, estudiante_id: int):
-    return db.query(Estudiante).filter(Estudiante.id == estudiante_id).first()
+    estudiante = _cache_estudiantes.get(estudiante_id)
+    if estudiante is None:
+        estudiante = (
+            db.query(Estudiante).filter(Estudiante.id == estudiante_id).first()
+        )
+        if estudiante:
+            _cache_estudiantes[estudiante_id] = estudiante
+    return estudiante
+
+
+def obtener_estudiantes_por_ids(db: Session, estudiante_ids: list) -> list:
+    """Obtener varios estudiantes en una sola consulta con IN"""
+    if not estudiante_ids:
+        return []
+    return db.query(Estudiante).filter(Estudiante.id.in_(estudiante_ids)).all()
 
 
 def actualizar_estudiante(
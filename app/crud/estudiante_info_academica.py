@@ -1,6 +1,9 @@
 # app/crud/estudiante_info_academica.py
+from functools import wraps
+
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import distinct, func, text
+from app.cache.lookup_cache import cache_de_modelo
 from app.models.estudiante import Estudiante
 from app.models.inscripcion import Inscripcion
 from app.models.curso import Curso
@@ -9,9 +12,44 @@ from app.models.materia import Materia
 from app.models.docente_materia import DocenteMateria
 from app.models.docente import Docente
 from app.models.gestion import Gestion
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, load_only
 from typing import Dict, List, Optional
 
+# Cache-aside para la información académica: cambia rara vez pero se
+# consulta en cada pantalla del estudiante. Se invalida ante escrituras
+# en inscripciones, curso-materia o docente-materia.
+_cache_academico = cache_de_modelo(
+    Inscripcion, CursoMateria, DocenteMateria, maxsize=512, ttl=120
+)
+
+
+def _con_cache_academico(prefijo: str):
+    """Decora funciones (db, estudiante_id, gestion_id) con cache-aside.
+
+    La clave incluye estudiante y gestión; los resultados de error o
+    vacíos no se cachean para que una inscripción recién creada aparezca
+    de inmediato.
+    """
+
+    def decorador(fn):
+        @wraps(fn)
+        def envoltura(db: Session, estudiante_id: int, gestion_id: Optional[int] = None):
+            clave = f"acad:{prefijo}:{estudiante_id}:{gestion_id}"
+            resultado = _cache_academico.get(clave)
+            if resultado is not None:
+                return resultado
+
+            resultado = fn(db, estudiante_id, gestion_id)
+            if resultado and not (
+                isinstance(resultado, dict) and "error" in resultado
+            ):
+                _cache_academico[clave] = resultado
+            return resultado
+
+        return envoltura
+
+    return decorador
+
 
 def obtener_estudiante_por_correo(db: Session, correo: str) -> Optional[Estudiante]:
     """
@@ -20,13 +58,25 @@ def obtener_estudiante_por_correo(db: Session, correo: str) -> Optional[Estudian
     return db.query(Estudiante).filter(Estudiante.correo == correo).first()
 
 
+# Objeto pequeño y muy consultado (una vez por request autenticado)
+_cache_estudiantes = cache_de_modelo(Estudiante, maxsize=1024, ttl=60)
+
+
 def obtener_estudiante_por_id(db: Session, estudiante_id: int) -> Optional[Estudiante]:
     """
-    Obtiene un estudiante por su ID
+    Obtiene un estudiante por su ID (con cache corto en memoria)
     """
-    return db.query(Estudiante).filter(Estudiante.id == estudiante_id).first()
+    estudiante = _cache_estudiantes.get(estudiante_id)
+    if estudiante is None:
+        estudiante = (
+            db.query(Estudiante).filter(Estudiante.id == estudiante_id).first()
+        )
+        if estudiante:
+            _cache_estudiantes[estudiante_id] = estudiante
+    return estudiante
 
 
+@_con_cache_academico("info")
 def obtener_info_academica_estudiante(
     db: Session, estudiante_id: int, gestion_id: Optional[int] = None
 ) -> Dict:
@@ -44,8 +94,20 @@ def obtener_info_academica_estudiante(
             return {"error": "No hay gestión activa"}
         gestion_id = gestion_activa.id
 
-    # Verificar que el estudiante existe
-    estudiante = db.query(Estudiante).filter(Estudiante.id == estudiante_id).first()
+    # Verificar que el estudiante existe (solo las columnas que se exponen)
+    estudiante = (
+        db.query(Estudiante)
+        .options(
+            load_only(
+                Estudiante.id,
+                Estudiante.nombre,
+                Estudiante.apellido,
+                Estudiante.correo,
+            )
+        )
+        .filter(Estudiante.id == estudiante_id)
+        .first()
+    )
     if not estudiante:
         return {"error": "Estudiante no encontrado"}
 
@@ -63,35 +125,33 @@ def obtener_info_academica_estudiante(
     if not inscripcion:
         return {"error": "El estudiante no está inscrito en esta gestión"}
 
-    # Obtener las materias del curso
-    materias_curso = (
-        db.query(CursoMateria)
-        .options(joinedload(CursoMateria.materia))
+    # Materias del curso con su docente en un solo JOIN (sin un SELECT
+    # de docente por materia). Se conserva el primer docente por materia,
+    # mismo criterio que el .first() anterior.
+    filas = (
+        db.query(Materia, Docente)
+        .join(CursoMateria, Materia.id == CursoMateria.materia_id)
+        .outerjoin(DocenteMateria, Materia.id == DocenteMateria.materia_id)
+        .outerjoin(Docente, DocenteMateria.docente_id == Docente.id)
         .filter(CursoMateria.curso_id == inscripcion.curso_id)
         .all()
     )
 
-    # Para cada materia, obtener su docente
     materias_con_docentes = []
-    for curso_materia in materias_curso:
-        materia = curso_materia.materia
-
-        # Buscar el docente asignado a esta materia
-        docente_materia = (
-            db.query(DocenteMateria)
-            .options(joinedload(DocenteMateria.docente))
-            .filter(DocenteMateria.materia_id == materia.id)
-            .first()
-        )
+    materias_vistas = set()
+    for materia, docente in filas:
+        if materia.id in materias_vistas:
+            continue
+        materias_vistas.add(materia.id)
 
         docente_info = None
-        if docente_materia and docente_materia.docente:
+        if docente:
             docente_info = {
-                "id": docente_materia.docente.id,
-                "nombre": docente_materia.docente.nombre,
-                "apellido": docente_materia.docente.apellido,
-                "correo": docente_materia.docente.correo,
-                "telefono": docente_materia.docente.telefono,
+                "id": docente.id,
+                "nombre": docente.nombre,
+                "apellido": docente.apellido,
+                "correo": docente.correo,
+                "telefono": docente.telefono,
             }
 
         materias_con_docentes.append(
@@ -134,6 +194,7 @@ def obtener_info_academica_estudiante(
     }
 
 
+@_con_cache_academico("curso")
 def obtener_curso_estudiante(
     db: Session, estudiante_id: int, gestion_id: Optional[int] = None
 ) -> Optional[Dict]:
@@ -168,6 +229,7 @@ def obtener_curso_estudiante(
     }
 
 
+@_con_cache_academico("materias")
 def obtener_materias_estudiante(
     db: Session, estudiante_id: int, gestion_id: Optional[int] = None
 ) -> List[Dict]:
@@ -230,6 +292,95 @@ def obtener_materias_estudiante(
     return materias_con_docentes
 
 
+@_con_cache_academico("stats")
+def obtener_estadisticas_materias(
+    db: Session, estudiante_id: int, gestion_id: Optional[int] = None
+) -> Dict:
+    """
+    Estadísticas agregadas de las materias del estudiante, calculadas en
+    la base con una sola consulta (COUNT/COUNT DISTINCT) en lugar de
+    recorrer las materias en Python
+    """
+    consulta = (
+        db.query(
+            func.count(distinct(CursoMateria.materia_id)).label("total_materias"),
+            func.count(distinct(DocenteMateria.materia_id)).label(
+                "materias_con_docente"
+            ),
+            func.count(distinct(DocenteMateria.docente_id)).label("total_docentes"),
+        )
+        .select_from(Inscripcion)
+        .join(CursoMateria, CursoMateria.curso_id == Inscripcion.curso_id)
+        .outerjoin(
+            DocenteMateria, DocenteMateria.materia_id == CursoMateria.materia_id
+        )
+        .filter(Inscripcion.estudiante_id == estudiante_id)
+    )
+    if gestion_id:
+        consulta = consulta.filter(Inscripcion.gestion_id == gestion_id)
+
+    fila = consulta.one()
+    return {
+        "total_materias": fila.total_materias,
+        "materias_con_docente": fila.materias_con_docente,
+        "materias_sin_docente": fila.total_materias - fila.materias_con_docente,
+        "total_docentes": fila.total_docentes,
+    }
+
+
+def obtener_docente_de_materia_estudiante(
+    db: Session, estudiante_id: int, materia_id: int, gestion_id: Optional[int] = None
+) -> Optional[Dict]:
+    """
+    Obtiene una materia específica del estudiante con su docente
+    en una sola consulta indexada (sin traer el resto de materias)
+    """
+    if not gestion_id:
+        gestion_activa = db.query(Gestion).order_by(Gestion.id.desc()).first()
+        if not gestion_activa:
+            return None
+        gestion_id = gestion_activa.id
+
+    fila = (
+        db.query(Materia, Docente)
+        .join(CursoMateria, Materia.id == CursoMateria.materia_id)
+        .join(Inscripcion, Inscripcion.curso_id == CursoMateria.curso_id)
+        .outerjoin(DocenteMateria, Materia.id == DocenteMateria.materia_id)
+        .outerjoin(Docente, DocenteMateria.docente_id == Docente.id)
+        .filter(
+            Inscripcion.estudiante_id == estudiante_id,
+            Inscripcion.gestion_id == gestion_id,
+            Materia.id == materia_id,
+        )
+        .first()
+    )
+
+    if not fila:
+        return None
+
+    materia, docente = fila
+    docente_info = None
+    if docente:
+        docente_info = {
+            "id": docente.id,
+            "nombre": docente.nombre,
+            "apellido": docente.apellido,
+            "correo": docente.correo,
+            "telefono": docente.telefono,
+        }
+
+    return {
+        "materia": {
+            "id": materia.id,
+            "nombre": materia.nombre,
+            "descripcion": materia.descripcion,
+            "sigla": getattr(materia, "sigla", None),
+        },
+        "docente": docente_info,
+    }
+
+
+@_con_cache_academico("docentes")
 def obtener_docentes_estudiante(
     db: Session, estudiante_id: int, gestion_id: Optional[int] = None
 ) -> List[Dict]:
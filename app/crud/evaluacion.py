@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.evaluacion import Evaluacion
 from app.schemas.evaluacion import EvaluacionCreate, EvaluacionUpdate
@@ -15,10 +17,20 @@ def listar_evaluaciones(db: Session):
     return db.query(Evaluacion).all()
 
 
+async def listar_evaluaciones_async(db: AsyncSession):
+    """Variante async de listar_evaluaciones"""
+    return (await db.execute(select(Evaluacion))).scalars().all()
+
+
 def obtener_por_id(db: Session, evaluacion_id: int):
     return db.query(Evaluacion).filter(Evaluacion.id == evaluacion_id).first()
 
 
+async def obtener_por_id_async(db: AsyncSession, evaluacion_id: int):
+    """Variante async de obtener_por_id"""
+    return await db.get(Evaluacion, evaluacion_id)
+
+
 def actualizar_evaluacion(db: Session, evaluacion_id: int, datos: EvaluacionUpdate):
     e = db.query(Evaluacion).filter(Evaluacion.id == evaluacion_id).first()
     if e:
@@ -1,37 +1,39 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.gestion import Gestion
 from app.schemas.gestion import GestionCreate, GestionUpdate
 
 
-def crear_gestion(db: Session, datos: GestionCreate):
+async def crear_gestion(db: AsyncSession, datos: GestionCreate):
     nueva = Gestion(**datos.dict())
     db.add(nueva)
-    db.commit()
-    db.refresh(nueva)
+    await db.commit()
+    await db.refresh(nueva)
     return nueva
 
 
-def listar_gestiones(db: Session):
-    return db.query(Gestion).all()
+async def listar_gestiones(db: AsyncSession):
+    result = await db.execute(select(Gestion))
+    return result.scalars().all()
 
 
-def obtener_gestion_por_id(db: Session, gestion_id: int):
-    return db.query(Gestion).filter(Gestion.id == gestion_id).first()
+async def obtener_gestion_por_id(db: AsyncSession, gestion_id: int):
+    return await db.get(Gestion, gestion_id)
 
 
-def actualizar_gestion(db: Session, gestion_id: int, datos: GestionUpdate):
-    g = db.query(Gestion).filter(Gestion.id == gestion_id).first()
+async def actualizar_gestion(db: AsyncSession, gestion_id: int, datos: GestionUpdate):
+    g = await db.get(Gestion, gestion_id)
     if g:
         for key, value in datos.dict().items():
             setattr(g, key, value)
-        db.commit()
-        db.refresh(g)
+        await db.commit()
+        await db.refresh(g)
     return g
 
 
-def eliminar_gestion(db: Session, gestion_id: int):
-    g = db.query(Gestion).filter(Gestion.id == gestion_id).first()
+async def eliminar_gestion(db: AsyncSession, gestion_id: int):
+    g = await db.get(Gestion, gestion_id)
     if g:
-        db.delete(g)
-        db.commit()
+        await db.delete(g)
+        await db.commit()
     return g
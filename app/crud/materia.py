@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
+from app.cache.lookup_cache import cache_de_modelo
 from app.models.materia import Materia
 from app.schemas.materia import MateriaCreate, MateriaUpdate
 
+_cache_materias = cache_de_modelo(Materia)
+
 
 def crear_materia(db: Session, materia: MateriaCreate):
     nueva = Materia(**materia.dict())
@@ -12,7 +15,11 @@ def crear_materia(db: Session, materia: MateriaCreate):
 
 
 def obtener_materias(db: Session):
-    return db.query(Materia).all()
+    materias = _cache_materias.get("lista")
+    if materias is None:
+        materias = db.query(Materia).all()
+        _cache_materias["lista"] = materias
+    return materias
 
 
 def obtener_materia_por_id(db: Session, materia_id: int):
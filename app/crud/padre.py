@@ -77,10 +77,14 @@ def eliminar_padre(db: Session, padre_id: int) -> Optional[Padre]:
 
 def obtener_hijos_del_padre(db: Session, padre_id: int) -> List[Estudiante]:
     """Obtener todos los hijos de un padre"""
-    relaciones = (
-        db.query(PadreEstudiante).filter(PadreEstudiante.padre_id == padre_id).all()
+    # Join directo en una sola consulta: evita el lazy-load de
+    # rel.estudiante por cada relación (N+1)
+    return (
+        db.query(Estudiante)
+        .join(PadreEstudiante, PadreEstudiante.estudiante_id == Estudiante.id)
+        .filter(PadreEstudiante.padre_id == padre_id)
+        .all()
     )
-    return [rel.estudiante for rel in relaciones]
 
 
 def asignar_hijo_a_padre(db: Session, padre_id: int, estudiante_id: int) -> bool:
@@ -125,6 +129,21 @@ def desasignar_hijo_de_padre(db: Session, padre_id: int, estudiante_id: int) ->
     return True
 
 
+def padre_de_estudiantes(
+    db: Session, padre_id: int, estudiante_ids: List[int]
+) -> set:
+    """IDs de estudiantes del lote que son hijos del padre (un solo IN)"""
+    return set(
+        fila.estudiante_id
+        for fila in db.query(PadreEstudiante.estudiante_id)
+        .filter(
+            PadreEstudiante.padre_id == padre_id,
+            PadreEstudiante.estudiante_id.in_(estudiante_ids),
+        )
+        .all()
+    )
+
+
 def es_padre_del_estudiante(db: Session, padre_id: int, estudiante_id: int) -> bool:
     """Verificar si un padre es padre de un estudiante específico"""
     relacion = (
@@ -1,7 +1,55 @@
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.cache.lookup_cache import cache_de_modelo
 from app.models.periodo import Periodo
 from app.schemas.periodo import PeriodoCreate, PeriodoUpdate
 
+# Periodos por fecha: la tabla cambia una vez por trimestre, así que el
+# (periodo_id, gestion_id) vigente de cada día se sirve desde memoria;
+# cualquier escritura sobre Periodo limpia el cache vía el mapper.
+_cache_periodos = cache_de_modelo(Periodo, maxsize=512, ttl=300)
+
+
+def obtener_periodo_vigente(db: Session, fecha: date):
+    """(periodo_id, gestion_id) del periodo que contiene la fecha, o None.
+
+    Cacheado por fecha: los registros masivos lo consultan en cada
+    llamada y el resultado solo cambia al editar periodos.
+    """
+    clave = f"vigente:{fecha.isoformat()}"
+    resultado = _cache_periodos.get(clave)
+    if resultado is None:
+        periodo = db.scalar(
+            select(Periodo).where(
+                Periodo.fecha_inicio <= fecha, Periodo.fecha_fin >= fecha
+            )
+        )
+        if periodo is None:
+            return None
+        resultado = (periodo.id, periodo.gestion_id)
+        _cache_periodos[clave] = resultado
+    return resultado
+
+
+async def obtener_periodo_vigente_async(db: AsyncSession, fecha: date):
+    """Variante async de obtener_periodo_vigente (comparte el cache)"""
+    clave = f"vigente:{fecha.isoformat()}"
+    resultado = _cache_periodos.get(clave)
+    if resultado is None:
+        periodo = await db.scalar(
+            select(Periodo).where(
+                Periodo.fecha_inicio <= fecha, Periodo.fecha_fin >= fecha
+            )
+        )
+        if periodo is None:
+            return None
+        resultado = (periodo.id, periodo.gestion_id)
+        _cache_periodos[clave] = resultado
+    return resultado
+
 
 def crear_periodo(db: Session, datos: PeriodoCreate):
     nuevo = Periodo(**datos.dict())
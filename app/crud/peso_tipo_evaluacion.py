@@ -1,11 +1,20 @@
+from typing import Dict, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app import models
+from app.cache.lookup_cache import cache_de_modelo
 from app.models.peso_tipo_evaluacion import PesoTipoEvaluacion
 from app.schemas.peso_tipo_evaluacion import (
     PesoTipoEvaluacionCreate,
     PesoTipoEvaluacionUpdate,
 )
 
+# Los pesos son configuración casi estática: se cachea el mapa completo
+# por gestión y se invalida ante cualquier escritura sobre el modelo
+_cache_pesos = cache_de_modelo(PesoTipoEvaluacion, maxsize=32, ttl=300)
+
 
 def crear_peso(db: Session, datos: PesoTipoEvaluacionCreate):
     nuevo = PesoTipoEvaluacion(**datos.dict())
@@ -88,6 +97,52 @@ def listar_por_docente_gestion(db: Session, docente_id: int, gestion_id: int):
     )
 
 
+def mapa_pesos_por_gestion(
+    db: Session, gestion_id: int
+) -> Dict[Tuple[int, int, int], float]:
+    """
+    Mapa (docente_id, materia_id, tipo_evaluacion_id) -> porcentaje para
+    una gestión, servido desde el cache de proceso
+    """
+    clave = ("pesos", gestion_id)
+    mapa = _cache_pesos.get(clave)
+    if mapa is None:
+        mapa = {
+            (p.docente_id, p.materia_id, p.tipo_evaluacion_id): p.porcentaje
+            for p in db.query(PesoTipoEvaluacion)
+            .filter(PesoTipoEvaluacion.gestion_id == gestion_id)
+            .all()
+        }
+        _cache_pesos[clave] = mapa
+    return mapa
+
+
+async def mapa_pesos_por_gestion_async(
+    db: AsyncSession, gestion_id: int
+) -> Dict[Tuple[int, int, int], float]:
+    """Variante async de mapa_pesos_por_gestion (mismo cache de proceso)"""
+    clave = ("pesos", gestion_id)
+    mapa = _cache_pesos.get(clave)
+    if mapa is None:
+        filas = (
+            (
+                await db.execute(
+                    select(PesoTipoEvaluacion).filter(
+                        PesoTipoEvaluacion.gestion_id == gestion_id
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+        mapa = {
+            (p.docente_id, p.materia_id, p.tipo_evaluacion_id): p.porcentaje
+            for p in filas
+        }
+        _cache_pesos[clave] = mapa
+    return mapa
+
+
 def listar_por_docente(db: Session, docente_id: int):
     return (
         db.query(models.PesoTipoEvaluacion)
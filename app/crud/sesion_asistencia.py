@@ -1,5 +1,6 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, undefer
 from sqlalchemy import and_, func, desc
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.models.sesion_asistencia import SesionAsistencia, AsistenciaEstudiante
 from app.models.inscripcion import Inscripcion
 from app.models.estudiante import Estudiante
@@ -12,7 +13,7 @@ from app.schemas.sesion_asistencia import (
     JustificarAusenciaRequest,
 )
 from typing import List, Optional, Dict, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import math
 
 
@@ -123,17 +124,65 @@ def crear_sesion_asistencia(
 def crear_registros_asistencia_estudiantes(db: Session, sesion: SesionAsistencia):
     """Crear registros de asistencia para todos los estudiantes del curso"""
 
-    # Obtener estudiantes inscritos en el curso
-    inscripciones = (
-        db.query(Inscripcion).filter(Inscripcion.curso_id == sesion.curso_id).all()
+    # Obtener estudiantes inscritos en el curso (solo el id, sin hidratar ORM)
+    estudiante_ids = [
+        est_id
+        for (est_id,) in db.query(Inscripcion.estudiante_id)
+        .filter(Inscripcion.curso_id == sesion.curso_id)
+        .all()
+    ]
+
+    if not estudiante_ids:
+        return
+
+    # Un solo INSERT con todas las filas en lugar de un add() por estudiante
+    db.execute(
+        pg_insert(AsistenciaEstudiante)
+        .values(
+            [
+                {"sesion_id": sesion.id, "estudiante_id": est_id, "presente": False}
+                for est_id in estudiante_ids
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=["sesion_id", "estudiante_id"])
     )
+    db.commit()
 
-    for inscripcion in inscripciones:
-        asistencia = AsistenciaEstudiante(
-            sesion_id=sesion.id, estudiante_id=inscripcion.estudiante_id, presente=False
-        )
-        db.add(asistencia)
 
+def bulk_upsert_presencia(db: Session, sesion_id: int, registros: List[Dict]):
+    """Upsert masivo de asistencias de una sesión en un solo INSERT.
+
+    Cada registro debe traer estudiante_id, latitud_estudiante,
+    longitud_estudiante, distancia_metros y es_tardanza. Usa el índice
+    único (sesion_id, estudiante_id) para actualizar filas pre-creadas.
+    """
+    if not registros:
+        return
+
+    filas = [
+        {
+            "sesion_id": sesion_id,
+            "presente": True,
+            "fecha_marcado": func.now(),
+            **registro,
+        }
+        for registro in registros
+    ]
+
+    stmt = pg_insert(AsistenciaEstudiante).values(filas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["sesion_id", "estudiante_id"],
+        set_={
+            "presente": True,
+            "fecha_marcado": stmt.excluded.fecha_marcado,
+            "latitud_estudiante": stmt.excluded.latitud_estudiante,
+            "longitud_estudiante": stmt.excluded.longitud_estudiante,
+            "distancia_metros": stmt.excluded.distancia_metros,
+            "es_tardanza": stmt.excluded.es_tardanza,
+            "fecha_actualizacion": func.now(),
+        },
+    )
+    db.execute(stmt)
     db.commit()
 
 
@@ -147,7 +196,16 @@ def obtener_sesiones_docente(
 ) -> List[SesionAsistencia]:
     """Obtener sesiones de asistencia de un docente"""
 
-    query = db.query(SesionAsistencia).filter(SesionAsistencia.docente_id == docente_id)
+    # Las columnas de texto están diferidas en el modelo; este listado las
+    # serializa en SesionAsistenciaOut, así que se cargan en el mismo SELECT
+    query = (
+        db.query(SesionAsistencia)
+        .options(
+            undefer(SesionAsistencia.descripcion),
+            undefer(SesionAsistencia.direccion_referencia),
+        )
+        .filter(SesionAsistencia.docente_id == docente_id)
+    )
 
     if estado:
         query = query.filter(SesionAsistencia.estado == estado)
@@ -166,13 +224,17 @@ def obtener_sesion_por_id(
 ) -> Optional[SesionAsistencia]:
     """Obtener una sesión específica por ID"""
 
-    query = db.query(SesionAsistencia)
+    query = db.query(SesionAsistencia).options(
+        undefer(SesionAsistencia.descripcion),
+        undefer(SesionAsistencia.direccion_referencia),
+    )
 
     if incluir_asistencias:
+        asistencias = joinedload(SesionAsistencia.asistencias)
         query = query.options(
-            joinedload(SesionAsistencia.asistencias).joinedload(
-                AsistenciaEstudiante.estudiante
-            )
+            asistencias.joinedload(AsistenciaEstudiante.estudiante),
+            asistencias.undefer(AsistenciaEstudiante.observaciones),
+            asistencias.undefer(AsistenciaEstudiante.motivo_justificacion),
         )
 
     return query.filter(SesionAsistencia.id == sesion_id).first()
@@ -192,7 +254,7 @@ def actualizar_sesion_asistencia(
     for campo, valor in datos.dict(exclude_unset=True).items():
         setattr(sesion, campo, valor)
 
-    sesion.fecha_actualizacion = datetime.now()
+    sesion.fecha_actualizacion = datetime.now(timezone.utc)
 
     db.commit()
     db.refresh(sesion)
@@ -213,8 +275,8 @@ def cerrar_sesion_asistencia(db: Session, sesion_id: int) -> Optional[SesionAsis
 
     # Cerrar la sesión
     sesion.estado = "cerrada"
-    sesion.fecha_fin = datetime.now()
-    sesion.fecha_actualizacion = datetime.now()
+    sesion.fecha_fin = datetime.now(timezone.utc)
+    sesion.fecha_actualizacion = datetime.now(timezone.utc)
 
     # Sincronizar con el sistema de evaluaciones existente
     sincronizar_con_evaluaciones(db, sesion)
@@ -334,7 +396,7 @@ def marcar_asistencia_estudiante(
         )
 
     # Verificar si es tardanza
-    now = datetime.now()
+    now = datetime.now(timezone.utc)
     es_tardanza = now > sesion.fecha_inicio
 
     # Marcar asistencia
@@ -384,7 +446,7 @@ def justificar_ausencia(
     asistencia.motivo_justificacion = datos.motivo_justificacion
     if datos.observaciones:
         asistencia.observaciones = datos.observaciones
-    asistencia.fecha_actualizacion = datetime.now()
+    asistencia.fecha_actualizacion = datetime.now(timezone.utc)
 
     db.commit()
     db.refresh(asistencia)
@@ -405,6 +467,28 @@ def obtener_asistencias_sesion(
     )
 
 
+def presentes_dentro_del_radio(
+    db: Session, sesion_id: int
+) -> List[AsistenciaEstudiante]:
+    """Asistencias presentes dentro del radio permitido, evaluado en SQL.
+
+    Compara distancia_metros contra radio_permitido_metros con un join a la
+    sesión, en lugar de cargar cada asistencia y disparar el lazy load de
+    su sesión padre solo para leer el radio (patrón cuadrático).
+    """
+    return (
+        db.query(AsistenciaEstudiante)
+        .join(SesionAsistencia, SesionAsistencia.id == AsistenciaEstudiante.sesion_id)
+        .filter(
+            AsistenciaEstudiante.sesion_id == sesion_id,
+            AsistenciaEstudiante.presente.is_(True),
+            AsistenciaEstudiante.distancia_metros
+            <= SesionAsistencia.radio_permitido_metros,
+        )
+        .all()
+    )
+
+
 def obtener_asistencias_estudiante(
     db: Session,
     estudiante_id: int,
@@ -415,7 +499,11 @@ def obtener_asistencias_estudiante(
 
     query = (
         db.query(AsistenciaEstudiante)
-        .options(joinedload(AsistenciaEstudiante.sesion))
+        .options(
+            joinedload(AsistenciaEstudiante.sesion),
+            undefer(AsistenciaEstudiante.observaciones),
+            undefer(AsistenciaEstudiante.motivo_justificacion),
+        )
         .filter(AsistenciaEstudiante.estudiante_id == estudiante_id)
     )
 
@@ -447,22 +535,20 @@ def obtener_sesiones_activas_estudiante(
     if not curso_ids:
         return []
 
-    # Buscar sesiones activas en los cursos del estudiante
+    # Buscar sesiones realmente activas (el hybrid esta_activa se evalúa en SQL)
     sesiones = (
         db.query(SesionAsistencia)
+        .options(undefer(SesionAsistencia.descripcion))
         .filter(
             and_(
                 SesionAsistencia.curso_id.in_(curso_ids),
-                SesionAsistencia.estado == "activa",
+                SesionAsistencia.esta_activa,
             )
         )
         .all()
     )
 
-    # Filtrar sesiones que realmente están activas
-    sesiones_activas = [s for s in sesiones if s.esta_activa]
-
-    return sesiones_activas
+    return sesiones
 
 
 def validar_puede_marcar_asistencia(
@@ -535,9 +621,8 @@ def validar_puede_marcar_asistencia(
         }
 
     # Calcular tiempo restante
-    now = datetime.now()
-    tiempo_limite = sesion.fecha_inicio + timedelta(minutes=sesion.minutos_tolerancia)
-    tiempo_restante = (tiempo_limite - now).total_seconds() / 60
+    now = datetime.now(timezone.utc)
+    tiempo_restante = (sesion._tiempo_limite - now).total_seconds() / 60
 
     return {
         "puede_marcar": True,
@@ -1,7 +1,12 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.cache.lookup_cache import cache_de_modelo
 from app.models.tipo_evaluacion import TipoEvaluacion
 from app.schemas.tipo_evaluacion import TipoEvaluacionCreate, TipoEvaluacionUpdate
 
+_cache_tipos = cache_de_modelo(TipoEvaluacion)
+
 
 def crear_tipo(db: Session, datos: TipoEvaluacionCreate):
     nuevo = TipoEvaluacion(**datos.dict())
@@ -12,7 +17,58 @@ def crear_tipo(db: Session, datos: TipoEvaluacionCreate):
 
 
 def listar_tipos(db: Session):
-    return db.query(TipoEvaluacion).all()
+    tipos = _cache_tipos.get("lista")
+    if tipos is None:
+        tipos = db.query(TipoEvaluacion).all()
+        _cache_tipos["lista"] = tipos
+    return tipos
+
+
+async def listar_tipos_async(db: AsyncSession):
+    """Variante async de listar_tipos (comparte el cache de proceso)"""
+    tipos = _cache_tipos.get("lista")
+    if tipos is None:
+        tipos = (await db.execute(select(TipoEvaluacion))).scalars().all()
+        _cache_tipos["lista"] = tipos
+    return tipos
+
+
+def obtener_id_por_nombre(db: Session, nombre: str):
+    """ID del tipo por nombre, con cache de proceso.
+
+    La tabla es de referencia (chica y estática): el SELECT solo corre en
+    el primer miss; las escrituras sobre TipoEvaluacion invalidan el
+    cache vía los eventos del mapper. La comparación usa lower() en vez
+    de ILIKE para que aplique el índice funcional sobre lower(nombre).
+    """
+    clave = f"id:{nombre.lower()}"
+    tipo_id = _cache_tipos.get(clave)
+    if tipo_id is None:
+        tipo_id = db.scalar(
+            select(TipoEvaluacion.id).where(
+                func.lower(TipoEvaluacion.nombre) == nombre.lower()
+            )
+        )
+        if tipo_id is None:
+            return None
+        _cache_tipos[clave] = tipo_id
+    return tipo_id
+
+
+async def obtener_id_por_nombre_async(db: AsyncSession, nombre: str):
+    """Variante async de obtener_id_por_nombre (comparte el cache de proceso)"""
+    clave = f"id:{nombre.lower()}"
+    tipo_id = _cache_tipos.get(clave)
+    if tipo_id is None:
+        tipo_id = await db.scalar(
+            select(TipoEvaluacion.id).where(
+                func.lower(TipoEvaluacion.nombre) == nombre.lower()
+            )
+        )
+        if tipo_id is None:
+            return None
+        _cache_tipos[clave] = tipo_id
+    return tipo_id
 
 
 def obtener_por_id(db: Session, tipo_id: int):
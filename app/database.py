@@ -1,18 +1,67 @@
-from sqlalchemy import create_engine
+import logging
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from app.config import get_database_url
+from app.config import get_database_url, settings
 
 SQLALCHEMY_DATABASE_URL = get_database_url()
 
 #engine = create_engine(SQLALCHEMY_DATABASE_URL)
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    pool_size=50,           # Número de conexiones activas
-    max_overflow=30,        # Conexiones adicionales temporales
-    pool_timeout=300,        # Espera máxima (segundos) antes de lanzar error
-    pool_pre_ping=True      # Verifica conexiones inactivas automáticamente
+    future=True,
+    query_cache_size=1200,  # Cache de sentencias compiladas (SQLAlchemy 2.x)
+    pool_size=20,           # Conexiones activas (acorde al threadpool de FastAPI)
+    max_overflow=40,        # Conexiones adicionales temporales para picos
+    pool_timeout=30,        # Espera máxima (segundos) antes de lanzar error
+    pool_recycle=1800,      # Recicla conexiones viejas (evita cortes del servidor)
+    pool_pre_ping=True,     # Verifica conexiones inactivas automáticamente
+    insertmanyvalues_page_size=1000,  # Filas por INSERT batch (registros masivos)
 )
 
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+# expire_on_commit=False: los atributos siguen disponibles tras el commit
+# sin disparar SELECTs de recarga al serializar la respuesta
+SessionLocal = sessionmaker(
+    bind=engine, autocommit=False, autoflush=False, expire_on_commit=False
+)
 Base = declarative_base()
+
+# Motor async (asyncpg) para los routers migrados a async def: las
+# corrutinas liberan el event loop durante el I/O de BD en lugar de
+# ocupar un hilo del threadpool de FastAPI.
+ASYNC_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace(
+    "postgresql://", "postgresql+asyncpg://", 1
+)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    query_cache_size=1200,
+    pool_size=20,
+    max_overflow=40,
+    pool_timeout=30,
+    pool_recycle=1800,
+    pool_pre_ping=True,
+    insertmanyvalues_page_size=1000,
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autocommit=False, autoflush=False, expire_on_commit=False
+)
+
+
+if settings.ENVIRONMENT == "local":
+    # En desarrollo, avisar cuando una consulta no usa el cache de compilación
+    # (por ejemplo IN(...) sin bindparam expanding), que es un costo oculto.
+    _logger = logging.getLogger("app.database")
+
+    _SIN_CACHE = {"CACHING_DISABLED", "NO_CACHE_KEY", "NO_DIALECT_SUPPORT"}
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _avisar_consulta_sin_cache(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        cache_hit = getattr(context, "cache_hit", None)
+        if cache_hit is not None and cache_hit.name in _SIN_CACHE:
+            _logger.warning("Consulta sin cache de compilación: %s", statement)
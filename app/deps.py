@@ -0,0 +1,45 @@
+from typing import AsyncIterator, Iterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, raiseload
+
+from app.config import settings
+from app.database import AsyncSessionLocal, SessionLocal
+
+
+def get_db() -> Iterator[Session]:
+    """Dependencia compartida: una sola sesión de BD por request.
+
+    Todos los routers deben importar esta función en lugar de definir su
+    propia copia, para que FastAPI pueda cachear la dependencia y abrir
+    una única sesión aunque el request pase por varios routers.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependencia async: sesión asyncpg para endpoints async def.
+
+    Los endpoints migrados a async def usan esta dependencia; el resto
+    sigue con get_db() síncrono hasta que se migren.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def opciones_raiseload():
+    """Opciones anti N+1 para consultas de listado.
+
+    En desarrollo agrega raiseload("*") después de los eager-loads
+    declarados, de modo que cualquier acceso lazy accidental durante la
+    serialización falle de inmediato en lugar de disparar SELECTs
+    silenciosos. En producción no agrega nada y la consulta degrada
+    con lazy loading normal.
+    """
+    if settings.ENVIRONMENT == "local":
+        return (raiseload("*"),)
+    return ()
@@ -0,0 +1,14 @@
+# app/exceptions.py
+"""Excepciones tipadas del dominio.
+
+Permiten despachar errores por isinstance en los routers en lugar de
+inspeccionar el texto del mensaje.
+"""
+
+
+class GestionError(Exception):
+    """Error relacionado con la gestión académica (no encontrada, sin periodos)"""
+
+
+class PrediccionError(Exception):
+    """Error del sistema de predicciones ML"""
@@ -1,5 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.routers import (
     estudiantes,
@@ -30,6 +32,7 @@ app = FastAPI(
     title="Aula Inteligente",
     description="API para gestionar estudiantes, docentes, materias, evaluaciones y predicción de rendimiento académico",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # ---------- CORS ----------
@@ -41,6 +44,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Comprime respuestas JSON grandes (listados masivos, resúmenes); las
+# chicas quedan sin tocar para no pagar gzip por nada
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # ---------- Routers ----------
 app.include_router(estudiantes.router)
 app.include_router(docentes.router)
@@ -11,6 +11,7 @@ from datetime import datetime
 import logging
 
 from sqlalchemy import func
+from app.exceptions import PrediccionError
 from app.models.prediccion_rendimiento import PrediccionRendimiento
 
 # Configurar logging
@@ -447,9 +448,15 @@ class PredictionService:
 
             return prediccion
 
+        except ValueError:
+            # Errores de datos (estudiante/periodo/docente no válidos): los
+            # routers los traducen a 404/400, no son fallas del servicio
+            raise
         except Exception as e:
             logger.error(f"Error prediciendo para estudiante {estudiante_id}: {str(e)}")
-            raise
+            raise PrediccionError(
+                f"Fallo generando la predicción del estudiante {estudiante_id}"
+            ) from e
 
     def predecir_estudiante_por_bd2(
         self, db, estudiante_id: int, materia_id: int, periodo_id: int
@@ -597,9 +604,15 @@ class PredictionService:
 
             return prediccion
 
+        except ValueError:
+            # Errores de datos (estudiante/periodo/docente no válidos): los
+            # routers los traducen a 404/400, no son fallas del servicio
+            raise
         except Exception as e:
             logger.error(f"Error prediciendo para estudiante {estudiante_id}: {str(e)}")
-            raise
+            raise PrediccionError(
+                f"Fallo generando la predicción del estudiante {estudiante_id}"
+            ) from e
 
     def predecir_estudiante_por_bd(
         self, db, estudiante_id: int, materia_id: int, periodo_id: int
@@ -781,9 +794,244 @@ class PredictionService:
 
             return prediccion
 
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error prediciendo estudiante {estudiante_id}: {str(e)}")
+            raise PrediccionError(
+                f"Fallo generando la predicción del estudiante {estudiante_id}"
+            ) from e
+
+    def predecir_estudiante_batch(
+        self, db, estudiante_id: int, celdas: List[Tuple[int, int]]
+    ) -> List[Dict]:
+        """
+        Predice varias celdas (materia_id, periodo_id) de un estudiante en lote.
+
+        Junta las features con una consulta por tabla y ejecuta los modelos
+        una sola vez sobre la matriz (N, F), en lugar de repetir el pipeline
+        completo (consultas + predict) por cada celda. Guarda predicciones y
+        rendimientos con un único commit.
+        """
+        try:
+            from app.models import (
+                Evaluacion,
+                TipoEvaluacion,
+                PesoTipoEvaluacion,
+                DocenteMateria,
+                RendimientoFinal,
+                Estudiante,
+                Periodo,
+            )
+
+            if not celdas:
+                return []
+
+            estudiante = db.query(Estudiante).filter_by(id=estudiante_id).first()
+            if not estudiante:
+                raise ValueError("Estudiante no encontrado")
+
+            edad = datetime.now().year - estudiante.fecha_nacimiento.year
+            genero_masculino = 1 if estudiante.genero.lower() == "masculino" else 0
+
+            materia_ids = {materia_id for materia_id, _ in celdas}
+            periodo_ids = {periodo_id for _, periodo_id in celdas}
+
+            # Features en bloque: una consulta por tabla
+            periodos = {
+                p.id: p
+                for p in db.query(Periodo).filter(Periodo.id.in_(periodo_ids)).all()
+            }
+
+            docente_por_materia = {}
+            for dm in (
+                db.query(DocenteMateria)
+                .filter(DocenteMateria.materia_id.in_(materia_ids))
+                .all()
+            ):
+                docente_por_materia.setdefault(dm.materia_id, dm.docente_id)
+
+            tipos = db.query(TipoEvaluacion).all()
+
+            gestion_ids = {p.gestion_id for p in periodos.values()}
+            pesos = {
+                (
+                    peso.docente_id,
+                    peso.materia_id,
+                    peso.gestion_id,
+                    peso.tipo_evaluacion_id,
+                ): peso.porcentaje
+                for peso in db.query(PesoTipoEvaluacion)
+                .filter(
+                    PesoTipoEvaluacion.materia_id.in_(materia_ids),
+                    PesoTipoEvaluacion.gestion_id.in_(gestion_ids),
+                )
+                .all()
+            }
+
+            valores_por_clave = {}
+            for ev in (
+                db.query(Evaluacion)
+                .filter(
+                    Evaluacion.estudiante_id == estudiante_id,
+                    Evaluacion.materia_id.in_(materia_ids),
+                    Evaluacion.periodo_id.in_(periodo_ids),
+                )
+                .all()
+            ):
+                valores_por_clave.setdefault(
+                    (ev.materia_id, ev.periodo_id, ev.tipo_evaluacion_id), []
+                ).append(ev.valor)
+
+            # Armar una fila de features por celda
+            celdas_validas = []
+            lista_datos = []
+            for materia_id, periodo_id in celdas:
+                periodo = periodos.get(periodo_id)
+                docente_id = docente_por_materia.get(materia_id)
+                if not periodo or not docente_id:
+                    continue
+
+                nota_final = 0.0
+                porcentaje_asistencia = 85.0
+                promedio_participacion = 70.0
+
+                for tipo in tipos:
+                    porcentaje = pesos.get(
+                        (docente_id, materia_id, periodo.gestion_id, tipo.id)
+                    )
+                    if not porcentaje:
+                        continue
+                    valores = valores_por_clave.get(
+                        (materia_id, periodo_id, tipo.id)
+                    )
+                    if not valores:
+                        continue
+
+                    promedio = sum(valores) / len(valores)
+                    nota_final += (promedio * porcentaje) / 100
+
+                    if tipo.nombre.lower() == "asistencia":
+                        porcentaje_asistencia = round(promedio, 2)
+                    elif tipo.nombre.lower() == "participaciones":
+                        promedio_participacion = round(promedio, 2)
+
+                lista_datos.append(
+                    {
+                        "promedio_notas_anterior": round(nota_final, 2),
+                        "porcentaje_asistencia": porcentaje_asistencia,
+                        "promedio_participacion": promedio_participacion,
+                        "edad": edad,
+                        "genero_masculino": genero_masculino,
+                        "turno_manana": 1,
+                    }
+                )
+                celdas_validas.append((materia_id, periodo_id))
+
+            if not lista_datos:
+                return []
+
+            # Una sola pasada vectorizada de los modelos sobre (N, F)
+            X = np.array(
+                [
+                    [datos.get(f, 0.0) for f in self.features_principales]
+                    for datos in lista_datos
+                ]
+            )
+            X_scaled = self.scaler.transform(X)
+            numericas = np.clip(self.modelo_regresion.predict(X_scaled), 0, 100)
+            clasificaciones = self.label_encoder.inverse_transform(
+                self.modelo_clasificacion.predict(X_scaled)
+            )
+
+            # Upsert de predicciones y rendimientos con un único commit
+            predicciones_existentes = {
+                (p.materia_id, p.periodo_id): p
+                for p in db.query(PrediccionRendimiento)
+                .filter(
+                    PrediccionRendimiento.estudiante_id == estudiante_id,
+                    PrediccionRendimiento.materia_id.in_(materia_ids),
+                    PrediccionRendimiento.periodo_id.in_(periodo_ids),
+                )
+                .all()
+            }
+            rendimientos_existentes = {
+                (r.materia_id, r.periodo_id): r
+                for r in db.query(RendimientoFinal)
+                .filter(
+                    RendimientoFinal.estudiante_id == estudiante_id,
+                    RendimientoFinal.materia_id.in_(materia_ids),
+                    RendimientoFinal.periodo_id.in_(periodo_ids),
+                )
+                .all()
+            }
+
+            resultados = []
+            for (materia_id, periodo_id), datos, numerica, clasificacion in zip(
+                celdas_validas, lista_datos, numericas, clasificaciones
+            ):
+                numerica = round(float(numerica), 2)
+                nota = datos["promedio_notas_anterior"]
+
+                existente = predicciones_existentes.get((materia_id, periodo_id))
+                if existente:
+                    existente.promedio_notas = nota
+                    existente.porcentaje_asistencia = datos["porcentaje_asistencia"]
+                    existente.promedio_participacion = datos[
+                        "promedio_participacion"
+                    ]
+                    existente.resultado_numerico = numerica
+                    existente.clasificacion = clasificacion
+                    existente.updated_at = datetime.utcnow()
+                else:
+                    db.add(
+                        PrediccionRendimiento(
+                            promedio_notas=nota,
+                            porcentaje_asistencia=datos["porcentaje_asistencia"],
+                            promedio_participacion=datos["promedio_participacion"],
+                            resultado_numerico=numerica,
+                            clasificacion=clasificacion,
+                            estudiante_id=estudiante_id,
+                            materia_id=materia_id,
+                            periodo_id=periodo_id,
+                        )
+                    )
+
+                rf = rendimientos_existentes.get((materia_id, periodo_id))
+                if rf:
+                    rf.nota_final = nota
+                    rf.fecha_calculo = func.now()
+                else:
+                    db.add(
+                        RendimientoFinal(
+                            estudiante_id=estudiante_id,
+                            materia_id=materia_id,
+                            periodo_id=periodo_id,
+                            nota_final=nota,
+                        )
+                    )
+
+                resultados.append(
+                    {
+                        "materia_id": materia_id,
+                        "periodo_id": periodo_id,
+                        "prediccion_numerica": numerica,
+                        "clasificacion": clasificacion,
+                    }
+                )
+
+            db.commit()
+            return resultados
+
+        except ValueError:
             raise
+        except Exception as e:
+            logger.error(
+                f"Error en predicción batch del estudiante {estudiante_id}: {str(e)}"
+            )
+            raise PrediccionError(
+                f"Fallo en la predicción batch del estudiante {estudiante_id}"
+            ) from e
 
     def predecir_lote_estudiantes(
         self, db, curso_id: int, materia_id: int, periodo_id: int
@@ -832,7 +1080,7 @@ class PredictionService:
 
         except Exception as e:
             logger.error(f"Error en predicción por lotes: {str(e)}")
-            raise
+            raise PrediccionError("Fallo en la predicción por lotes") from e
 
     def obtener_estadisticas_modelo(self) -> Dict:
         """
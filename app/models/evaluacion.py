@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Integer, Float, String, Date, ForeignKey, func
+from sqlalchemy import Index, Column, DateTime, Integer, Float, String, Date, ForeignKey, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -6,6 +6,33 @@ from app.database import Base
 class Evaluacion(Base):
     __tablename__ = "evaluaciones"
 
+    # Índice compuesto para los filtros calientes de info-academica
+    __table_args__ = (
+        Index(
+            "ix_evaluacion_est_mat_per_tipo",
+            "estudiante_id",
+            "materia_id",
+            "periodo_id",
+            "tipo_evaluacion_id",
+        ),
+        # Cubre los filtros del router de evaluaciones: por-estudiante-periodo
+        # (prefijo de 3 columnas), por-tipo y los resúmenes. En Postgres el
+        # INCLUDE deja valor/descripcion en el índice, así que el "detalle"
+        # de los resúmenes sale con un index-only scan.
+        Index(
+            "ix_eval_est_per_tipo_mat_fec",
+            "estudiante_id",
+            "periodo_id",
+            "tipo_evaluacion_id",
+            "materia_id",
+            "fecha",
+            postgresql_include=["valor", "descripcion"],
+        ),
+        # Para los barridos por materia+periodo (reenviar notificaciones,
+        # listados masivos por fecha)
+        Index("ix_eval_materia_periodo", "materia_id", "periodo_id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     fecha = Column(Date, nullable=False)
     descripcion = Column(String, nullable=False)
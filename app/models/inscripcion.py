@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Integer, ForeignKey, Date, String, func
+from sqlalchemy import Index, Column, DateTime, Integer, ForeignKey, Date, String, func
 from app.database import Base
 from sqlalchemy.orm import relationship
 
@@ -6,6 +6,11 @@ from sqlalchemy.orm import relationship
 class Inscripcion(Base):
     __tablename__ = "inscripciones"
 
+    # Índice compuesto para los filtros calientes de info-academica
+    __table_args__ = (
+        Index("ix_inscripcion_est_gestion", "estudiante_id", "gestion_id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     descripcion = Column(String, nullable=False)
     fecha = Column(Date, nullable=False)
@@ -1,4 +1,5 @@
 from sqlalchemy import (
+    Index,
     Column,
     DateTime,
     Integer,
@@ -14,8 +15,14 @@ from app.database import Base
 
 class Periodo(Base):
     __tablename__ = "periodos"
+
+    # Nota: una sola asignación; dos tuplas separadas se pisan entre sí
     __table_args__ = (
         UniqueConstraint("nombre", "gestion_id", name="uq_nombre_gestion"),
+        # Filtros calientes de info-academica
+        Index("ix_periodo_gestion_fechas", "gestion_id", "fecha_inicio", "fecha_fin"),
+        # Búsqueda del periodo vigente por fecha (obtener_periodo_y_gestion_por_fecha)
+        Index("ix_periodo_fechas", "fecha_inicio", "fecha_fin"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
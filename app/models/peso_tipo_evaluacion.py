@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Integer, Float, ForeignKey, func
+from sqlalchemy import Index, Column, DateTime, Integer, Float, ForeignKey, func
 from app.database import Base
 from sqlalchemy.orm import relationship
 
@@ -6,6 +6,17 @@ from sqlalchemy.orm import relationship
 class PesoTipoEvaluacion(Base):
     __tablename__ = "peso_tipo_evaluacion"
 
+    # Índice compuesto para los filtros calientes de info-academica
+    __table_args__ = (
+        Index(
+            "ix_peso_doc_mat_gestion_tipo",
+            "docente_id",
+            "materia_id",
+            "gestion_id",
+            "tipo_evaluacion_id",
+        ),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     porcentaje = Column(Float, nullable=False)
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, String, ForeignKey, DateTime, func
+from sqlalchemy import Index, Column, Integer, Float, String, ForeignKey, DateTime, func
 from app.database import Base
 from sqlalchemy.orm import relationship
 
@@ -6,6 +6,11 @@ from sqlalchemy.orm import relationship
 class PrediccionRendimiento(Base):
     __tablename__ = "prediccion_rendimiento"
 
+    # Índice compuesto para los filtros calientes de info-academica
+    __table_args__ = (
+        Index("ix_prediccion_est_mat_per", "estudiante_id", "materia_id", "periodo_id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     promedio_notas = Column(Float, nullable=False)
     porcentaje_asistencia = Column(Float, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, func
+from sqlalchemy import Index, Column, Integer, Float, ForeignKey, DateTime, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -6,6 +6,11 @@ from app.database import Base
 class RendimientoFinal(Base):
     __tablename__ = "rendimiento_final"
 
+    # Índice compuesto para los filtros calientes de info-academica
+    __table_args__ = (
+        Index("ix_rendimiento_est_mat_per", "estudiante_id", "materia_id", "periodo_id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     nota_final = Column(Float, nullable=False)
     fecha_calculo = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,3 +1,5 @@
+from functools import cached_property
+
 from sqlalchemy import (
     Column,
     Integer,
@@ -7,11 +9,17 @@ from sqlalchemy import (
     Boolean,
     ForeignKey,
     Text,
+    Index,
+    and_,
+    case,
+    or_,
+    text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.database import Base
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 
 class SesionAsistencia(Base):
@@ -22,11 +30,25 @@ class SesionAsistencia(Base):
 
     __tablename__ = "sesiones_asistencia"
 
+    # Índices compuestos para las consultas más frecuentes:
+    # sesiones de un docente por periodo/estado y sesiones por curso+materia
+    __table_args__ = (
+        Index("ix_sesion_docente_periodo_estado", "docente_id", "periodo_id", "estado"),
+        Index("ix_sesion_curso_materia", "curso_id", "materia_id"),
+        Index(
+            "ix_sesion_activa",
+            "docente_id",
+            postgresql_where=text("estado = 'activa'"),
+        ),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
 
     # Información básica de la sesión
     titulo = Column(String(200), nullable=False)  # Ej: "Matemáticas - Clase 1"
-    descripcion = Column(Text, nullable=True)  # Descripción opcional
+    # Columnas de texto diferidas: solo se cargan cuando la consulta hace
+    # undefer() explícito, acortando la proyección en los flujos internos
+    descripcion = deferred(Column(Text, nullable=True))  # Descripción opcional
 
     # Relaciones con otras tablas
     docente_id = Column(Integer, ForeignKey("docentes.id"), nullable=False)
@@ -34,15 +56,19 @@ class SesionAsistencia(Base):
     materia_id = Column(Integer, ForeignKey("materias.id"), nullable=False)
     periodo_id = Column(Integer, ForeignKey("periodos.id"), nullable=False)
 
-    # Fechas y tiempos
-    fecha_inicio = Column(DateTime, nullable=False, default=func.now())
-    fecha_fin = Column(DateTime, nullable=True)  # Cuando el docente cierra la sesión
+    # Fechas y tiempos (timezone-aware, igual que TipoEvaluacion)
+    fecha_inicio = Column(DateTime(timezone=True), nullable=False, default=func.now())
+    fecha_fin = Column(
+        DateTime(timezone=True), nullable=True
+    )  # Cuando el docente cierra la sesión
     duracion_minutos = Column(Integer, default=60)  # Duración estimada en minutos
 
     # Geolocalización del docente
     latitud_docente = Column(Float, nullable=False)  # Ubicación del docente
     longitud_docente = Column(Float, nullable=False)  # Ubicación del docente
-    direccion_referencia = Column(String(500), nullable=True)  # Dirección de referencia
+    direccion_referencia = deferred(
+        Column(String(500), nullable=True)
+    )  # Dirección de referencia
 
     # Configuración de la sesión
     radio_permitido_metros = Column(
@@ -59,8 +85,10 @@ class SesionAsistencia(Base):
     estado = Column(String(20), default="activa")  # activa, cerrada, cancelada
 
     # Metadata
-    fecha_creacion = Column(DateTime, default=func.now())
-    fecha_actualizacion = Column(DateTime, default=func.now(), onupdate=func.now())
+    fecha_creacion = Column(DateTime(timezone=True), default=func.now())
+    fecha_actualizacion = Column(
+        DateTime(timezone=True), default=func.now(), onupdate=func.now()
+    )
 
     # Relaciones
     docente = relationship("Docente", back_populates="sesiones_asistencia")
@@ -72,13 +100,19 @@ class SesionAsistencia(Base):
     def __repr__(self):
         return f"<SesionAsistencia(id={self.id}, titulo='{self.titulo}', estado='{self.estado}')>"
 
-    @property
+    @cached_property
+    def _tiempo_limite(self):
+        """Límite para marcar asistencia tardía (se calcula una sola vez)"""
+        return self.fecha_inicio + timedelta(minutes=self.minutos_tolerancia)
+
+    @hybrid_property
     def esta_activa(self):
         """Verifica si la sesión está activa y dentro del tiempo permitido"""
         if self.estado != "activa":
             return False
 
-        now = datetime.now()
+        # UTC aware para coincidir con las columnas DateTime(timezone=True)
+        now = datetime.now(timezone.utc)
 
         # Verificar si no ha pasado el tiempo límite
         if self.fecha_fin and now > self.fecha_fin:
@@ -88,10 +122,22 @@ class SesionAsistencia(Base):
         if not self.permite_asistencia_tardia:
             return now <= self.fecha_inicio
 
-        # ✅ Usar timedelta en lugar de modificar el minuto directamente
-
-        tiempo_limite = self.fecha_inicio + timedelta(minutes=self.minutos_tolerancia)
-        return now <= tiempo_limite
+        return now <= self._tiempo_limite
+
+    @esta_activa.expression
+    def esta_activa(cls):
+        """Versión SQL: permite filtrar sesiones activas en la base de datos"""
+        now = func.now()
+        return and_(
+            cls.estado == "activa",
+            or_(cls.fecha_fin.is_(None), cls.fecha_fin >= now),
+            case(
+                (cls.permite_asistencia_tardia.is_(False), cls.fecha_inicio >= now),
+                else_=cls.fecha_inicio
+                + func.make_interval(0, 0, 0, 0, 0, cls.minutos_tolerancia)
+                >= now,
+            ),
+        )
 
     @property
     def estudiantes_presentes(self):
@@ -112,6 +158,17 @@ class AsistenciaEstudiante(Base):
 
     __tablename__ = "asistencias_estudiantes"
 
+    # Índices para "asistencias de una sesión/estudiante" e historial del estudiante
+    __table_args__ = (
+        Index(
+            "ix_asistencia_sesion_estudiante",
+            "sesion_id",
+            "estudiante_id",
+            unique=True,
+        ),
+        Index("ix_asistencia_estudiante_presente", "estudiante_id", "presente"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
 
     # Relaciones
@@ -120,7 +177,9 @@ class AsistenciaEstudiante(Base):
 
     # Estado de asistencia
     presente = Column(Boolean, default=False)
-    fecha_marcado = Column(DateTime, nullable=True)  # Cuando marcó asistencia
+    fecha_marcado = Column(
+        DateTime(timezone=True), nullable=True
+    )  # Cuando marcó asistencia
 
     # Ubicación del estudiante al marcar
     latitud_estudiante = Column(Float, nullable=True)
@@ -129,16 +188,18 @@ class AsistenciaEstudiante(Base):
 
     # Detalles adicionales
     metodo_marcado = Column(String(20), default="gps")  # gps, manual, qr_code (futuro)
-    observaciones = Column(Text, nullable=True)  # Notas adicionales
+    observaciones = deferred(Column(Text, nullable=True))  # Notas adicionales
 
     # Estados especiales
     es_tardanza = Column(Boolean, default=False)  # Si llegó tarde
     justificado = Column(Boolean, default=False)  # Si la ausencia está justificada
-    motivo_justificacion = Column(String(500), nullable=True)
+    motivo_justificacion = deferred(Column(String(500), nullable=True))
 
     # Metadata
-    fecha_creacion = Column(DateTime, default=func.now())
-    fecha_actualizacion = Column(DateTime, default=func.now(), onupdate=func.now())
+    fecha_creacion = Column(DateTime(timezone=True), default=func.now())
+    fecha_actualizacion = Column(
+        DateTime(timezone=True), default=func.now(), onupdate=func.now()
+    )
 
     # Relaciones
     sesion = relationship("SesionAsistencia", back_populates="asistencias")
@@ -1,10 +1,15 @@
-from sqlalchemy import Column, DateTime, Integer, String, func
+from sqlalchemy import Column, DateTime, Index, Integer, String, func, text
 from app.database import Base
 
 
 class TipoEvaluacion(Base):
     __tablename__ = "tipoevaluaciones"
 
+    # Índice funcional para el lookup case-insensitive por nombre
+    __table_args__ = (
+        Index("ix_tipoevaluacion_lower_nombre", text("lower(nombre)")),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     nombre = Column(String, nullable=False, unique=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,22 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.deps import get_db
 from app.schemas.auth import LoginRequest, LoginResponse, UserProfileResponse
 from app.services.auth_service import AuthService
 from app.auth.auth_handler import crear_token
 from app.auth.auth_bearer import JWTBearer
+from app.auth.roles import usuario_actual
 
 router = APIRouter(prefix="/auth", tags=["🔐 Autenticación Unificada"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/login", response_model=LoginResponse)
 def login_unificado(datos: LoginRequest, db: Session = Depends(get_db)):
     """
@@ -78,19 +71,15 @@ def login_unificado(datos: LoginRequest, db: Session = Depends(get_db)):
 
 @router.get("/profile", response_model=UserProfileResponse)
 def get_profile_unificado(
-    payload: dict = Depends(JWTBearer()), db: Session = Depends(get_db)
+    payload: dict = Depends(JWTBearer()),
+    profile: dict = Depends(usuario_actual),
 ):
     """
     👤 Obtener perfil del usuario autenticado (cualquier tipo)
     """
-    user_id = payload.get("user_id")
-    user_type = payload.get("user_type")
-
-    if not user_id or not user_type:
+    if not payload.get("user_id") or not payload.get("user_type"):
         raise HTTPException(status_code=401, detail="Token inválido")
 
-    profile = AuthService.get_user_profile(db, user_id, user_type)
-
     if not profile:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
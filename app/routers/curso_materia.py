@@ -1,6 +1,7 @@
+from fastapi.responses import ORJSONResponse
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.deps import get_db
 from app.schemas.curso_materia import (
     CursoMateriaCreate,
     CursoMateriaUpdate,
@@ -14,14 +15,6 @@ from app.auth.roles import admin_required, docente_o_admin_required
 router = APIRouter(prefix="/curso-materia", tags=["CursoMateria"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/", response_model=CursoMateriaOut)
 def asignar(
     datos: CursoMateriaCreate,
@@ -31,7 +24,7 @@ def asignar(
     return crud.crear_asignacion(db, datos)
 
 
-@router.get("/", response_model=list[CursoMateriaOut])
+@router.get("/", response_model=list[CursoMateriaOut], response_class=ORJSONResponse, response_model_exclude_unset=True)
 def listar(db: Session = Depends(get_db), payload: dict = Depends(admin_required)):
     return crud.listar_asignaciones(db)
 
@@ -73,7 +66,7 @@ def eliminar(
     return {"mensaje": "Asignación eliminada"}
 
 
-@router.get("/materias-por-curso/{curso_id}", response_model=list[CursoMateriaDetalle])
+@router.get("/materias-por-curso/{curso_id}", response_model=list[CursoMateriaDetalle], response_class=ORJSONResponse, response_model_exclude_unset=True)
 def materias_por_curso(
     curso_id: int,
     db: Session = Depends(get_db),
@@ -83,8 +76,7 @@ def materias_por_curso(
 
 
 @router.get(
-    "/cursos-por-materia/{materia_id}", response_model=list[CursoMateriaDetalle]
-)
+    "/cursos-por-materia/{materia_id}", response_model=list[CursoMateriaDetalle], response_class=ORJSONResponse, response_model_exclude_unset=True)
 def cursos_por_materia(
     materia_id: int,
     db: Session = Depends(get_db),
@@ -93,7 +85,7 @@ def cursos_por_materia(
     return crud.listar_cursos_por_materia(db, materia_id)
 
 
-@router.get("/materias-docente/{docente_id}", response_model=list[MateriaConCurso])
+@router.get("/materias-docente/{docente_id}", response_model=list[MateriaConCurso], response_class=ORJSONResponse, response_model_exclude_unset=True)
 def materias_con_curso_por_docente(
     docente_id: int,
     db: Session = Depends(get_db),
@@ -1,6 +1,7 @@
+from fastapi.responses import ORJSONResponse
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.deps import get_db
 from app.schemas.curso import CursoCreate, CursoUpdate, CursoOut
 from app.crud import curso as crud
 from app.auth.roles import admin_required,docente_o_admin_required
@@ -8,37 +9,17 @@ from app.auth.roles import admin_required,docente_o_admin_required
 router = APIRouter(prefix="/cursos", tags=["Cursos"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-def validar_campo(nombre: str, valor: str):
-    if not valor or valor.strip() == "":
-        raise HTTPException(
-            status_code=400, detail=f"El campo '{nombre}' no puede estar vacío"
-        )
-    return valor.strip()
-
-
 @router.post("/", response_model=CursoOut)
 def crear(
     datos: CursoCreate,
     db: Session = Depends(get_db),
     payload: dict = Depends(admin_required),
 ):
-    datos.nombre = validar_campo("nombre", datos.nombre)
-    datos.nivel = validar_campo("nivel", datos.nivel)
-    datos.paralelo = validar_campo("paralelo", datos.paralelo)
-    datos.turno = validar_campo("turno", datos.turno)
-
+    # La validación de campos vacíos vive en el esquema CursoBase
     return crud.crear_curso(db, datos)
 
 
-@router.get("/", response_model=list[CursoOut])
+@router.get("/", response_model=list[CursoOut], response_class=ORJSONResponse, response_model_exclude_unset=True)
 def listar(db: Session = Depends(get_db), payload: dict = Depends(admin_required)):
     return crud.obtener_cursos(db)
 
@@ -62,11 +43,6 @@ def actualizar(
     db: Session = Depends(get_db),
     payload: dict = Depends(admin_required),
 ):
-    datos.nombre = validar_campo("nombre", datos.nombre)
-    datos.nivel = validar_campo("nivel", datos.nivel)
-    datos.paralelo = validar_campo("paralelo", datos.paralelo)
-    datos.turno = validar_campo("turno", datos.turno)
-
     return crud.actualizar_curso(db, curso_id, datos)
 
 
@@ -1,6 +1,7 @@
+from fastapi.responses import ORJSONResponse
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.deps import get_db
 from app.schemas.docente_materia import AsignacionCreate, AsignacionOut
 from app.crud import docente_materia as crud
 from app.auth.roles import admin_required, docente_o_admin_required
@@ -9,14 +10,6 @@ from app.schemas.docente_materia import MateriaAsignada, DocenteAsignado
 router = APIRouter(prefix="/asignaciones", tags=["Asignaciones Docente-Materia"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/", response_model=AsignacionOut)
 def asignar(
     datos: AsignacionCreate,
@@ -26,7 +19,7 @@ def asignar(
     return crud.asignar_docente_materia(db, datos)
 
 
-@router.get("/", response_model=list[AsignacionOut])
+@router.get("/", response_model=list[AsignacionOut], response_class=ORJSONResponse, response_model_exclude_unset=True)
 def listar(db: Session = Depends(get_db), payload: dict = Depends(docente_o_admin_required)):
     return crud.obtener_asignaciones(db)
 
@@ -43,7 +36,7 @@ def eliminar(
     return {"mensaje": "Asignación eliminada"}
 
 
-@router.get("/materias-por-docente/{docente_id}", response_model=list[MateriaAsignada])
+@router.get("/materias-por-docente/{docente_id}", response_model=list[MateriaAsignada], response_class=ORJSONResponse, response_model_exclude_unset=True)
 def materias_por_docente(
     docente_id: int,
     db: Session = Depends(get_db),
@@ -53,7 +46,7 @@ def materias_por_docente(
     return asignaciones
 
 
-@router.get("/docentes-por-materia/{materia_id}", response_model=list[DocenteAsignado])
+@router.get("/docentes-por-materia/{materia_id}", response_model=list[DocenteAsignado], response_class=ORJSONResponse, response_model_exclude_unset=True)
 def docentes_por_materia(
     materia_id: int,
     db: Session = Depends(get_db),
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.deps import get_db
 from app.schemas.curso import CursoOut
 from app.schemas.docente import DocenteCreate, DocenteLogin, DocenteOut, DocenteUpdate, EstudianteAsignadoDetalle
 from app.crud import docente as crud
+from app.cache.request_cache import RequestCache, get_request_cache
+from app.models.docente import Docente
 from app.auth.auth_handler import crear_token
 from app.auth.roles import admin_required, docente_o_admin_required
 from app.auth.auth_bearer import JWTBearer
@@ -13,14 +16,6 @@ from app.schemas.materia import MateriaOut
 router = APIRouter(prefix="/docentes", tags=["Docentes"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/", response_model=DocenteOut)
 def crear(
     docente: DocenteCreate,
@@ -73,14 +68,14 @@ def eliminar(
     return {"mensaje": "Docente eliminado correctamente"}
 
 
-@router.get("/solo-docentes", response_model=list[DocenteOut])
+@router.get("/solo-docentes", response_model=list[DocenteOut], response_class=ORJSONResponse, response_model_exclude_unset=True)
 def listar_docentes(
     db: Session = Depends(get_db), payload: dict = Depends(admin_required)
 ):
     return crud.obtener_docentes(db)
 
 
-@router.get("/solo-admins", response_model=list[DocenteOut])
+@router.get("/solo-admins", response_model=list[DocenteOut], response_class=ORJSONResponse, response_model_exclude_unset=True)
 def listar_admins(
     db: Session = Depends(get_db), payload: dict = Depends(admin_required)
 ):
@@ -92,14 +87,15 @@ def obtener_docente(
     docente_id: int,
     db: Session = Depends(get_db),
     payload: dict = Depends(admin_required),
+    cache: RequestCache = Depends(get_request_cache),
 ):
-    docente = crud.obtener_docente_por_id(db, docente_id)
+    docente = cache.get_or_load(db, Docente, docente_id)
     if not docente:
         raise HTTPException(status_code=404, detail="Docente no encontrado")
     return docente
 
 
-@router.get("/materias-docente/{docente_id}", response_model=list[MateriaOut])
+@router.get("/materias-docente/{docente_id}", response_model=list[MateriaOut], response_class=ORJSONResponse, response_model_exclude_unset=True)
 def listar_materias_del_docente(
     docente_id: int,
     db: Session = Depends(get_db),
@@ -108,7 +104,7 @@ def listar_materias_del_docente(
     return crud.obtener_materias_del_docente(db, docente_id)
 
 
-@router.get("/cursos-docente/{docente_id}", response_model=list[CursoOut])
+@router.get("/cursos-docente/{docente_id}", response_model=list[CursoOut], response_class=ORJSONResponse, response_model_exclude_unset=True)
 def listar_cursos_del_docente(
     docente_id: int,
     db: Session = Depends(get_db),
@@ -119,8 +115,7 @@ def listar_cursos_del_docente(
 
 @router.get(
     "/alumnos-docente/{docente_id}/curso/{curso_id}/materia/{materia_id}",
-    response_model=list[EstudianteOut],
-)
+    response_model=list[EstudianteOut], response_class=ORJSONResponse, response_model_exclude_unset=True)
 def listar_alumnos_de_materia_y_curso(
     docente_id: int,
     curso_id: int,
@@ -133,7 +128,7 @@ def listar_alumnos_de_materia_y_curso(
     )
 
 
-@router.get("/{docente_id}/curso/{curso_id}/materias", response_model=list[MateriaOut])
+@router.get("/{docente_id}/curso/{curso_id}/materias", response_model=list[MateriaOut], response_class=ORJSONResponse, response_model_exclude_unset=True)
 def materias_docente_en_curso(
     docente_id: int,
     curso_id: int,
@@ -143,15 +138,23 @@ def materias_docente_en_curso(
     return crud.obtener_materias_docente_en_curso(db, docente_id, curso_id)
 
 
-@router.get("/alumnos-asignados/{docente_id}", response_model=list[EstudianteAsignadoDetalle])
+@router.get("/alumnos-asignados/{docente_id}", response_model=list[EstudianteAsignadoDetalle], response_class=ORJSONResponse, response_model_exclude_unset=True)
 def listar_estudiantes_asignados_a_docente(
     docente_id: int,
     curso_id: int = None,
     materia_id: int = None,
     nombre: str = None,
+    limite: int = Query(100, ge=1, le=500, description="Límite de resultados"),
+    offset: int = Query(0, ge=0, description="Desplazamiento para paginación"),
     db: Session = Depends(get_db),
     payload: dict = Depends(docente_o_admin_required),
 ):
     return crud.obtener_estudiantes_de_docente(
-        db, docente_id, curso_id=curso_id, materia_id=materia_id, nombre=nombre
+        db,
+        docente_id,
+        curso_id=curso_id,
+        materia_id=materia_id,
+        nombre=nombre,
+        limite=limite,
+        offset=offset,
     )
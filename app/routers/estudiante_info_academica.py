@@ -1,9 +1,10 @@
 # app/routers/estudiante_info_academica.py
 from datetime import date
 from venv import logger
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.deps import get_db
+from app.models.estudiante import Estudiante
 from app.schemas.estudiante_info_academica import (
     InfoAcademicaResponse,
     InfoAcademicaCompleta,
@@ -16,6 +17,7 @@ from app.schemas.estudiante_info_academica import (
     DocenteConMaterias,
 )
 from app.crud import estudiante_info_academica as crud
+from app.utils.http_cache import respuesta_con_etag
 from app.auth.roles import usuario_autenticado, estudiante_required
 from typing import Optional
 from sqlalchemy import func
@@ -25,36 +27,40 @@ router = APIRouter(
 )
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-def obtener_estudiante_actual(payload: dict, db: Session):
-    """Helper para obtener el estudiante autenticado"""
-    user_id = payload.get("user_id")
-    user_type = payload.get("user_type")
+def get_current_estudiante(
+    request: Request,
+    payload: dict = Depends(estudiante_required),
+    db: Session = Depends(get_db),
+) -> Estudiante:
+    """Estudiante autenticado, resuelto una sola vez por request.
 
-    if not user_id or user_type != "estudiante":
-        raise HTTPException(status_code=403, detail="Solo estudiantes pueden acceder")
+    Memoizado en request.state para que múltiples dependencias o
+    handlers del mismo request no repitan el SELECT por id.
+    """
+    estudiante = getattr(request.state, "estudiante", None)
+    if estudiante is None:
+        user_id = payload.get("user_id")
+        if not user_id:
+            raise HTTPException(
+                status_code=403, detail="Solo estudiantes pueden acceder"
+            )
 
-    estudiante = crud.obtener_estudiante_por_id(db, user_id)
-    if not estudiante:
-        raise HTTPException(status_code=404, detail="Estudiante no encontrado")
+        estudiante = crud.obtener_estudiante_por_id(db, user_id)
+        if not estudiante:
+            raise HTTPException(status_code=404, detail="Estudiante no encontrado")
 
+        request.state.estudiante = estudiante
     return estudiante
 
 
 @router.get("/completa", response_model=InfoAcademicaResponse)
 def obtener_info_academica_completa(
+    request: Request,
     gestion_id: Optional[int] = Query(
         None,
         description="ID de la gestión (opcional, usa la gestión activa por defecto)",
     ),
-    payload: dict = Depends(estudiante_required),
+    estudiante: Estudiante = Depends(get_current_estudiante),
     db: Session = Depends(get_db),
 ):
     """
@@ -63,8 +69,6 @@ def obtener_info_academica_completa(
     - Las materias del curso
     - Los docentes de cada materia
     """
-    estudiante = obtener_estudiante_actual(payload, db)
-
     info_academica = crud.obtener_info_academica_estudiante(
         db, estudiante.id, gestion_id
     )
@@ -73,27 +77,27 @@ def obtener_info_academica_completa(
     if "error" in info_academica:
         return InfoAcademicaResponse(success=False, mensaje=info_academica["error"])
 
-    # Convertir a modelo Pydantic
-    data = InfoAcademicaCompleta(**info_academica)
-
-    return InfoAcademicaResponse(
-        success=True,
-        data=data,
-        mensaje=f"Información académica obtenida exitosamente para la gestión {info_academica['gestion']['anio']}",
+    # Devolver los dicts ya construidos: el response_model valida una sola
+    # vez al serializar, sin instanciar los modelos Pydantic por adelantado
+    return respuesta_con_etag(
+        request,
+        {
+            "success": True,
+            "data": info_academica,
+            "mensaje": f"Información académica obtenida exitosamente para la gestión {info_academica['gestion']['anio']}",
+        },
     )
 
 
 @router.get("/curso", response_model=CursoEstudianteResponse)
 def obtener_mi_curso(
     gestion_id: Optional[int] = Query(None, description="ID de la gestión (opcional)"),
-    payload: dict = Depends(estudiante_required),
+    estudiante: Estudiante = Depends(get_current_estudiante),
     db: Session = Depends(get_db),
 ):
     """
     🏫 Obtener el curso actual del estudiante autenticado
     """
-    estudiante = obtener_estudiante_actual(payload, db)
-
     curso = crud.obtener_curso_estudiante(db, estudiante.id, gestion_id)
 
     if not curso:
@@ -108,15 +112,14 @@ def obtener_mi_curso(
 
 @router.get("/materias", response_model=MateriasEstudianteResponse)
 def obtener_mis_materias(
+    request: Request,
     gestion_id: Optional[int] = Query(None, description="ID de la gestión (opcional)"),
-    payload: dict = Depends(estudiante_required),
+    estudiante: Estudiante = Depends(get_current_estudiante),
     db: Session = Depends(get_db),
 ):
     """
     📖 Obtener las materias del estudiante autenticado con sus docentes
     """
-    estudiante = obtener_estudiante_actual(payload, db)
-
     materias = crud.obtener_materias_estudiante(db, estudiante.id, gestion_id)
 
     if not materias:
@@ -126,28 +129,28 @@ def obtener_mis_materias(
             total=0,
         )
 
-    # Convertir a modelos Pydantic
-    materias_response = [MateriaConDocente(**materia) for materia in materias]
-
-    return MateriasEstudianteResponse(
-        success=True,
-        materias=materias_response,
-        total=len(materias_response),
-        mensaje=f"Se encontraron {len(materias_response)} materias",
+    # Dicts crudos: el response_model los valida una sola vez al serializar
+    return respuesta_con_etag(
+        request,
+        {
+            "success": True,
+            "materias": materias,
+            "total": len(materias),
+            "mensaje": f"Se encontraron {len(materias)} materias",
+        },
     )
 
 
 @router.get("/docentes", response_model=DocentesEstudianteResponse)
 def obtener_mis_docentes(
+    request: Request,
     gestion_id: Optional[int] = Query(None, description="ID de la gestión (opcional)"),
-    payload: dict = Depends(estudiante_required),
+    estudiante: Estudiante = Depends(get_current_estudiante),
     db: Session = Depends(get_db),
 ):
     """
     👨‍🏫 Obtener todos los docentes que enseñan al estudiante autenticado
     """
-    estudiante = obtener_estudiante_actual(payload, db)
-
     docentes = crud.obtener_docentes_estudiante(db, estudiante.id, gestion_id)
 
     if not docentes:
@@ -157,28 +160,28 @@ def obtener_mis_docentes(
             total=0,
         )
 
-    # Convertir a modelos Pydantic
-    docentes_response = [DocenteConMaterias(**docente) for docente in docentes]
-
-    return DocentesEstudianteResponse(
-        success=True,
-        docentes=docentes_response,
-        total=len(docentes_response),
-        mensaje=f"Se encontraron {len(docentes_response)} docentes",
+    # Dicts crudos: el response_model los valida una sola vez al serializar
+    return respuesta_con_etag(
+        request,
+        {
+            "success": True,
+            "docentes": docentes,
+            "total": len(docentes),
+            "mensaje": f"Se encontraron {len(docentes)} docentes",
+        },
     )
 
 
 @router.get("/resumen", response_model=dict)
 def obtener_resumen_academico(
+    request: Request,
     gestion_id: Optional[int] = Query(None, description="ID de la gestión (opcional)"),
-    payload: dict = Depends(estudiante_required),
+    estudiante: Estudiante = Depends(get_current_estudiante),
     db: Session = Depends(get_db),
 ):
     """
     📊 Obtener un resumen de la información académica del estudiante
     """
-    estudiante = obtener_estudiante_actual(payload, db)
-
     info_academica = crud.obtener_info_academica_estudiante(
         db, estudiante.id, gestion_id
     )
@@ -186,11 +189,15 @@ def obtener_resumen_academico(
     if "error" in info_academica:
         return {"success": False, "mensaje": info_academica["error"]}
 
-    # Crear resumen
-    materias_con_docente = sum(
-        1 for m in info_academica["materias"] if m["docente"] is not None
-    )
-    materias_sin_docente = len(info_academica["materias"]) - materias_con_docente
+    # Crear resumen en una sola pasada sobre las materias
+    materias = info_academica["materias"]
+    materias_con_docente = 0
+    docente_ids = set()
+    for m in materias:
+        docente = m["docente"]
+        if docente is not None:
+            materias_con_docente += 1
+            docente_ids.add(docente["id"])
 
     resumen = {
         "success": True,
@@ -198,21 +205,15 @@ def obtener_resumen_academico(
         "curso": info_academica["curso"],
         "gestion": info_academica["gestion"],
         "estadisticas": {
-            "total_materias": len(info_academica["materias"]),
+            "total_materias": len(materias),
             "materias_con_docente": materias_con_docente,
-            "materias_sin_docente": materias_sin_docente,
-            "total_docentes": len(
-                set(
-                    m["docente"]["id"]
-                    for m in info_academica["materias"]
-                    if m["docente"] is not None
-                )
-            ),
+            "materias_sin_docente": len(materias) - materias_con_docente,
+            "total_docentes": len(docente_ids),
         },
         "mensaje": f"Resumen académico para la gestión {info_academica['gestion']['anio']}",
     }
 
-    return resumen
+    return respuesta_con_etag(request, resumen)
 
 
 # ================ ENDPOINTS ADICIONALES PARA FUNCIONALIDADES ESPECÍFICAS ================
@@ -222,22 +223,16 @@ def obtener_resumen_academico(
 def obtener_docente_de_materia(
     materia_id: int,
     gestion_id: Optional[int] = Query(None, description="ID de la gestión (opcional)"),
-    payload: dict = Depends(estudiante_required),
+    estudiante: Estudiante = Depends(get_current_estudiante),
     db: Session = Depends(get_db),
 ):
     """
     👨‍🏫 Obtener el docente de una materia específica del estudiante
     """
-    estudiante = obtener_estudiante_actual(payload, db)
-
-    materias = crud.obtener_materias_estudiante(db, estudiante.id, gestion_id)
-
-    # Buscar la materia específica
-    materia_encontrada = None
-    for materia in materias:
-        if materia["materia"]["id"] == materia_id:
-            materia_encontrada = materia
-            break
+    # Consulta puntual por materia, sin traer todas las materias del curso
+    materia_encontrada = crud.obtener_docente_de_materia_estudiante(
+        db, estudiante.id, materia_id, gestion_id
+    )
 
     if not materia_encontrada:
         return {
@@ -258,13 +253,12 @@ def obtener_docente_de_materia(
 
 @router.get("/verificar-inscripcion", response_model=dict)
 def verificar_inscripcion_activa(
-    payload: dict = Depends(estudiante_required), db: Session = Depends(get_db)
+    estudiante: Estudiante = Depends(get_current_estudiante),
+    db: Session = Depends(get_db),
 ):
     """
     ✅ Verificar si el estudiante tiene una inscripción activa
     """
-    estudiante = obtener_estudiante_actual(payload, db)
-
     curso = crud.obtener_curso_estudiante(db, estudiante.id)
 
     if curso:
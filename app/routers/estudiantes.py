@@ -1,34 +1,107 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+import hashlib
+import logging
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    File,
+)
 from sqlalchemy.orm import Session
-from app.schemas.estudiante import EstudianteOut, EstudianteUpdate
-from app.database import SessionLocal
+from app.schemas.estudiante import (
+    EstudianteFormIn,
+    EstudianteOut,
+    EstudianteUpdate,
+    EstudiantesBulkIn,
+)
+from app.deps import get_db
 from app.crud import estudiante as crud
+from app.crud import estudiante_info_academica as info_crud
+from app.crud.padre import es_padre_del_estudiante, padre_de_estudiantes
 from app.auth.roles import (
     admin_required,
     docente_o_admin_required,
     propietario_o_admin,
     usuario_autenticado,
 )
-from app.cloudinary import subir_imagen_a_cloudinary
-from datetime import datetime
+from app.cloudinary import subir_bytes_a_cloudinary
+from app.utils.http_cache import respuesta_con_etag
+from app.database import SessionLocal
+from app.models.estudiante import Estudiante
 
 router = APIRouter(prefix="/estudiantes", tags=["Estudiantes"])
 
+logger = logging.getLogger(__name__)
+
+# Tope de tamaño para la imagen de perfil: se rechaza antes de leerla
+MAX_TAMANO_IMAGEN = 10 * 1024 * 1024  # 10 MB
+
+# Ventana corta de cache privado para los GET de solo lectura
+CACHE_PRIVADO = "private, max-age=60"
+
+
+def _etag_perfil(estudiante: Estudiante) -> str:
+    """ETag fuerte del perfil: cambia cuando cambia updated_at"""
+    marca = estudiante.updated_at or estudiante.created_at
+    return hashlib.blake2b(
+        f"{estudiante.id}:{marca}".encode(), digest_size=16
+    ).hexdigest()
+
+
+def _subir_imagen_y_actualizar(estudiante_id: int, contenido: bytes, nombre_completo: str):
+    """Sube la imagen a Cloudinary fuera del request y fija la URL.
+
+    Corre como tarea en segundo plano con sesión propia: el POST/PUT
+    responde sin esperar el round trip HTTP externo.
+    """
+    try:
+        url = subir_bytes_a_cloudinary(contenido, nombre_completo)
+    except Exception as e:
+        logger.error(f"Error subiendo imagen de estudiante {estudiante_id}: {e}")
+        return
+
+    if not url:
+        return
 
-def get_db():
     db = SessionLocal()
     try:
-        yield db
+        estudiante = db.get(Estudiante, estudiante_id)
+        if estudiante:
+            estudiante.url_imagen = url
+            db.commit()
     finally:
         db.close()
 
 
-def validar_campo(nombre: str, valor: str):
-    if not valor or valor.strip() == "":
-        raise HTTPException(
-            status_code=400, detail=f"El campo '{nombre}' no puede estar vacío"
-        )
-    return valor.strip()
+def estudiante_autenticado(
+    request: Request,
+    payload: dict = Depends(usuario_autenticado),
+    db: Session = Depends(get_db),
+) -> Estudiante:
+    """Estudiante autenticado resuelto una sola vez por request.
+
+    Concentra el guard de user_type y el lookup del estudiante que antes
+    repetía cada endpoint; memoizado en request.state para no re-ejecutar
+    el SELECT si varios dependencies lo piden.
+    """
+    estudiante = getattr(request.state, "estudiante", None)
+    if estudiante is None:
+        if payload.get("user_type") != "estudiante":
+            raise HTTPException(
+                status_code=403, detail="Solo estudiantes pueden acceder"
+            )
+
+        estudiante = crud.obtener_estudiante(db, payload.get("user_id"))
+        if not estudiante:
+            raise HTTPException(status_code=404, detail="Estudiante no encontrado")
+
+        request.state.estudiante = estudiante
+    return estudiante
 
 
 # ========== RUTAS ESPECÍFICAS PRIMERO ==========
@@ -36,125 +109,117 @@ def validar_campo(nombre: str, valor: str):
 
 @router.get("/mi-perfil", response_model=EstudianteOut)
 def obtener_mi_perfil_estudiante(
-    payload: dict = Depends(usuario_autenticado),
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    estudiante: Estudiante = Depends(estudiante_autenticado),
 ):
     """👤 Obtener mi perfil como estudiante"""
-    # Verificar que el usuario es estudiante
-    if payload.get("user_type") != "estudiante":
-        raise HTTPException(status_code=403, detail="Solo estudiantes pueden acceder")
+    etag = _etag_perfil(estudiante)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
 
-    estudiante_id = payload.get("user_id")
-    estudiante = crud.obtener_estudiante(db, estudiante_id)
-    if not estudiante:
-        raise HTTPException(status_code=404, detail="Estudiante no encontrado")
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_PRIVADO
     return estudiante
 
 
 @router.get("/mi-curso-actual", response_model=dict)
 def obtener_mi_curso_actual(
-    payload: dict = Depends(usuario_autenticado), db: Session = Depends(get_db)
+    request: Request,
+    estudiante: Estudiante = Depends(estudiante_autenticado),
+    db: Session = Depends(get_db),
 ):
     """🏫 Obtener mi curso actual (versión simplificada)"""
-    # Verificar que el usuario es estudiante
-    if payload.get("user_type") != "estudiante":
-        raise HTTPException(status_code=403, detail="Solo estudiantes pueden acceder")
+    # Vista delgada sobre el bundle cacheado: mismo resultado que el
+    # dashboard, sin re-ejecutar las subconsultas de curso
+    info = info_crud.obtener_info_academica_estudiante(db, estudiante.id)
 
-    estudiante_id = payload.get("user_id")
-    estudiante = crud.obtener_estudiante(db, estudiante_id)
-
-    if not estudiante:
-        raise HTTPException(status_code=404, detail="Estudiante no encontrado")
-
-    from app.crud import estudiante_info_academica as info_crud
-
-    curso = info_crud.obtener_curso_estudiante(db, estudiante.id)
-
-    if not curso:
+    if "error" in info:
         return {
             "success": False,
             "mensaje": "No tienes curso asignado en la gestión actual",
         }
 
-    return {"success": True, "curso": curso, "mensaje": "Curso obtenido exitosamente"}
+    return respuesta_con_etag(
+        request,
+        {
+            "success": True,
+            "curso": info["curso"],
+            "mensaje": "Curso obtenido exitosamente",
+        },
+        cache_control=CACHE_PRIVADO,
+    )
 
 
 @router.get("/mis-materias-docentes", response_model=dict)
 def obtener_mis_materias_con_docentes(
-    payload: dict = Depends(usuario_autenticado), db: Session = Depends(get_db)
+    request: Request,
+    estudiante: Estudiante = Depends(estudiante_autenticado),
+    db: Session = Depends(get_db),
 ):
     """📚 Obtener mis materias con sus docentes (versión simplificada)"""
-    # Verificar que el usuario es estudiante
-    if payload.get("user_type") != "estudiante":
-        raise HTTPException(status_code=403, detail="Solo estudiantes pueden acceder")
-
-    estudiante_id = payload.get("user_id")
-    estudiante = crud.obtener_estudiante(db, estudiante_id)
-
-    if not estudiante:
-        raise HTTPException(status_code=404, detail="Estudiante no encontrado")
-
-    from app.crud import estudiante_info_academica as info_crud
-
-    materias = info_crud.obtener_materias_estudiante(db, estudiante.id)
-
-    return {
-        "success": True,
-        "materias": materias,
-        "total": len(materias),
-        "mensaje": f"Se encontraron {len(materias)} materias",
-    }
+    # Vista delgada sobre el mismo bundle cacheado que usa el dashboard
+    info = info_crud.obtener_info_academica_estudiante(db, estudiante.id)
+    materias = info["materias"] if "error" not in info else []
+
+    return respuesta_con_etag(
+        request,
+        {
+            "success": True,
+            "materias": materias,
+            "total": len(materias),
+            "mensaje": f"Se encontraron {len(materias)} materias",
+        },
+        cache_control=CACHE_PRIVADO,
+    )
 
 
 @router.get("/dashboard-academico", response_model=dict)
 def obtener_dashboard_academico(
-    payload: dict = Depends(usuario_autenticado), db: Session = Depends(get_db)
+    request: Request,
+    include: str = Query(
+        None,
+        description="Secciones a incluir separadas por coma (estadisticas,materias); por defecto todas",
+    ),
+    estudiante: Estudiante = Depends(estudiante_autenticado),
+    db: Session = Depends(get_db),
 ):
-    """📊 Dashboard académico completo del estudiante"""
-    # Verificar que el usuario es estudiante
-    if payload.get("user_type") != "estudiante":
-        raise HTTPException(status_code=403, detail="Solo estudiantes pueden acceder")
-
-    estudiante_id = payload.get("user_id")
-    estudiante = crud.obtener_estudiante(db, estudiante_id)
-
-    if not estudiante:
-        raise HTTPException(status_code=404, detail="Estudiante no encontrado")
-
-    from app.crud import estudiante_info_academica as info_crud
+    """📊 Dashboard académico completo del estudiante
 
+    Con `include` el cliente pide solo las secciones que va a renderizar
+    (p. ej. `include=estadisticas` para el encabezado) y se ahorra la
+    serialización y transferencia del resto.
+    """
     # Obtener toda la información
     info_completa = info_crud.obtener_info_academica_estudiante(db, estudiante.id)
 
     if "error" in info_completa:
         return {"success": False, "mensaje": info_completa["error"]}
 
-    # Estadísticas adicionales
-    materias = info_completa["materias"]
-    docentes_unicos = set()
-    materias_con_docente = 0
-
-    for materia in materias:
-        if materia["docente"]:
-            materias_con_docente += 1
-            docentes_unicos.add(materia["docente"]["id"])
+    incluidas = (
+        {seccion.strip() for seccion in include.split(",") if seccion.strip()}
+        if include
+        else {"estadisticas", "materias"}
+    )
 
     dashboard = {
         "success": True,
         "estudiante": info_completa["estudiante"],
         "curso": info_completa["curso"],
         "gestion": info_completa["gestion"],
-        "estadisticas": {
-            "total_materias": len(materias),
-            "materias_con_docente": materias_con_docente,
-            "materias_sin_docente": len(materias) - materias_con_docente,
-            "total_docentes": len(docentes_unicos),
-        },
-        "materias": materias,
         "mensaje": "Dashboard académico obtenido exitosamente",
     }
 
-    return dashboard
+    if "estadisticas" in incluidas:
+        # Agregadas en SQL (una consulta) en vez de recorrer las materias
+        dashboard["estadisticas"] = info_crud.obtener_estadisticas_materias(
+            db, estudiante.id, info_completa["gestion"]["id"]
+        )
+
+    if "materias" in incluidas:
+        dashboard["materias"] = info_completa["materias"]
+
+    return respuesta_con_etag(request, dashboard, cache_control=CACHE_PRIVADO)
 
 
 # ========== RUTAS SIN PARÁMETROS ==========
@@ -162,52 +227,85 @@ def obtener_dashboard_academico(
 
 @router.post("/", response_model=EstudianteOut)
 def crear(
-    nombre: str = Form(...),
-    apellido: str = Form(...),
-    fecha_nacimiento: str = Form(...),
-    genero: str = Form(...),
-    nombre_tutor: str = Form(...),
-    telefono_tutor: str = Form(...),
-    direccion_casa: str = Form(...),
-    correo: str = Form(None),  # 🆕 Opcional para login
-    contrasena: str = Form(None),  # 🆕 Opcional para login
+    background_tasks: BackgroundTasks,
+    datos: EstudianteFormIn = Depends(EstudianteFormIn.as_form),
     imagen: UploadFile = File(...),
     db: Session = Depends(get_db),
     payload: dict = Depends(admin_required),
 ):
-    # Validar campos vacíos
-    nombre = validar_campo("nombre", nombre)
-    apellido = validar_campo("apellido", apellido)
-    genero = validar_campo("genero", genero)
-    nombre_tutor = validar_campo("nombre_tutor", nombre_tutor)
-    telefono_tutor = validar_campo("telefono_tutor", telefono_tutor)
-    direccion_casa = validar_campo("direccion_casa", direccion_casa)
+    if imagen.size and imagen.size > MAX_TAMANO_IMAGEN:
+        raise HTTPException(
+            status_code=413, detail="La imagen no puede superar los 10 MB"
+        )
 
-    url_imagen = subir_imagen_a_cloudinary(imagen, f"{nombre}_{apellido}")
+    # La subida a Cloudinary sale del camino critico: se crea el registro
+    # sin imagen y una tarea en segundo plano fija la URL al terminar
+    contenido_imagen = imagen.file.read()
 
     nuevo = crud.crear_estudiante(
         db,
         EstudianteUpdate(
-            nombre=nombre,
-            apellido=apellido,
-            fecha_nacimiento=datetime.fromisoformat(fecha_nacimiento),
-            genero=genero,
-            url_imagen=url_imagen,
-            nombre_tutor=nombre_tutor,
-            telefono_tutor=telefono_tutor,
-            direccion_casa=direccion_casa,
-            correo=correo if correo else None,
-            contrasena=contrasena if contrasena else None,
+            **datos.model_dump(),
+            url_imagen=None,
         ),
     )
+    background_tasks.add_task(
+        _subir_imagen_y_actualizar,
+        nuevo.id,
+        contenido_imagen,
+        f"{datos.nombre}_{datos.apellido}",
+    )
     return nuevo
 
 
+@router.post("/bulk", response_model=dict[int, EstudianteOut])
+def obtener_estudiantes_bulk(
+    datos: EstudiantesBulkIn,
+    db: Session = Depends(get_db),
+    payload: dict = Depends(usuario_autenticado),
+):
+    """👥 Obtener varios estudiantes de una vez
+
+    La autorización se resuelve en bloque: para padres, un solo IN sobre
+    la tabla de relación en lugar de una verificación por estudiante.
+    """
+    user_type = payload.get("user_type")
+    user_id = payload.get("user_id")
+    ids = list(dict.fromkeys(datos.ids))  # sin duplicados, conserva orden
+
+    if user_type in ("admin", "docente"):
+        ids_autorizados = ids
+    elif user_type == "estudiante":
+        ids_autorizados = [i for i in ids if i == user_id]
+    elif user_type == "padre":
+        hijos = padre_de_estudiantes(db, user_id, ids)
+        ids_autorizados = [i for i in ids if i in hijos]
+    else:
+        raise HTTPException(status_code=403, detail="No autorizado")
+
+    estudiantes = crud.obtener_estudiantes_por_ids(db, ids_autorizados)
+    return {e.id: e for e in estudiantes}
+
+
 @router.get("/", response_model=list[EstudianteOut])
 def listar(
-    db: Session = Depends(get_db), payload: dict = Depends(docente_o_admin_required)
+    response: Response,
+    after_id: int = Query(0, description="Cursor: devolver estudiantes con id mayor"),
+    limit: int = Query(100, ge=1, le=500, description="Tamaño de página"),
+    db: Session = Depends(get_db),
+    payload: dict = Depends(docente_o_admin_required),
 ):
-    return crud.obtener_estudiantes(db)
+    """Listado paginado por keyset: estable y sin OFFSET creciente.
+
+    Si hay más páginas, el header X-Next-Cursor trae el after_id de la
+    siguiente llamada.
+    """
+    estudiantes = crud.obtener_estudiantes(db, after_id=after_id, limit=limit)
+
+    if len(estudiantes) == limit:
+        response.headers["X-Next-Cursor"] = str(estudiantes[-1].id)
+
+    return estudiantes
 
 
 # ========== RUTAS CON PARÁMETROS AL FINAL ==========
@@ -216,6 +314,8 @@ def listar(
 @router.get("/{estudiante_id}", response_model=EstudianteOut)
 def obtener_estudiante(
     estudiante_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     payload: dict = Depends(usuario_autenticado),
 ):
@@ -235,8 +335,6 @@ def obtener_estudiante(
         pass
     elif user_type == "padre":
         # Verificar que es padre del estudiante
-        from app.crud.padre import es_padre_del_estudiante
-
         if not es_padre_del_estudiante(db, user_id, estudiante_id):
             raise HTTPException(status_code=403, detail="No autorizado")
     else:
@@ -245,50 +343,43 @@ def obtener_estudiante(
     estudiante = crud.obtener_estudiante(db, estudiante_id)
     if not estudiante:
         raise HTTPException(status_code=404, detail="Estudiante no encontrado")
+
+    etag = _etag_perfil(estudiante)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_PRIVADO
     return estudiante
 
 
 @router.put("/{estudiante_id}", response_model=EstudianteOut)
 def actualizar(
     estudiante_id: int,
-    nombre: str = Form(...),
-    apellido: str = Form(...),
-    fecha_nacimiento: str = Form(...),
-    genero: str = Form(...),
-    nombre_tutor: str = Form(...),
-    telefono_tutor: str = Form(...),
-    direccion_casa: str = Form(...),
-    correo: str = Form(None),  # 🆕 Opcional
-    contrasena: str = Form(None),  # 🆕 Opcional
+    background_tasks: BackgroundTasks,
+    datos: EstudianteFormIn = Depends(EstudianteFormIn.as_form),
     imagen: UploadFile = File(None),
     db: Session = Depends(get_db),
     payload: dict = Depends(admin_required),
 ):
-    # Validar campos vacíos
-    nombre = validar_campo("nombre", nombre)
-    apellido = validar_campo("apellido", apellido)
-    genero = validar_campo("genero", genero)
-    nombre_tutor = validar_campo("nombre_tutor", nombre_tutor)
-    telefono_tutor = validar_campo("telefono_tutor", telefono_tutor)
-    direccion_casa = validar_campo("direccion_casa", direccion_casa)
-
-    url_imagen = None
     if imagen:
-        url_imagen = subir_imagen_a_cloudinary(imagen, f"{nombre}_{apellido}")
-
-    datos = EstudianteUpdate(
-        nombre=nombre,
-        apellido=apellido,
-        fecha_nacimiento=datetime.fromisoformat(fecha_nacimiento),
-        genero=genero,
-        url_imagen=url_imagen,
-        nombre_tutor=nombre_tutor,
-        telefono_tutor=telefono_tutor,
-        direccion_casa=direccion_casa,
-        correo=correo if correo else None,
-        contrasena=contrasena if contrasena else None,
+        if imagen.size and imagen.size > MAX_TAMANO_IMAGEN:
+            raise HTTPException(
+                status_code=413, detail="La imagen no puede superar los 10 MB"
+            )
+
+        # Igual que en crear: la subida se difiere a una tarea en segundo
+        # plano y la URL se actualiza cuando Cloudinary responde
+        background_tasks.add_task(
+            _subir_imagen_y_actualizar,
+            estudiante_id,
+            imagen.file.read(),
+            f"{datos.nombre}_{datos.apellido}",
+        )
+
+    return crud.actualizar_estudiante(
+        db, estudiante_id, EstudianteUpdate(**datos.model_dump())
     )
-    return crud.actualizar_estudiante(db, estudiante_id, datos)
 
 
 @router.delete("/{estudiante_id}")
@@ -1,6 +1,10 @@
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from sqlalchemy import exists, func, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from app.deps import get_db, get_async_db
 from app.database import SessionLocal
 from app.models.estudiante import Estudiante
 from app.models.evaluacion import Evaluacion
@@ -8,11 +12,14 @@ from app.models.inscripcion import Inscripcion
 from app.models.periodo import Periodo
 from app.schemas.evaluacion import EvaluacionCreate, EvaluacionUpdate, EvaluacionOut
 from app.crud import evaluacion as crud
+from app.crud import periodo as periodo_crud
+from app.crud import tipo_evaluacion as tipo_crud
 from app.auth.roles import docente_o_admin_required, usuario_autenticado
 from app.models.tipo_evaluacion import TipoEvaluacion
 
 # 🆕 ACTUALIZADO: Imports para el sistema de notificaciones DUAL
 from app.services.notification_service import NotificationService
+from app.services import resumen_service
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,14 +27,6 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/evaluaciones", tags=["Evaluaciones"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # 🆕 ACTUALIZADA: Función helper para manejar notificaciones automáticas con sistema DUAL
 def _enviar_notificaciones_duales(
     db: Session, evaluacion: Evaluacion, umbral_padres: float = 50.0
@@ -38,7 +37,7 @@ def _enviar_notificaciones_duales(
 
     try:
         resultado = NotificationService.notificar_evaluacion_completa(
-            db, evaluacion.id, umbral_padres
+            db, evaluacion, umbral_padres
         )
 
         if "error" not in resultado:
@@ -63,16 +62,91 @@ def _enviar_notificaciones_duales(
             logger.error(f"Error en notificaciones duales: {resultado['error']}")
             return {"estudiante": 0, "padres": 0, "error": resultado["error"]}
 
-    except Exception as e:
+    except SQLAlchemyError as e:
         logger.error(
             f"Error enviando notificaciones duales para evaluación {evaluacion.id}: {e}"
         )
         return {"estudiante": 0, "padres": 0, "error": str(e)}
 
 
+def _notificar_evaluacion_en_segundo_plano(
+    evaluacion_id: int, umbral_padres: float = 50.0
+):
+    """Tarea de fondo: envía las notificaciones duales con su propia sesión.
+
+    La sesión del request ya está cerrada cuando corre la tarea, así que
+    recibe el id (no la instancia ORM) y abre una SessionLocal propia.
+    """
+    db = SessionLocal()
+    try:
+        evaluacion = NotificationService.cargar_evaluacion_para_notificar(
+            db, evaluacion_id
+        )
+        if evaluacion:
+            _enviar_notificaciones_duales(db, evaluacion, umbral_padres)
+    except Exception as e:
+        logger.error(
+            f"Error en notificaciones de fondo para evaluación {evaluacion_id}: {e}"
+        )
+    finally:
+        db.close()
+
+
+def _reenviar_notificaciones_en_segundo_plano(
+    materia_id: int, periodo_id: int, umbral_padres: float = 50.0
+):
+    """Tarea de fondo: reenvía las notificaciones duales de un lote completo.
+
+    Igual que _notificar_evaluacion_en_segundo_plano, abre su propia
+    sesión porque la del request ya está cerrada cuando corre la tarea.
+    """
+    db = SessionLocal()
+    try:
+        ids = db.scalars(
+            select(Evaluacion.id).where(
+                Evaluacion.materia_id == materia_id,
+                Evaluacion.periodo_id == periodo_id,
+            )
+        ).all()
+
+        total_estudiante = 0
+        total_padres = 0
+        # Tandas de 500 ids: mantiene la memoria acotada en lotes grandes.
+        # No se usa yield_per porque crear_notificacion hace commit por
+        # notificación y eso cerraría el cursor de streaming a mitad del
+        # recorrido.
+        for inicio in range(0, len(ids), 500):
+            evaluaciones = db.scalars(
+                select(Evaluacion)
+                .options(
+                    joinedload(Evaluacion.estudiante),
+                    joinedload(Evaluacion.materia),
+                )
+                .where(Evaluacion.id.in_(ids[inicio : inicio + 500]))
+            ).all()
+            resultado = NotificationService.notificar_evaluaciones_en_lote(
+                db, evaluaciones, umbral_padres
+            )
+            total_estudiante += resultado.get("estudiante", 0)
+            total_padres += resultado.get("padres", 0)
+
+        logger.info(
+            f"Reenvío de fondo (materia {materia_id}, periodo {periodo_id}): "
+            f"{len(ids)} evaluaciones, {total_estudiante} notif. estudiante, "
+            f"{total_padres} notif. padres"
+        )
+    except Exception as e:
+        logger.error(
+            f"Error en reenvío de fondo (materia {materia_id}, periodo {periodo_id}): {e}"
+        )
+    finally:
+        db.close()
+
+
 @router.post("/", response_model=EvaluacionOut)
 def crear(
     datos: EvaluacionCreate,
+    background_tasks: BackgroundTasks,
     umbral_padres: float = Query(
         50.0, ge=0, le=100, description="Umbral para notificar a padres"
     ),
@@ -81,30 +155,29 @@ def crear(
 ):
     evaluacion = crud.crear_evaluacion(db, datos)
 
-    # 🆕 ACTUALIZADO: Usar sistema dual de notificaciones
-    resultado_notif = _enviar_notificaciones_duales(db, evaluacion, umbral_padres)
-
-    # Agregar información de notificaciones a la respuesta
-    evaluacion_dict = evaluacion.__dict__.copy()
-    evaluacion_dict["notificaciones_info"] = resultado_notif
+    # Las notificaciones salen en segundo plano: la respuesta no espera la red
+    background_tasks.add_task(
+        _notificar_evaluacion_en_segundo_plano, evaluacion.id, umbral_padres
+    )
 
     return evaluacion
 
 
 @router.get("/", response_model=list[EvaluacionOut])
-def listar(
-    db: Session = Depends(get_db), payload: dict = Depends(docente_o_admin_required)
+async def listar(
+    db: AsyncSession = Depends(get_async_db),
+    payload: dict = Depends(docente_o_admin_required),
 ):
-    return crud.listar_evaluaciones(db)
+    return await crud.listar_evaluaciones_async(db)
 
 
 @router.get("/{evaluacion_id}", response_model=EvaluacionOut)
-def obtener(
+async def obtener(
     evaluacion_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(docente_o_admin_required),
 ):
-    e = crud.obtener_por_id(db, evaluacion_id)
+    e = await crud.obtener_por_id_async(db, evaluacion_id)
     if not e:
         raise HTTPException(status_code=404, detail="Evaluación no encontrada")
     return e
@@ -114,6 +187,7 @@ def obtener(
 def actualizar(
     evaluacion_id: int,
     datos: EvaluacionUpdate,
+    background_tasks: BackgroundTasks,
     umbral_padres: float = Query(
         50.0, ge=0, le=100, description="Umbral para notificar a padres"
     ),
@@ -124,12 +198,9 @@ def actualizar(
     if not e:
         raise HTTPException(status_code=404, detail="Evaluación no encontrada")
 
-    # 🆕 ACTUALIZADO: Usar sistema dual de notificaciones
-    resultado_notif = _enviar_notificaciones_duales(db, e, umbral_padres)
-
-    # Agregar información de notificaciones a la respuesta
-    e_dict = e.__dict__.copy()
-    e_dict["notificaciones_info"] = resultado_notif
+    background_tasks.add_task(
+        _notificar_evaluacion_en_segundo_plano, e.id, umbral_padres
+    )
 
     return e
 
@@ -147,455 +218,177 @@ def eliminar(
 
 
 def obtener_id_tipo(db: Session, nombre_tipo: str) -> int:
-    tipo = (
-        db.query(TipoEvaluacion)
-        .filter(TipoEvaluacion.nombre.ilike(nombre_tipo))
-        .first()
-    )
-    if not tipo:
+    # Resuelto desde el cache de proceso del crud: sin SELECT por cada
+    # registrar_* una vez poblado
+    tipo_id = tipo_crud.obtener_id_por_nombre(db, nombre_tipo)
+    if tipo_id is None:
         raise HTTPException(
             status_code=404, detail=f"Tipo de evaluación '{nombre_tipo}' no encontrado"
         )
-    return tipo.id
-
-
-# 🆕 ACTUALIZADO: Todos los endpoints de registro ahora usan sistema dual
-@router.post("/registrar/examen", response_model=EvaluacionOut)
-def registrar_examen(
-    datos: EvaluacionCreate,
-    umbral_padres: float = Query(
-        50.0, ge=0, le=100, description="Umbral para notificar a padres"
-    ),
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    datos.tipo_evaluacion_id = obtener_id_tipo(db, "Exámenes")
-    evaluacion = crud.crear_evaluacion(db, datos)
-
-    resultado_notif = _enviar_notificaciones_duales(db, evaluacion, umbral_padres)
-    evaluacion_dict = evaluacion.__dict__.copy()
-    evaluacion_dict["notificaciones_info"] = resultado_notif
-
-    return evaluacion
-
-
-@router.post("/registrar/tarea", response_model=EvaluacionOut)
-def registrar_tarea(
-    datos: EvaluacionCreate,
-    umbral_padres: float = Query(
-        50.0, ge=0, le=100, description="Umbral para notificar a padres"
-    ),
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    datos.tipo_evaluacion_id = obtener_id_tipo(db, "Tareas")
-    evaluacion = crud.crear_evaluacion(db, datos)
-
-    resultado_notif = _enviar_notificaciones_duales(db, evaluacion, umbral_padres)
-    evaluacion_dict = evaluacion.__dict__.copy()
-    evaluacion_dict["notificaciones_info"] = resultado_notif
-
-    return evaluacion
-
-
-@router.post("/registrar/exposicion", response_model=EvaluacionOut)
-def registrar_exposicion(
-    datos: EvaluacionCreate,
-    umbral_padres: float = Query(
-        50.0, ge=0, le=100, description="Umbral para notificar a padres"
-    ),
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    datos.tipo_evaluacion_id = obtener_id_tipo(db, "Exposiciones")
-    evaluacion = crud.crear_evaluacion(db, datos)
-
-    resultado_notif = _enviar_notificaciones_duales(db, evaluacion, umbral_padres)
-    evaluacion_dict = evaluacion.__dict__.copy()
-    evaluacion_dict["notificaciones_info"] = resultado_notif
-
-    return evaluacion
-
-
-@router.post("/registrar/participacion", response_model=EvaluacionOut)
-def registrar_participacion(
-    datos: EvaluacionCreate,
-    umbral_padres: float = Query(
-        50.0, ge=0, le=100, description="Umbral para notificar a padres"
-    ),
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    datos.tipo_evaluacion_id = obtener_id_tipo(db, "Participaciones")
-    evaluacion = crud.crear_evaluacion(db, datos)
-
-    resultado_notif = _enviar_notificaciones_duales(db, evaluacion, umbral_padres)
-    evaluacion_dict = evaluacion.__dict__.copy()
-    evaluacion_dict["notificaciones_info"] = resultado_notif
-
-    return evaluacion
-
-
-@router.post("/registrar/asistencia", response_model=EvaluacionOut)
-def registrar_asistencia(
-    datos: EvaluacionCreate,
-    umbral_padres: float = Query(
-        50.0, ge=0, le=100, description="Umbral para notificar a padres"
-    ),
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    datos.tipo_evaluacion_id = obtener_id_tipo(db, "Asistencia")
-    evaluacion = crud.crear_evaluacion(db, datos)
-
-    resultado_notif = _enviar_notificaciones_duales(db, evaluacion, umbral_padres)
-    evaluacion_dict = evaluacion.__dict__.copy()
-    evaluacion_dict["notificaciones_info"] = resultado_notif
-
-    return evaluacion
-
-
-@router.post("/registrar/practica", response_model=EvaluacionOut)
-def registrar_practica(
-    datos: EvaluacionCreate,
-    umbral_padres: float = Query(
-        50.0, ge=0, le=100, description="Umbral para notificar a padres"
-    ),
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    datos.tipo_evaluacion_id = obtener_id_tipo(db, "Prácticas")
-    evaluacion = crud.crear_evaluacion(db, datos)
-
-    resultado_notif = _enviar_notificaciones_duales(db, evaluacion, umbral_padres)
-    evaluacion_dict = evaluacion.__dict__.copy()
-    evaluacion_dict["notificaciones_info"] = resultado_notif
-
-    return evaluacion
-
-
-@router.post("/registrar/proyecto", response_model=EvaluacionOut)
-def registrar_proyecto_final(
-    datos: EvaluacionCreate,
-    umbral_padres: float = Query(
-        50.0, ge=0, le=100, description="Umbral para notificar a padres"
-    ),
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    datos.tipo_evaluacion_id = obtener_id_tipo(db, "Proyecto final")
-    evaluacion = crud.crear_evaluacion(db, datos)
-
-    resultado_notif = _enviar_notificaciones_duales(db, evaluacion, umbral_padres)
-    evaluacion_dict = evaluacion.__dict__.copy()
-    evaluacion_dict["notificaciones_info"] = resultado_notif
-
-    return evaluacion
-
-
-@router.post("/registrar/grupal", response_model=EvaluacionOut)
-def registrar_trabajo_grupal(
-    datos: EvaluacionCreate,
-    umbral_padres: float = Query(
-        50.0, ge=0, le=100, description="Umbral para notificar a padres"
-    ),
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    datos.tipo_evaluacion_id = obtener_id_tipo(db, "Trabajo grupal")
-    evaluacion = crud.crear_evaluacion(db, datos)
-
-    resultado_notif = _enviar_notificaciones_duales(db, evaluacion, umbral_padres)
-    evaluacion_dict = evaluacion.__dict__.copy()
-    evaluacion_dict["notificaciones_info"] = resultado_notif
-
-    return evaluacion
-
-
-@router.post("/registrar/ensayo", response_model=EvaluacionOut)
-def registrar_ensayo(
-    datos: EvaluacionCreate,
-    umbral_padres: float = Query(
-        50.0, ge=0, le=100, description="Umbral para notificar a padres"
-    ),
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    datos.tipo_evaluacion_id = obtener_id_tipo(db, "Ensayos")
-    evaluacion = crud.crear_evaluacion(db, datos)
-
-    resultado_notif = _enviar_notificaciones_duales(db, evaluacion, umbral_padres)
-    evaluacion_dict = evaluacion.__dict__.copy()
-    evaluacion_dict["notificaciones_info"] = resultado_notif
-
-    return evaluacion
-
-
-@router.post("/registrar/cuestionario", response_model=EvaluacionOut)
-def registrar_cuestionario(
-    datos: EvaluacionCreate,
-    umbral_padres: float = Query(
-        50.0, ge=0, le=100, description="Umbral para notificar a padres"
-    ),
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    datos.tipo_evaluacion_id = obtener_id_tipo(db, "Cuestionarios")
-    evaluacion = crud.crear_evaluacion(db, datos)
-
-    resultado_notif = _enviar_notificaciones_duales(db, evaluacion, umbral_padres)
-    evaluacion_dict = evaluacion.__dict__.copy()
-    evaluacion_dict["notificaciones_info"] = resultado_notif
-
-    return evaluacion
-
-
-# ------------------- FILTROS POR ESTUDIANTE Y PERIODO -------------------
-
-
-@router.get("/asistencias/por-estudiante-periodo/", response_model=list[EvaluacionOut])
-def asistencias_por_estudiante_periodo(
-    estudiante_id: int,
-    periodo_id: int,
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    tipo_id = obtener_id_tipo(db, "Asistencia")
-    return (
-        db.query(Evaluacion)
-        .filter(
-            Evaluacion.estudiante_id == estudiante_id,
-            Evaluacion.periodo_id == periodo_id,
-            Evaluacion.tipo_evaluacion_id == tipo_id,
-        )
-        .all()
-    )
+    return tipo_id
 
 
-@router.get(
-    "/participaciones/por-estudiante-periodo/", response_model=list[EvaluacionOut]
-)
-def participaciones_por_estudiante_periodo(
-    estudiante_id: int,
-    periodo_id: int,
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    tipo_id = obtener_id_tipo(db, "Participaciones")
-    return (
-        db.query(Evaluacion)
-        .filter(
-            Evaluacion.estudiante_id == estudiante_id,
-            Evaluacion.periodo_id == periodo_id,
-            Evaluacion.tipo_evaluacion_id == tipo_id,
-        )
-        .all()
-    )
-
-
-@router.get("/exposiciones/por-estudiante-periodo/", response_model=list[EvaluacionOut])
-def exposiciones_por_estudiante_periodo(
-    estudiante_id: int,
-    periodo_id: int,
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    tipo_id = obtener_id_tipo(db, "Exposiciones")
-    return (
-        db.query(Evaluacion)
-        .filter(
-            Evaluacion.estudiante_id == estudiante_id,
-            Evaluacion.periodo_id == periodo_id,
-            Evaluacion.tipo_evaluacion_id == tipo_id,
+async def obtener_id_tipo_async(db: AsyncSession, nombre_tipo: str) -> int:
+    """Variante async de obtener_id_tipo para los endpoints de lectura"""
+    tipo_id = await tipo_crud.obtener_id_por_nombre_async(db, nombre_tipo)
+    if tipo_id is None:
+        raise HTTPException(
+            status_code=404, detail=f"Tipo de evaluación '{nombre_tipo}' no encontrado"
         )
-        .all()
-    )
-
-
-@router.get("/tareas/por-estudiante-periodo/", response_model=list[EvaluacionOut])
-def tareas_por_estudiante_periodo(
-    estudiante_id: int,
-    periodo_id: int,
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    tipo_id = obtener_id_tipo(db, "Tareas")
-    return (
-        db.query(Evaluacion)
-        .filter(
-            Evaluacion.estudiante_id == estudiante_id,
-            Evaluacion.periodo_id == periodo_id,
-            Evaluacion.tipo_evaluacion_id == tipo_id,
+    return tipo_id
+
+
+# Registro por tipo: los once endpoints /registrar/<tipo> diferian solo
+# en la ruta y el nombre del tipo, asi que se generan desde una fabrica
+# igual que los filtros por-estudiante-periodo.
+_REGISTROS_POR_TIPO = [
+    ("examen", "Exámenes"),
+    ("tarea", "Tareas"),
+    ("exposicion", "Exposiciones"),
+    ("participacion", "Participaciones"),
+    ("asistencia", "Asistencia"),
+    ("practica", "Prácticas"),
+    ("proyecto", "Proyecto final"),
+    ("grupal", "Trabajo grupal"),
+    ("ensayo", "Ensayos"),
+    ("cuestionario", "Cuestionarios"),
+]
+
+
+def _registrar_endpoint_de_registro(ruta: str, nombre_tipo: str):
+    def registrar(
+        datos: EvaluacionCreate,
+        background_tasks: BackgroundTasks,
+        umbral_padres: float = Query(
+            50.0, ge=0, le=100, description="Umbral para notificar a padres"
+        ),
+        db: Session = Depends(get_db),
+        payload: dict = Depends(docente_o_admin_required),
+    ):
+        datos.tipo_evaluacion_id = obtener_id_tipo(db, nombre_tipo)
+        evaluacion = crud.crear_evaluacion(db, datos)
+
+        background_tasks.add_task(
+            _notificar_evaluacion_en_segundo_plano, evaluacion.id, umbral_padres
         )
-        .all()
-    )
 
+        return evaluacion
 
-@router.get("/examenes/por-estudiante-periodo/", response_model=list[EvaluacionOut])
-def examenes_por_estudiante_periodo(
-    estudiante_id: int,
-    periodo_id: int,
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    tipo_id = obtener_id_tipo(db, "Exámenes")
-    return (
-        db.query(Evaluacion)
-        .filter(
-            Evaluacion.estudiante_id == estudiante_id,
-            Evaluacion.periodo_id == periodo_id,
-            Evaluacion.tipo_evaluacion_id == tipo_id,
-        )
-        .all()
-    )
-
+    registrar.__name__ = f"registrar_{ruta}"
+    router.post(f"/registrar/{ruta}", response_model=EvaluacionOut)(registrar)
 
-@router.get("/practicas/por-estudiante-periodo/", response_model=list[EvaluacionOut])
-def practicas_por_estudiante_periodo(
-    estudiante_id: int,
-    periodo_id: int,
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    tipo_id = obtener_id_tipo(db, "Prácticas")
-    return (
-        db.query(Evaluacion)
-        .filter(
-            Evaluacion.estudiante_id == estudiante_id,
-            Evaluacion.periodo_id == periodo_id,
-            Evaluacion.tipo_evaluacion_id == tipo_id,
-        )
-        .all()
-    )
 
+for _ruta, _nombre_tipo in _REGISTROS_POR_TIPO:
+    _registrar_endpoint_de_registro(_ruta, _nombre_tipo)
 
-@router.get("/proyectos/por-estudiante-periodo/", response_model=list[EvaluacionOut])
-def proyectos_por_estudiante_periodo(
-    estudiante_id: int,
-    periodo_id: int,
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    tipo_id = obtener_id_tipo(db, "Proyecto final")
-    return (
-        db.query(Evaluacion)
-        .filter(
-            Evaluacion.estudiante_id == estudiante_id,
-            Evaluacion.periodo_id == periodo_id,
-            Evaluacion.tipo_evaluacion_id == tipo_id,
-        )
-        .all()
-    )
 
+# ------------------- FILTROS POR ESTUDIANTE Y PERIODO -------------------
 
-@router.get("/grupales/por-estudiante-periodo/", response_model=list[EvaluacionOut])
-def grupales_por_estudiante_periodo(
-    estudiante_id: int,
-    periodo_id: int,
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    tipo_id = obtener_id_tipo(db, "Trabajo grupal")
-    return (
-        db.query(Evaluacion)
-        .filter(
+# (prefijo de la ruta, nombre del tipo en TipoEvaluacion). Los diez
+# endpoints /<tipo>/por-estudiante-periodo/ eran copias identicas salvo
+# por estos dos valores, asi que se registran desde una sola fabrica.
+_FILTROS_POR_TIPO = [
+    ("asistencias", "Asistencia"),
+    ("participaciones", "Participaciones"),
+    ("exposiciones", "Exposiciones"),
+    ("tareas", "Tareas"),
+    ("examenes", "Exámenes"),
+    ("practicas", "Prácticas"),
+    ("proyectos", "Proyecto final"),
+    ("grupales", "Trabajo grupal"),
+    ("ensayos", "Ensayos"),
+    ("cuestionarios", "Cuestionarios"),
+]
+
+
+def _registrar_filtro_por_tipo(prefijo: str, nombre_tipo: str):
+    async def filtro_por_tipo(
+        estudiante_id: int,
+        periodo_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        payload: dict = Depends(docente_o_admin_required),
+    ):
+        tipo_id = await obtener_id_tipo_async(db, nombre_tipo)
+        consulta = select(Evaluacion).where(
             Evaluacion.estudiante_id == estudiante_id,
             Evaluacion.periodo_id == periodo_id,
             Evaluacion.tipo_evaluacion_id == tipo_id,
         )
-        .all()
-    )
+        return (await db.execute(consulta)).scalars().all()
 
+    # Nombre propio por endpoint para que el operation_id de OpenAPI no
+    # colisione entre las diez rutas
+    filtro_por_tipo.__name__ = f"{prefijo}_por_estudiante_periodo"
+    router.get(
+        f"/{prefijo}/por-estudiante-periodo/", response_model=list[EvaluacionOut]
+    )(filtro_por_tipo)
 
-@router.get("/ensayos/por-estudiante-periodo/", response_model=list[EvaluacionOut])
-def ensayos_por_estudiante_periodo(
-    estudiante_id: int,
-    periodo_id: int,
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    tipo_id = obtener_id_tipo(db, "Ensayos")
-    return (
-        db.query(Evaluacion)
-        .filter(
-            Evaluacion.estudiante_id == estudiante_id,
-            Evaluacion.periodo_id == periodo_id,
-            Evaluacion.tipo_evaluacion_id == tipo_id,
-        )
-        .all()
-    )
 
-
-@router.get(
-    "/cuestionarios/por-estudiante-periodo/", response_model=list[EvaluacionOut]
-)
-def cuestionarios_por_estudiante_periodo(
-    estudiante_id: int,
-    periodo_id: int,
-    db: Session = Depends(get_db),
-    payload: dict = Depends(docente_o_admin_required),
-):
-    tipo_id = obtener_id_tipo(db, "Cuestionarios")
-    return (
-        db.query(Evaluacion)
-        .filter(
-            Evaluacion.estudiante_id == estudiante_id,
-            Evaluacion.periodo_id == periodo_id,
-            Evaluacion.tipo_evaluacion_id == tipo_id,
-        )
-        .all()
-    )
+for _prefijo, _nombre_tipo in _FILTROS_POR_TIPO:
+    _registrar_filtro_por_tipo(_prefijo, _nombre_tipo)
 
 
 # Evaluaciones por estudiante, materia, periodo y tipo
 @router.get("/por-tipo", response_model=list[EvaluacionOut])
-def ver_evaluaciones_por_tipo(
+async def ver_evaluaciones_por_tipo(
     estudiante_id: int,
     materia_id: int,
     periodo_id: int,
     tipo_evaluacion_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(docente_o_admin_required),
 ):
-    return (
-        db.query(Evaluacion)
-        .filter(
-            Evaluacion.estudiante_id == estudiante_id,
-            Evaluacion.materia_id == materia_id,
-            Evaluacion.periodo_id == periodo_id,
-            Evaluacion.tipo_evaluacion_id == tipo_evaluacion_id,
-        )
-        .all()
+    consulta = select(Evaluacion).where(
+        Evaluacion.estudiante_id == estudiante_id,
+        Evaluacion.materia_id == materia_id,
+        Evaluacion.periodo_id == periodo_id,
+        Evaluacion.tipo_evaluacion_id == tipo_evaluacion_id,
     )
+    return (await db.execute(consulta)).scalars().all()
 
 
 # ------------------- RESUMEN DE EVALUACIONES -------------------
 
 
 @router.get("/resumen/por-estudiante", response_model=dict)
-def resumen_evaluaciones_auto_periodo(
+async def resumen_evaluaciones_auto_periodo(
     estudiante_id: int,
     materia_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(usuario_autenticado),
 ):
     fecha_actual = date.today()
-    periodo_id, _ = obtener_periodo_y_gestion_por_fecha(db, fecha_actual)
-
-    tipos = db.query(TipoEvaluacion).order_by(TipoEvaluacion.id).all()
-    resumen = {}
-
-    for tipo in tipos:
-        evaluaciones = (
-            db.query(Evaluacion)
-            .filter(
+    periodo_id, _ = await obtener_periodo_y_gestion_por_fecha_async(db, fecha_actual)
+
+    # Una sola consulta trae todas las evaluaciones del estudiante en la
+    # materia y periodo y se agrupan por tipo en Python (antes: un SELECT
+    # por tipo). El detalle necesita las filas completas de todos modos,
+    # así que agregar en SQL no ahorraría el fetch.
+    filas = (
+        await db.execute(
+            select(
+                Evaluacion.tipo_evaluacion_id,
+                Evaluacion.fecha,
+                Evaluacion.descripcion,
+                Evaluacion.valor,
+            ).where(
                 Evaluacion.estudiante_id == estudiante_id,
                 Evaluacion.materia_id == materia_id,
                 Evaluacion.periodo_id == periodo_id,
-                Evaluacion.tipo_evaluacion_id == tipo.id,
             )
-            .all()
         )
+    ).all()
+
+    por_tipo = {}
+    for fila in filas:
+        por_tipo.setdefault(fila.tipo_evaluacion_id, []).append(fila)
+
+    tipos = await tipo_crud.listar_tipos_async(db)
+    asistencia_id = await tipo_crud.obtener_id_por_nombre_async(db, "Asistencia")
+    resumen = {}
+
+    for tipo in sorted(tipos, key=lambda t: t.id):
+        evaluaciones = por_tipo.get(tipo.id)
 
         if not evaluaciones:
             continue
@@ -603,14 +396,14 @@ def resumen_evaluaciones_auto_periodo(
         key = str(tipo.id)
         detalle = [
             {
-                "fecha": e.fecha.isoformat(),
+                "fecha": e.fecha,
                 "descripcion": e.descripcion,
                 "valor": e.valor,
             }
             for e in evaluaciones
         ]
 
-        if tipo.nombre.lower() == "asistencia":
+        if tipo.id == asistencia_id:
             presentes = sum(1 for e in evaluaciones if e.valor >= 1)
             porcentaje = round((presentes / len(evaluaciones)) * 100, 2)
             resumen[key] = {
@@ -631,7 +424,7 @@ def resumen_evaluaciones_auto_periodo(
             }
 
     return {
-        "fecha": fecha_actual.isoformat(),
+        "fecha": fecha_actual,
         "periodo_id": periodo_id,
         "resumen": resumen,
     }
@@ -644,23 +437,33 @@ estado_valores = {
     "justificacion": (50, "Licencia médica"),
 }
 
+_ESTADOS_VALIDOS = frozenset(estado_valores)
+
 
 def obtener_periodo_y_gestion_por_fecha(db: Session, fecha: date):
-    from app.models import Periodo
+    # Cacheado por fecha en el crud de periodos: sin SELECT por llamada
+    resultado = periodo_crud.obtener_periodo_vigente(db, fecha)
 
-    periodo = (
-        db.query(Periodo)
-        .filter(Periodo.fecha_inicio <= fecha, Periodo.fecha_fin >= fecha)
-        .first()
-    )
+    if resultado is None:
+        raise HTTPException(
+            status_code=404,
+            detail="La fecha no coincide con ningún periodo activo en ninguna gestión",
+        )
+
+    return resultado
+
+
+async def obtener_periodo_y_gestion_por_fecha_async(db: AsyncSession, fecha: date):
+    """Variante async de obtener_periodo_y_gestion_por_fecha"""
+    resultado = await periodo_crud.obtener_periodo_vigente_async(db, fecha)
 
-    if not periodo:
+    if resultado is None:
         raise HTTPException(
             status_code=404,
             detail="La fecha no coincide con ningún periodo activo en ninguna gestión",
         )
 
-    return periodo.id, periodo.gestion_id
+    return resultado
 
 
 @router.post("/asistencia")
@@ -670,6 +473,7 @@ def registrar_asistencia_masiva(
     materia_id: int,
     fecha: date,
     estudiantes: list[dict],
+    background_tasks: BackgroundTasks,
     umbral_padres: float = Query(
         50.0, ge=0, le=100, description="Umbral para notificar a padres"
     ),
@@ -678,77 +482,75 @@ def registrar_asistencia_masiva(
 ):
     periodo_id, gestion_id = obtener_periodo_y_gestion_por_fecha(db, fecha)
     registros = []
-    notificaciones_estudiante = 0
-    notificaciones_padres = 0
+    nuevas = []
 
-    for est in estudiantes:
-        est_id = est["id"]
-        estado = est["estado"].lower()
-
-        if estado not in estado_valores:
-            raise HTTPException(status_code=400, detail=f"Estado inválido: {estado}")
-
-        existente = (
-            db.query(Evaluacion)
-            .filter_by(
-                estudiante_id=est_id,
-                materia_id=materia_id,
-                periodo_id=periodo_id,
-                fecha=fecha,
-                tipo_evaluacion_id=5,
+    # Un solo SELECT para saber quiénes ya tienen asistencia ese día, en
+    # lugar de una consulta por estudiante dentro del bucle
+    existentes = set(
+        db.scalars(
+            select(Evaluacion.estudiante_id).where(
+                Evaluacion.materia_id == materia_id,
+                Evaluacion.periodo_id == periodo_id,
+                Evaluacion.fecha == fecha,
+                Evaluacion.tipo_evaluacion_id == 5,
+                Evaluacion.estudiante_id.in_([est["id"] for est in estudiantes]),
             )
-            .first()
         )
-        if existente:
+    )
+
+    # Validación en una sola pasada por diferencia de conjuntos, antes de
+    # armar el lote: falla rápido y reporta todos los estados inválidos
+    estados = [est["estado"].lower() for est in estudiantes]
+    estados_invalidos = set(estados) - _ESTADOS_VALIDOS
+    if estados_invalidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Estados inválidos: {', '.join(sorted(estados_invalidos))}",
+        )
+
+    for est, estado in zip(estudiantes, estados):
+        est_id = est["id"]
+
+        if est_id in existentes:
             continue
 
         valor, descripcion = estado_valores[estado]
-        evaluacion = Evaluacion(
-            fecha=fecha,
-            descripcion=descripcion,
-            valor=valor,
-            estudiante_id=est_id,
-            materia_id=materia_id,
-            tipo_evaluacion_id=5,
-            periodo_id=periodo_id,
-        )
-        db.add(evaluacion)
         registros.append(est_id)
+        nuevas.append(
+            {
+                "fecha": fecha,
+                "descripcion": descripcion,
+                "valor": valor,
+                "estudiante_id": est_id,
+                "materia_id": materia_id,
+                "tipo_evaluacion_id": 5,
+                "periodo_id": periodo_id,
+            }
+        )
 
+    # INSERT en lote (executemany) con RETURNING: sin instancias ORM ni
+    # identity map, y los ids vuelven en la misma sentencia
+    ids_creados = (
+        db.scalars(insert(Evaluacion).returning(Evaluacion.id), nuevas).all()
+        if nuevas
+        else []
+    )
     db.commit()
-
-    # 🆕 ACTUALIZADO: Usar sistema dual para asistencias
-    for est in estudiantes:
-        est_id = est["id"]
-        estado = est["estado"].lower()
-        valor, _ = estado_valores[estado]
-
-        evaluacion_creada = (
-            db.query(Evaluacion)
-            .filter_by(
-                estudiante_id=est_id,
-                materia_id=materia_id,
-                periodo_id=periodo_id,
-                fecha=fecha,
-                tipo_evaluacion_id=5,
-                valor=valor,
-            )
-            .first()
+    # Insert con Core: invalidar el cache de resúmenes a mano (no hay
+    # eventos del mapper en executemany)
+    resumen_service.invalidar_cache_resumen()
+
+    # Notificaciones duales en segundo plano: la respuesta no espera la red
+    for evaluacion_id in ids_creados:
+        background_tasks.add_task(
+            _notificar_evaluacion_en_segundo_plano, evaluacion_id, umbral_padres
         )
 
-        if evaluacion_creada:
-            resultado = _enviar_notificaciones_duales(
-                db, evaluacion_creada, umbral_padres
-            )
-            notificaciones_estudiante += resultado.get("estudiante", 0)
-            notificaciones_padres += resultado.get("padres", 0)
-
     return {
         "mensaje": f"Asistencia registrada para estudiantes: {registros}",
         "periodo_id": periodo_id,
         "gestion_id": gestion_id,
-        "notificaciones_estudiante": notificaciones_estudiante,
-        "notificaciones_padres": notificaciones_padres,
+        "notificaciones_programadas": len(ids_creados),
         "umbral_usado": umbral_padres,
     }
 
@@ -760,6 +562,7 @@ def registrar_participacion_masiva(
     materia_id: int,
     fecha: date,
     estudiantes: list[dict],
+    background_tasks: BackgroundTasks,
     umbral_padres: float = Query(
         50.0, ge=0, le=100, description="Umbral para notificar a padres"
     ),
@@ -767,85 +570,78 @@ def registrar_participacion_masiva(
     payload: dict = Depends(docente_o_admin_required),
 ):
     periodo_id, gestion_id = obtener_periodo_y_gestion_por_fecha(db, fecha)
-    registros = []
-    notificaciones_estudiante = 0
-    notificaciones_padres = 0
-
-    for est in estudiantes:
-        est_id = est["id"]
-        valor = est["valor"]
-        descripcion = est.get("descripcion", "Participación")
-
-        if not (0 <= valor <= 100):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Valor inválido para estudiante {est_id}: {valor}",
-            )
-
-        evaluacion = Evaluacion(
-            fecha=fecha,
-            descripcion=descripcion,
-            valor=valor,
-            estudiante_id=est_id,
-            materia_id=materia_id,
-            tipo_evaluacion_id=4,  # Participación
-            periodo_id=periodo_id,
+    # Validación del lote completo antes de la transacción: falla rápido
+    # y reporta todos los valores fuera de rango sin INSERTs desperdiciados
+    invalidos = [est["id"] for est in estudiantes if not 0 <= est["valor"] <= 100]
+    if invalidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Valores inválidos para estudiantes: {invalidos}",
         )
-        db.add(evaluacion)
-        registros.append(est_id)
 
-    db.commit()
+    registros = [est["id"] for est in estudiantes]
+    nuevas = [
+        {
+            "fecha": fecha,
+            "descripcion": est.get("descripcion", "Participación"),
+            "valor": est["valor"],
+            "estudiante_id": est["id"],
+            "materia_id": materia_id,
+            "tipo_evaluacion_id": 4,  # Participación
+            "periodo_id": periodo_id,
+        }
+        for est in estudiantes
+    ]
 
-    # 🆕 ACTUALIZADO: Usar sistema dual para participaciones
-    for est in estudiantes:
-        est_id = est["id"]
-        valor = est["valor"]
-
-        evaluacion_creada = (
-            db.query(Evaluacion)
-            .filter_by(
-                estudiante_id=est_id,
-                materia_id=materia_id,
-                periodo_id=periodo_id,
-                fecha=fecha,
-                tipo_evaluacion_id=4,
-                valor=valor,
-            )
-            .first()
+    ids_creados = (
+        db.scalars(insert(Evaluacion).returning(Evaluacion.id), nuevas).all()
+        if nuevas
+        else []
+    )
+    db.commit()
+    # Insert con Core: invalidar el cache de resúmenes a mano (no hay
+    # eventos del mapper en executemany)
+    resumen_service.invalidar_cache_resumen()
+
+    # Notificaciones duales en segundo plano: la respuesta no espera la red
+    for evaluacion_id in ids_creados:
+        background_tasks.add_task(
+            _notificar_evaluacion_en_segundo_plano, evaluacion_id, umbral_padres
         )
 
-        if evaluacion_creada:
-            resultado = _enviar_notificaciones_duales(
-                db, evaluacion_creada, umbral_padres
-            )
-            notificaciones_estudiante += resultado.get("estudiante", 0)
-            notificaciones_padres += resultado.get("padres", 0)
-
     return {
         "mensaje": f"Participaciones registradas para estudiantes: {registros}",
         "periodo_id": periodo_id,
         "gestion_id": gestion_id,
-        "notificaciones_estudiante": notificaciones_estudiante,
-        "notificaciones_padres": notificaciones_padres,
+        "notificaciones_programadas": len(ids_creados),
         "umbral_usado": umbral_padres,
     }
 
 
 @router.get("/asistencia/masiva")
-def obtener_asistencias_masiva(
+async def obtener_asistencias_masiva(
     fecha: date,
     curso_id: int,
     materia_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(docente_o_admin_required),
 ):
-    periodo_id, gestion_id = obtener_periodo_y_gestion_por_fecha(db, fecha)
-
-    asistencias = (
-        db.query(Evaluacion)
+    periodo_id, gestion_id = await obtener_periodo_y_gestion_por_fecha_async(db, fecha)
+
+    consulta = (
+        select(
+            Evaluacion.id,
+            Evaluacion.fecha,
+            Evaluacion.descripcion,
+            Evaluacion.valor,
+            Evaluacion.estudiante_id,
+            Evaluacion.materia_id,
+            Evaluacion.tipo_evaluacion_id,
+            Evaluacion.periodo_id,
+        )
         .join(Estudiante)
         .join(Inscripcion)
-        .filter(
+        .where(
             Evaluacion.fecha == fecha,
             Evaluacion.materia_id == materia_id,
             Evaluacion.tipo_evaluacion_id == 5,  # Asistencia
@@ -853,32 +649,41 @@ def obtener_asistencias_masiva(
             Inscripcion.curso_id == curso_id,
             Inscripcion.estudiante_id == Evaluacion.estudiante_id,
         )
-        .all()
     )
+    asistencias = [dict(fila) for fila in (await db.execute(consulta)).mappings()]
 
     return {
         "fecha": fecha,
         "periodo_id": periodo_id,
         "gestion_id": gestion_id,
-        "asistencias": [e.__dict__ for e in asistencias],
+        "asistencias": asistencias,
     }
 
 
 @router.get("/participacion/masiva")
-def obtener_participaciones_masiva(
+async def obtener_participaciones_masiva(
     fecha: date,
     curso_id: int,
     materia_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(docente_o_admin_required),
 ):
-    periodo_id, gestion_id = obtener_periodo_y_gestion_por_fecha(db, fecha)
-
-    participaciones = (
-        db.query(Evaluacion)
+    periodo_id, gestion_id = await obtener_periodo_y_gestion_por_fecha_async(db, fecha)
+
+    consulta = (
+        select(
+            Evaluacion.id,
+            Evaluacion.fecha,
+            Evaluacion.descripcion,
+            Evaluacion.valor,
+            Evaluacion.estudiante_id,
+            Evaluacion.materia_id,
+            Evaluacion.tipo_evaluacion_id,
+            Evaluacion.periodo_id,
+        )
         .join(Estudiante)
         .join(Inscripcion)
-        .filter(
+        .where(
             Evaluacion.fecha == fecha,
             Evaluacion.materia_id == materia_id,
             Evaluacion.tipo_evaluacion_id == 4,  # Participación
@@ -886,33 +691,42 @@ def obtener_participaciones_masiva(
             Inscripcion.curso_id == curso_id,
             Inscripcion.estudiante_id == Evaluacion.estudiante_id,
         )
-        .all()
     )
+    participaciones = [dict(fila) for fila in (await db.execute(consulta)).mappings()]
 
     return {
         "fecha": fecha,
         "periodo_id": periodo_id,
         "gestion_id": gestion_id,
-        "participaciones": [e.__dict__ for e in participaciones],
+        "participaciones": participaciones,
     }
 
 
 @router.get("/evaluacion/masiva")
-def obtener_evaluaciones_por_tipo(
+async def obtener_evaluaciones_por_tipo(
     fecha: date,
     curso_id: int,
     materia_id: int,
     tipo_evaluacion_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(docente_o_admin_required),
 ):
-    periodo_id, gestion_id = obtener_periodo_y_gestion_por_fecha(db, fecha)
-
-    evaluaciones = (
-        db.query(Evaluacion)
+    periodo_id, gestion_id = await obtener_periodo_y_gestion_por_fecha_async(db, fecha)
+
+    consulta = (
+        select(
+            Evaluacion.id,
+            Evaluacion.fecha,
+            Evaluacion.descripcion,
+            Evaluacion.valor,
+            Evaluacion.estudiante_id,
+            Evaluacion.materia_id,
+            Evaluacion.tipo_evaluacion_id,
+            Evaluacion.periodo_id,
+        )
         .join(Estudiante)
         .join(Inscripcion)
-        .filter(
+        .where(
             Evaluacion.fecha == fecha,
             Evaluacion.materia_id == materia_id,
             Evaluacion.tipo_evaluacion_id == tipo_evaluacion_id,
@@ -920,15 +734,15 @@ def obtener_evaluaciones_por_tipo(
             Inscripcion.curso_id == curso_id,
             Inscripcion.estudiante_id == Evaluacion.estudiante_id,
         )
-        .all()
     )
+    evaluaciones = [dict(fila) for fila in (await db.execute(consulta)).mappings()]
 
     return {
         "fecha": fecha,
         "tipo_evaluacion_id": tipo_evaluacion_id,
         "periodo_id": periodo_id,
         "gestion_id": gestion_id,
-        "evaluaciones": [e.__dict__ for e in evaluaciones],
+        "evaluaciones": evaluaciones,
     }
 
 
@@ -938,6 +752,7 @@ def registrar_evaluaciones_masiva(
     materia_id: int,
     fecha: date,
     estudiantes: list[dict],  # [{"id": 1, "valor": 85, "descripcion": "opcional"}]
+    background_tasks: BackgroundTasks,
     descripcion_general: str = None,
     umbral_padres: float = Query(
         50.0, ge=0, le=100, description="Umbral para notificar a padres"
@@ -949,74 +764,59 @@ def registrar_evaluaciones_masiva(
     periodo_id, gestion_id = obtener_periodo_y_gestion_por_fecha(db, fecha)
 
     # Verificar tipo de evaluación
-    tipo = db.query(TipoEvaluacion).filter_by(id=tipo_evaluacion_id).first()
+    tipo = db.get(TipoEvaluacion, tipo_evaluacion_id)
     if not tipo:
         raise HTTPException(status_code=404, detail="Tipo de evaluación no encontrado")
 
     tipo_nombre = tipo.nombre
-    registros = []
-    notificaciones_estudiante = 0
-    notificaciones_padres = 0
-
-    for est in estudiantes:
-        est_id = est["id"]
-        valor = est["valor"]
 
-        if not (0 <= valor <= 100):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Valor inválido para estudiante {est_id}: {valor}",
-            )
-
-        descripcion = est.get("descripcion") or descripcion_general or tipo_nombre
-
-        evaluacion = Evaluacion(
-            fecha=fecha,
-            descripcion=descripcion,
-            valor=valor,
-            estudiante_id=est_id,
-            materia_id=materia_id,
-            tipo_evaluacion_id=tipo_evaluacion_id,
-            periodo_id=periodo_id,
+    # Validación del lote completo antes de la transacción: falla rápido
+    # y reporta todos los valores fuera de rango sin INSERTs desperdiciados
+    invalidos = [est["id"] for est in estudiantes if not 0 <= est["valor"] <= 100]
+    if invalidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Valores inválidos para estudiantes: {invalidos}",
         )
-        db.add(evaluacion)
-        registros.append(est_id)
-
-    db.commit()
 
-    # 🆕 ACTUALIZADO: Usar sistema dual para evaluaciones masivas
-    for est in estudiantes:
-        est_id = est["id"]
-        valor = est["valor"]
+    # La descripción por defecto es constante para todo el lote
+    descripcion_defecto = descripcion_general or tipo_nombre
+    registros = [est["id"] for est in estudiantes]
+    nuevas = [
+        {
+            "fecha": fecha,
+            "descripcion": est.get("descripcion") or descripcion_defecto,
+            "valor": est["valor"],
+            "estudiante_id": est["id"],
+            "materia_id": materia_id,
+            "tipo_evaluacion_id": tipo_evaluacion_id,
+            "periodo_id": periodo_id,
+        }
+        for est in estudiantes
+    ]
 
-        # Buscar la evaluación recién creada
-        evaluacion_creada = (
-            db.query(Evaluacion)
-            .filter(
-                Evaluacion.estudiante_id == est_id,
-                Evaluacion.materia_id == materia_id,
-                Evaluacion.tipo_evaluacion_id == tipo_evaluacion_id,
-                Evaluacion.fecha == fecha,
-                Evaluacion.valor == valor,
-            )
-            .order_by(Evaluacion.id.desc())
-            .first()
+    ids_creados = (
+        db.scalars(insert(Evaluacion).returning(Evaluacion.id), nuevas).all()
+        if nuevas
+        else []
+    )
+    db.commit()
+    # Insert con Core: invalidar el cache de resúmenes a mano (no hay
+    # eventos del mapper en executemany)
+    resumen_service.invalidar_cache_resumen()
+
+    # Notificaciones duales en segundo plano: la respuesta no espera la red
+    for evaluacion_id in ids_creados:
+        background_tasks.add_task(
+            _notificar_evaluacion_en_segundo_plano, evaluacion_id, umbral_padres
         )
 
-        if evaluacion_creada:
-            resultado = _enviar_notificaciones_duales(
-                db, evaluacion_creada, umbral_padres
-            )
-            notificaciones_estudiante += resultado.get("estudiante", 0)
-            notificaciones_padres += resultado.get("padres", 0)
-
     return {
         "mensaje": f"Evaluaciones '{tipo_nombre}' registradas para estudiantes: {registros}",
         "periodo_id": periodo_id,
         "gestion_id": gestion_id,
         "tipo_evaluacion": tipo_nombre,
-        "notificaciones_estudiante": notificaciones_estudiante,
-        "notificaciones_padres": notificaciones_padres,
+        "notificaciones_programadas": len(ids_creados),
         "umbral_usado": umbral_padres,
     }
 
@@ -1033,7 +833,9 @@ def verificar_notificaciones_evaluacion_dual(
 ):
     """🔔 Verificar notificaciones con sistema dual: SIEMPRE estudiante, padres solo si está debajo del umbral"""
     try:
-        evaluacion = db.query(Evaluacion).filter(Evaluacion.id == evaluacion_id).first()
+        evaluacion = NotificationService.cargar_evaluacion_para_notificar(
+            db, evaluacion_id
+        )
         if not evaluacion:
             raise HTTPException(status_code=404, detail="Evaluación no encontrada")
 
@@ -1064,6 +866,7 @@ def verificar_notificaciones_evaluacion_dual(
 # 🆕 ACTUALIZADO: Endpoint para reenviar notificaciones con sistema dual
 @router.post("/reenviar-notificaciones-duales")
 def reenviar_notificaciones_sistema_dual(
+    background_tasks: BackgroundTasks,
     materia_id: int = Query(..., description="ID de la materia"),
     periodo_id: int = Query(..., description="ID del periodo"),
     umbral_padres: float = Query(
@@ -1072,43 +875,37 @@ def reenviar_notificaciones_sistema_dual(
     db: Session = Depends(get_db),
     payload: dict = Depends(docente_o_admin_required),
 ):
-    """🔄 Reenviar notificaciones duales para todas las evaluaciones existentes"""
+    """🔄 Reenviar notificaciones duales para todas las evaluaciones existentes.
+
+    El reenvío corre en segundo plano: la respuesta solo informa cuántas
+    evaluaciones quedaron encoladas, sin esperar el envío de cada una.
+    """
     try:
-        # Buscar todas las evaluaciones del periodo y materia
-        evaluaciones = (
-            db.query(Evaluacion)
-            .filter(
+        total = db.scalar(
+            select(func.count())
+            .select_from(Evaluacion)
+            .where(
                 Evaluacion.materia_id == materia_id,
                 Evaluacion.periodo_id == periodo_id,
             )
-            .all()
         )
 
-        total_notificaciones_estudiante = 0
-        total_notificaciones_padres = 0
-        evaluaciones_procesadas = 0
-
-        for evaluacion in evaluaciones:
-            try:
-                resultado = _enviar_notificaciones_duales(db, evaluacion, umbral_padres)
-                total_notificaciones_estudiante += resultado.get("estudiante", 0)
-                total_notificaciones_padres += resultado.get("padres", 0)
-                evaluaciones_procesadas += 1
-            except Exception as e:
-                logger.error(f"Error procesando evaluación {evaluacion.id}: {e}")
-                continue
+        if total:
+            background_tasks.add_task(
+                _reenviar_notificaciones_en_segundo_plano,
+                materia_id,
+                periodo_id,
+                umbral_padres,
+            )
 
         return {
             "success": True,
-            "mensaje": f"Proceso dual completado: {total_notificaciones_estudiante} notif. estudiantes, {total_notificaciones_padres} notif. padres",
-            "evaluaciones_procesadas": evaluaciones_procesadas,
-            "total_evaluaciones": len(evaluaciones),
-            "notificaciones_estudiante": total_notificaciones_estudiante,
-            "notificaciones_padres": total_notificaciones_padres,
+            "mensaje": f"Reenvío encolado para {total} evaluaciones",
+            "evaluaciones_pendientes": total,
             "umbral_usado": umbral_padres,
         }
 
-    except Exception as e:
+    except SQLAlchemyError as e:
         logger.error(f"Error en reenviar_notificaciones_sistema_dual: {e}")
         raise HTTPException(status_code=500, detail="Error interno del servidor")
 
@@ -1122,60 +919,23 @@ def resumen_evaluaciones_por_estudiante_y_periodo(
     estudiante_id: int,
     materia_id: int,
     periodo_id: int,
+    incluir_detalle: bool = Query(
+        False, description="Incluir el detalle de evaluaciones por tipo"
+    ),
     db: Session = Depends(get_db),
     payload: dict = Depends(docente_o_admin_required),
 ):
-    tipos = db.query(TipoEvaluacion).order_by(TipoEvaluacion.id).all()
-    resumen = {}
-
-    for tipo in tipos:
-        evaluaciones = (
-            db.query(Evaluacion)
-            .filter(
-                Evaluacion.estudiante_id == estudiante_id,
-                Evaluacion.materia_id == materia_id,
-                Evaluacion.periodo_id == periodo_id,
-                Evaluacion.tipo_evaluacion_id == tipo.id,
-            )
-            .all()
-        )
-
-        if not evaluaciones:
-            continue
-
-        key = str(tipo.id)
-        detalle = [
-            {
-                "fecha": e.fecha.isoformat(),
-                "descripcion": e.descripcion,
-                "valor": e.valor,
-            }
-            for e in evaluaciones
-        ]
-
-        if tipo.nombre.lower() == "asistencia":
-            presentes = sum(1 for e in evaluaciones if e.valor >= 1)
-            porcentaje = round((presentes / len(evaluaciones)) * 100, 2)
-            resumen[key] = {
-                "id": tipo.id,
-                "nombre": tipo.nombre,
-                "porcentaje": porcentaje,
-                "total": len(evaluaciones),
-                "detalle": detalle,
-            }
-        else:
-            promedio = round(sum(e.valor for e in evaluaciones) / len(evaluaciones), 2)
-            resumen[key] = {
-                "id": tipo.id,
-                "nombre": tipo.nombre,
-                "promedio": promedio,
-                "total": len(evaluaciones),
-                "detalle": detalle,
-            }
+    calculado = resumen_service.calcular_resumen(
+        db,
+        estudiante_id,
+        materia_id,
+        periodo_id,
+        incluir_detalle=incluir_detalle,
+    )
 
     return {
         "periodo_id": periodo_id,
-        "resumen": resumen,
+        "resumen": calculado["resumen"],
     }
 
 
@@ -1185,100 +945,35 @@ def resumen_evaluaciones_por_estudiante_y_periodo(
     materia_id: int,
     periodo_id: int,
     docente_id: int,
+    incluir_detalle: bool = Query(
+        False, description="Incluir el detalle de evaluaciones por tipo"
+    ),
     db: Session = Depends(get_db),
     payload: dict = Depends(usuario_autenticado),
 ):
-    from app.models import Periodo, PesoTipoEvaluacion
+    from app.models import Periodo
 
-    # Obtener la gestión a partir del periodo
-    periodo = db.query(Periodo).filter_by(id=periodo_id).first()
-    if not periodo:
+    # Obtener la gestión a partir del periodo (solo la columna, sin
+    # hidratar el objeto completo)
+    gestion_id = db.scalar(select(Periodo.gestion_id).where(Periodo.id == periodo_id))
+    if gestion_id is None:
         raise HTTPException(status_code=404, detail="Periodo no encontrado")
 
-    gestion_id = periodo.gestion_id
-
-    tipos = db.query(TipoEvaluacion).order_by(TipoEvaluacion.id).all()
-    resumen = {}
-    total_ponderado = 0
-    total_puntos = 0
-
-    for tipo in tipos:
-        evaluaciones = (
-            db.query(Evaluacion)
-            .filter(
-                Evaluacion.estudiante_id == estudiante_id,
-                Evaluacion.materia_id == materia_id,
-                Evaluacion.periodo_id == periodo_id,
-                Evaluacion.tipo_evaluacion_id == tipo.id,
-            )
-            .all()
-        )
-
-        if not evaluaciones:
-            continue
-
-        # ✅ Corregido: usamos tipo_evaluacion_id
-        peso = (
-            db.query(PesoTipoEvaluacion)
-            .filter(
-                PesoTipoEvaluacion.docente_id == docente_id,
-                PesoTipoEvaluacion.materia_id == materia_id,
-                PesoTipoEvaluacion.gestion_id == gestion_id,
-                PesoTipoEvaluacion.tipo_evaluacion_id == tipo.id,
-            )
-            .first()
-        )
-
-        if not peso:
-            continue  # si no hay peso definido, lo omitimos
-
-        puntos_tipo = peso.porcentaje
-        key = str(tipo.id)
-
-        detalle = [
-            {
-                "fecha": e.fecha.isoformat(),
-                "descripcion": e.descripcion,
-                "valor": e.valor,
-            }
-            for e in evaluaciones
-        ]
-
-        if tipo.nombre.lower() == "asistencia":
-            presentes = sum(1 for e in evaluaciones if e.valor >= 1)
-            porcentaje = round((presentes / len(evaluaciones)) * 100, 2)
-            resumen[key] = {
-                "id": tipo.id,
-                "nombre": tipo.nombre,
-                "porcentaje": porcentaje,
-                "total": len(evaluaciones),
-                "detalle": detalle,
-                "puntos": puntos_tipo,
-            }
-        else:
-            promedio = round(sum(e.valor for e in evaluaciones) / len(evaluaciones), 2)
-            ponderado = promedio * (puntos_tipo / 100)
-            total_ponderado += ponderado
-            total_puntos += puntos_tipo
-
-            resumen[key] = {
-                "id": tipo.id,
-                "nombre": tipo.nombre,
-                "promedio": promedio,
-                "total": len(evaluaciones),
-                "detalle": detalle,
-                "puntos": puntos_tipo,
-            }
-
-    promedio_general = (
-        round((total_ponderado / total_puntos) * 100, 2) if total_puntos > 0 else 0.0
+    calculado = resumen_service.calcular_resumen(
+        db,
+        estudiante_id,
+        materia_id,
+        periodo_id,
+        docente_id=docente_id,
+        gestion_id=gestion_id,
+        incluir_detalle=incluir_detalle,
     )
 
     return {
         "periodo_id": periodo_id,
         "gestion_id": gestion_id,
-        "promedio_general": promedio_general,
-        "resumen": resumen,
+        "promedio_general": calculado["promedio_general"],
+        "resumen": calculado["resumen"],
     }
 
 
@@ -1287,287 +982,155 @@ def resumen_evaluaciones_por_estudiante_y_periodo(
     estudiante_id: int,
     materia_id: int,
     periodo_id: int,
+    incluir_detalle: bool = Query(
+        False, description="Incluir el detalle de evaluaciones por tipo"
+    ),
     db: Session = Depends(get_db),
     payload: dict = Depends(usuario_autenticado),
 ):
-    from app.models import Periodo, PesoTipoEvaluacion, DocenteMateria
+    from app.models import Periodo, DocenteMateria
 
-    # Obtener gestión desde el periodo
-    periodo = db.query(Periodo).filter_by(id=periodo_id).first()
-    if not periodo:
+    # Obtener gestión desde el periodo (solo la columna, sin hidratar el
+    # objeto completo)
+    gestion_id = db.scalar(select(Periodo.gestion_id).where(Periodo.id == periodo_id))
+    if gestion_id is None:
         raise HTTPException(status_code=404, detail="Periodo no encontrado")
-    gestion_id = periodo.gestion_id
 
     # Obtener el docente asignado a la materia
-    docente_materia = db.query(DocenteMateria).filter_by(materia_id=materia_id).first()
-    if not docente_materia:
+    docente_id = db.scalar(
+        select(DocenteMateria.docente_id).filter_by(materia_id=materia_id)
+    )
+    if docente_id is None:
         raise HTTPException(
             status_code=404, detail="No se encontró docente asignado a esta materia."
         )
-    docente_id = docente_materia.docente_id
-
-    tipos = db.query(TipoEvaluacion).order_by(TipoEvaluacion.id).all()
-    resumen = {}
-    total_ponderado = 0
-    total_puntos = 0
-
-    for tipo in tipos:
-        evaluaciones = (
-            db.query(Evaluacion)
-            .filter(
-                Evaluacion.estudiante_id == estudiante_id,
-                Evaluacion.materia_id == materia_id,
-                Evaluacion.periodo_id == periodo_id,
-                Evaluacion.tipo_evaluacion_id == tipo.id,
-            )
-            .all()
-        )
-
-        if not evaluaciones:
-            continue
-
-        # Obtener el porcentaje definido por el docente
-        peso = (
-            db.query(PesoTipoEvaluacion)
-            .filter(
-                PesoTipoEvaluacion.docente_id == docente_id,
-                PesoTipoEvaluacion.materia_id == materia_id,
-                PesoTipoEvaluacion.gestion_id == gestion_id,
-                PesoTipoEvaluacion.tipo_evaluacion_id == tipo.id,
-            )
-            .first()
-        )
-
-        if not peso:
-            continue
-
-        puntos_tipo = peso.porcentaje
-        key = str(tipo.id)
-
-        detalle = [
-            {
-                "fecha": e.fecha.isoformat(),
-                "descripcion": e.descripcion,
-                "valor": e.valor,
-            }
-            for e in evaluaciones
-        ]
-
-        if tipo.nombre.lower() == "asistencia":
-            presentes = sum(1 for e in evaluaciones if e.valor >= 1)
-            porcentaje = round((presentes / len(evaluaciones)) * 100, 2)
-            resumen[key] = {
-                "id": tipo.id,
-                "nombre": tipo.nombre,
-                "porcentaje": porcentaje,
-                "total": len(evaluaciones),
-                "detalle": detalle,
-                "puntos": puntos_tipo,
-            }
-        else:
-            promedio = round(sum(e.valor for e in evaluaciones) / len(evaluaciones), 2)
-            ponderado = promedio * (puntos_tipo / 100)
-            total_ponderado += ponderado
-            total_puntos += puntos_tipo
-
-            resumen[key] = {
-                "id": tipo.id,
-                "nombre": tipo.nombre,
-                "promedio": promedio,
-                "total": len(evaluaciones),
-                "detalle": detalle,
-                "puntos": puntos_tipo,
-            }
 
-    promedio_general = (
-        round((total_ponderado / total_puntos) * 100, 2) if total_puntos > 0 else 0.0
+    calculado = resumen_service.calcular_resumen(
+        db,
+        estudiante_id,
+        materia_id,
+        periodo_id,
+        docente_id=docente_id,
+        gestion_id=gestion_id,
+        incluir_detalle=incluir_detalle,
     )
 
     return {
         "periodo_id": periodo_id,
         "gestion_id": gestion_id,
-        "promedio_general": promedio_general,
-        "resumen": resumen,
+        "promedio_general": calculado["promedio_general"],
+        "resumen": calculado["resumen"],
     }
 
 
 @router.get("/por-docente/{docente_id}", response_model=list[EvaluacionOut])
-def evaluaciones_por_docente(
+async def evaluaciones_por_docente(
     docente_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(docente_o_admin_required),
 ):
     from app.models import DocenteMateria
 
     # Obtener las materias que enseña el docente
-    materias_asignadas = (
-        db.query(DocenteMateria.materia_id)
-        .filter(DocenteMateria.docente_id == docente_id)
+    materia_ids = (
+        (
+            await db.execute(
+                select(DocenteMateria.materia_id).where(
+                    DocenteMateria.docente_id == docente_id
+                )
+            )
+        )
+        .scalars()
         .all()
     )
 
-    materia_ids = [m.materia_id for m in materias_asignadas]
-
     if not materia_ids:
         raise HTTPException(
             status_code=404, detail="El docente no tiene materias asignadas"
         )
 
     # Buscar evaluaciones de esas materias
-    evaluaciones = (
-        db.query(Evaluacion)
-        .filter(Evaluacion.materia_id.in_(materia_ids))
+    consulta = (
+        select(Evaluacion)
+        .where(Evaluacion.materia_id.in_(materia_ids))
         .order_by(Evaluacion.fecha.desc())
-        .all()
     )
-
-    return evaluaciones
+    return (await db.execute(consulta)).scalars().all()
 
 
 @router.get("/resumen/por-estudiante-docente-auto", response_model=dict)
 def resumen_por_estudiante_docente_auto(
     estudiante_id: int,
     docente_id: int,
+    incluir_detalle: bool = Query(
+        False, description="Incluir el detalle de evaluaciones por tipo"
+    ),
     db: Session = Depends(get_db),
     payload: dict = Depends(usuario_autenticado),
 ):
-    from app.models import (
-        Periodo,
-        Inscripcion,
-        DocenteMateria,
-        PesoTipoEvaluacion,
-        TipoEvaluacion,
-        Curso,
-        Materia,
-    )
+    from app.models import Inscripcion, DocenteMateria, Curso, Materia
 
     # Paso 1: determinar periodo activo por fecha actual
     fecha_actual = date.today()
-    periodo = (
-        db.query(Periodo)
-        .filter(Periodo.fecha_inicio <= fecha_actual, Periodo.fecha_fin >= fecha_actual)
-        .first()
-    )
-    if not periodo:
+    vigente = periodo_crud.obtener_periodo_vigente(db, fecha_actual)
+    if vigente is None:
         raise HTTPException(status_code=404, detail="No se encontró un periodo activo")
-    periodo_id = periodo.id
-    gestion_id = periodo.gestion_id
+    periodo_id, gestion_id = vigente
 
     # Paso 2: obtener curso del estudiante en esta gestión
-    inscripcion = (
-        db.query(Inscripcion)
-        .filter_by(estudiante_id=estudiante_id, gestion_id=gestion_id)
-        .first()
+    curso_id = db.scalar(
+        select(Inscripcion.curso_id).filter_by(
+            estudiante_id=estudiante_id, gestion_id=gestion_id
+        )
     )
-    if not inscripcion:
+    if curso_id is None:
         raise HTTPException(
             status_code=404, detail="El estudiante no está inscrito en esta gestión"
         )
-    curso_id = inscripcion.curso_id
 
     # Paso 3: obtener materia asignada al docente
-    materia_docente = db.query(DocenteMateria).filter_by(docente_id=docente_id).first()
-    if not materia_docente:
+    materia_id = db.scalar(
+        select(DocenteMateria.materia_id).filter_by(docente_id=docente_id)
+    )
+    if materia_id is None:
         raise HTTPException(
             status_code=404, detail="El docente no tiene materias asignadas"
         )
-    materia_id = materia_docente.materia_id
 
-    # Paso 4: verificar si hay evaluaciones del estudiante en esa materia y periodo
-    evaluaciones_existentes = (
-        db.query(Evaluacion)
-        .filter_by(
-            estudiante_id=estudiante_id, periodo_id=periodo_id, materia_id=materia_id
+    # Paso 4: verificar si hay evaluaciones del estudiante en esa materia
+    # y periodo (EXISTS: el motor devuelve un booleano, sin hidratar filas)
+    hay_evaluaciones = db.scalar(
+        select(
+            exists().where(
+                Evaluacion.estudiante_id == estudiante_id,
+                Evaluacion.periodo_id == periodo_id,
+                Evaluacion.materia_id == materia_id,
+            )
         )
-        .first()
     )
-    if not evaluaciones_existentes:
+    if not hay_evaluaciones:
         raise HTTPException(
             status_code=404,
             detail="No se encontraron evaluaciones del estudiante para esa materia y periodo",
         )
 
-    # Paso 5: construir el resumen ponderado
-    tipos = db.query(TipoEvaluacion).order_by(TipoEvaluacion.id).all()
-    resumen = {}
-    total_ponderado = 0
-    total_puntos = 0
-
-    for tipo in tipos:
-        evaluaciones = (
-            db.query(Evaluacion)
-            .filter_by(
-                estudiante_id=estudiante_id,
-                materia_id=materia_id,
-                periodo_id=periodo_id,
-                tipo_evaluacion_id=tipo.id,
-            )
-            .all()
-        )
-        if not evaluaciones:
-            continue
-
-        peso = (
-            db.query(PesoTipoEvaluacion)
-            .filter_by(
-                docente_id=docente_id,
-                materia_id=materia_id,
-                gestion_id=gestion_id,
-                tipo_evaluacion_id=tipo.id,
-            )
-            .first()
-        )
-
-        if not peso:
-            continue
-
-        puntos_tipo = peso.porcentaje
-        key = str(tipo.id)
-        detalle = [
-            {
-                "fecha": e.fecha.isoformat(),
-                "descripcion": e.descripcion,
-                "valor": e.valor,
-            }
-            for e in evaluaciones
-        ]
-
-        if tipo.nombre.lower() == "asistencia":
-            presentes = sum(1 for e in evaluaciones if e.valor >= 1)
-            porcentaje = round((presentes / len(evaluaciones)) * 100, 2)
-            resumen[key] = {
-                "id": tipo.id,
-                "nombre": tipo.nombre,
-                "porcentaje": porcentaje,
-                "total": len(evaluaciones),
-                "detalle": detalle,
-                "puntos": puntos_tipo,
-            }
-        else:
-            promedio = round(sum(e.valor for e in evaluaciones) / len(evaluaciones), 2)
-            ponderado = promedio * (puntos_tipo / 100)
-            total_ponderado += ponderado
-            total_puntos += puntos_tipo
-
-            resumen[key] = {
-                "id": tipo.id,
-                "nombre": tipo.nombre,
-                "promedio": promedio,
-                "total": len(evaluaciones),
-                "detalle": detalle,
-                "puntos": puntos_tipo,
-            }
-
-    promedio_general = (
-        round((total_ponderado / total_puntos) * 100, 2) if total_puntos > 0 else 0.0
+    # Paso 5: construir el resumen ponderado con el núcleo compartido
+    calculado = resumen_service.calcular_resumen(
+        db,
+        estudiante_id,
+        materia_id,
+        periodo_id,
+        docente_id=docente_id,
+        gestion_id=gestion_id,
+        incluir_detalle=incluir_detalle,
     )
 
     # También retornamos los nombres si se desea mostrar en frontend
-    curso = db.query(Curso).filter_by(id=curso_id).first()
-    materia = db.query(Materia).filter_by(id=materia_id).first()
+    curso = db.get(Curso, curso_id)
+    materia = db.get(Materia, materia_id)
 
     return {
-        "fecha_actual": fecha_actual.isoformat(),
+        "fecha_actual": fecha_actual,
         "periodo_id": periodo_id,
         "gestion_id": gestion_id,
         "curso": {
@@ -1581,7 +1144,7 @@ def resumen_por_estudiante_docente_auto(
             "id": materia_id,
             "nombre": materia.nombre,
         },
-        "promedio_general": promedio_general,
-        "resumen": resumen,
+        "promedio_general": calculado["promedio_general"],
+        "resumen": calculado["resumen"],
     }
 
@@ -1,81 +1,59 @@
 # app/routers/informacion_academica.py
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import SessionLocal
+from app.deps import get_async_db
+from app.exceptions import GestionError, PrediccionError
 from app.auth.roles import usuario_autenticado
-from sqlalchemy import func
-from datetime import date, datetime
+from sqlalchemy import exists, func, select
+from datetime import date, datetime, timezone
 import logging
 
+import numpy as np
+
 router = APIRouter(prefix="/info-academica", tags=["📊 Información Académica Completa"])
 
 logger = logging.getLogger(__name__)
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def _stream_respuesta_completa(respuesta: dict):
+    """Serializa la respuesta en chunks: cabecera + una materia por chunk.
 
-
-@router.get("/estudiante-completo")
-def obtener_rendimientos_y_predicciones_completos(
-    estudiante_id: int = Query(..., description="ID del estudiante"),
-    enviar_por_correo: bool = Query(
-        False, description="Enviar reporte por correo electrónico"
-    ),
-    db: Session = Depends(get_db),
-    payload: dict = Depends(usuario_autenticado),
-):
+    Evita materializar el JSON completo en un solo buffer; el cliente
+    empieza a recibir bytes apenas se serializa la primera materia.
     """
-    🎯 Obtener rendimientos académicos y predicciones ML completos de un estudiante
-
-    **Acceso por roles:**
-    - 🎓 **Estudiante**: Solo puede ver sus propios datos
-    - 👨‍👩‍👧‍👦 **Padre**: Puede ver datos de sus hijos registrados
-    - 👨‍🏫 **Docente**: Puede ver datos de estudiantes en sus materias
-    - 🔧 **Admin**: Puede ver datos de cualquier estudiante
-
-    **Ejemplos de uso:**
-    ```
-    # Estudiante consultando sus datos
-    GET /info-academica/estudiante-completo?estudiante_id=123
-    Authorization: Bearer [token_estudiante_123]
-
-    # Padre consultando datos de su hijo
-    GET /info-academica/estudiante-completo?estudiante_id=456
-    Authorization: Bearer [token_padre_789]
-
-    # Docente consultando estudiante en sus materias
-    GET /info-academica/estudiante-completo?estudiante_id=456
-    Authorization: Bearer [token_docente_101]
-
-    # Admin consultando cualquier estudiante
-    GET /info-academica/estudiante-completo?estudiante_id=456
-    Authorization: Bearer [token_admin_202]
-    ```
-
-    **Parámetros de consulta:**
-    - `estudiante_id`: ID del estudiante (requerido)
-    - `enviar_por_correo`: Enviar reporte por email (opcional, default: False)
-
-    **Funcionalidades:**
-    - Detecta automáticamente la gestión activa actual
-    - Calcula rendimientos finales por materia y periodo
-    - Genera predicciones ML automáticamente si no existen
-    - Incluye información completa de materias y docentes
-    - **NUEVO**: Envía el reporte completo por correo electrónico
-    - Un solo endpoint para toda la información académica
-
-    **Respuesta incluye:**
-    - Rendimientos calculados por tipo de evaluación
-    - Predicciones de Machine Learning
-    - Información del docente asignado
-    - Datos de la materia y periodos
-    - Estadísticas y recomendaciones
-    - Estado del envío por correo (si se solicitó)
+    materias = respuesta.pop("materias", None)
+    cabecera = orjson.dumps(respuesta)
+    if materias is None:
+        yield cabecera
+        return
+    # Reabrir el objeto serializado para anexar la lista de materias
+    yield cabecera[:-1] + b',"materias":['
+    for i, materia in enumerate(materias):
+        if i:
+            yield b","
+        yield orjson.dumps(materia)
+    yield b"]}"
+
+
+async def _construir_reporte_completo(
+    background_tasks: BackgroundTasks,
+    estudiante_id: int,
+    enviar_por_correo: bool,
+    include: str,
+    db: AsyncSession,
+    payload: dict,
+) -> dict:
+    """Arma el reporte académico completo de un estudiante como dict.
+
+    Lógica compartida entre GET /estudiante-completo (que lo sirve en
+    streaming) y /enviar-reporte-por-correo (que consume el dict para
+    armar el correo). Levanta HTTPException directamente en los caminos
+    de validación y permisos.
     """
     from app.models import (
         Inscripcion,
@@ -93,593 +71,807 @@ def obtener_rendimientos_y_predicciones_completos(
         PadreEstudiante,
         Estudiante,
     )
+    from app.crud.peso_tipo_evaluacion import mapa_pesos_por_gestion_async
+    from app.crud.tipo_evaluacion import listar_tipos_async
     from app.ml.prediction_service import get_prediction_service
     from app.services.email_service import EmailService
 
-    try:
-        # 🔐 CONTROL DE ACCESO POR ROLES
-        user_type = payload.get("user_type")
-        user_id = payload.get("user_id")
+    # 🔐 CONTROL DE ACCESO POR ROLES
+    user_type = payload.get("user_type")
+    user_id = payload.get("user_id")
 
-        # Verificar que el estudiante existe
-        estudiante = db.query(Estudiante).filter_by(id=estudiante_id).first()
-        if not estudiante:
-            raise HTTPException(status_code=404, detail="Estudiante no encontrado")
-
-        # VALIDACIÓN POR TIPO DE USUARIO
-        if user_type == "estudiante":
-            # Estudiantes solo pueden ver sus propios datos
-            if user_id != estudiante_id:
-                raise HTTPException(
-                    status_code=403,
-                    detail="Solo puedes ver tu propia información académica",
-                )
+    # Verificar que el estudiante existe
+    estudiante = await db.get(Estudiante, estudiante_id)
+    if not estudiante:
+        raise HTTPException(status_code=404, detail="Estudiante no encontrado")
 
-        elif user_type == "padre":
-            # Padres solo pueden ver datos de sus hijos
-            relacion_padre = (
-                db.query(PadreEstudiante)
-                .filter_by(padre_id=user_id, estudiante_id=estudiante_id)
-                .first()
+    # VALIDACIÓN POR TIPO DE USUARIO
+    if user_type == "estudiante":
+        # Estudiantes solo pueden ver sus propios datos
+        if user_id != estudiante_id:
+            raise HTTPException(
+                status_code=403,
+                detail="Solo puedes ver tu propia información académica",
             )
-            if not relacion_padre:
-                raise HTTPException(
-                    status_code=403,
-                    detail="No tienes autorización para ver este estudiante",
+
+    elif user_type == "padre":
+        # Padres solo pueden ver datos de sus hijos
+        relacion_padre = (
+            (
+                await db.execute(
+                    select(PadreEstudiante).filter_by(
+                        padre_id=user_id, estudiante_id=estudiante_id
+                    )
                 )
+            )
+            .scalars()
+            .first()
+        )
+        if not relacion_padre:
+            raise HTTPException(
+                status_code=403,
+                detail="No tienes autorización para ver este estudiante",
+            )
 
-        elif user_type == "docente":
-            # Docentes pueden ver estudiantes en sus materias
-            docente_materias = (
-                db.query(DocenteMateria.materia_id).filter_by(docente_id=user_id).all()
+    elif user_type == "docente":
+        # Docentes pueden ver estudiantes en sus materias: un EXISTS en
+        # lugar de traer todos los materia_id a memoria
+        tiene_materias = await db.scalar(
+            select(exists().where(DocenteMateria.docente_id == user_id))
+        )
+
+        if not tiene_materias:
+            raise HTTPException(
+                status_code=403,
+                detail="No tienes materias asignadas para ver estudiantes",
             )
-            materia_ids_docente = [dm.materia_id for dm in docente_materias]
 
-            if not materia_ids_docente:
-                raise HTTPException(
-                    status_code=403,
-                    detail="No tienes materias asignadas para ver estudiantes",
-                )
+        # La intersección con las materias del estudiante se verifica más
+        # adelante, una vez resuelta la gestión activa
 
-            # Verificar si el estudiante está en alguna materia del docente
-            # (Esta verificación se refinará más adelante con la gestión activa)
+    elif user_type == "admin":
+        # Administradores pueden ver cualquier estudiante
+        pass
 
-        elif user_type == "admin":
-            # Administradores pueden ver cualquier estudiante
-            pass
+    else:
+        raise HTTPException(status_code=403, detail="Tipo de usuario no autorizado")
 
-        else:
-            raise HTTPException(status_code=403, detail="Tipo de usuario no autorizado")
+    # 1. DETECTAR GESTIÓN ACTIVA AUTOMÁTICAMENTE
+    hoy = date.today()
+    gestion_activa = (
+        (
+            await db.execute(
+                select(Gestion)
+                .join(Periodo, Periodo.gestion_id == Gestion.id)
+                .filter(Periodo.fecha_inicio <= hoy, Periodo.fecha_fin >= hoy)
+            )
+        )
+        .scalars()
+        .first()
+    )
 
-        # 1. DETECTAR GESTIÓN ACTIVA AUTOMÁTICAMENTE
-        hoy = date.today()
+    if not gestion_activa:
+        # Si no hay gestión con periodo activo, usar la más reciente
         gestion_activa = (
-            db.query(Gestion)
-            .join(Periodo, Periodo.gestion_id == Gestion.id)
-            .filter(Periodo.fecha_inicio <= hoy, Periodo.fecha_fin >= hoy)
+            (await db.execute(select(Gestion).order_by(Gestion.id.desc())))
+            .scalars()
             .first()
         )
 
-        if not gestion_activa:
-            # Si no hay gestión con periodo activo, usar la más reciente
-            gestion_activa = db.query(Gestion).order_by(Gestion.id.desc()).first()
+    if not gestion_activa:
+        raise GestionError("No se encontró ninguna gestión disponible")
 
-        if not gestion_activa:
-            raise HTTPException(
-                status_code=404, detail="No se encontró ninguna gestión disponible"
-            )
+    gestion_id = gestion_activa.id
 
-        gestion_id = gestion_activa.id
+    # 2. VERIFICAR INSCRIPCIÓN DEL ESTUDIANTE (solo la columna curso_id,
+    # sin hidratar instancias ORM completas)
+    curso_ids = list(
+        (
+            await db.execute(
+                select(Inscripcion.curso_id).filter_by(
+                    estudiante_id=estudiante_id, gestion_id=gestion_id
+                )
+            )
+        ).scalars()
+    )
 
-        # 2. VERIFICAR INSCRIPCIÓN DEL ESTUDIANTE
-        inscripciones = (
-            db.query(Inscripcion)
-            .filter_by(estudiante_id=estudiante_id, gestion_id=gestion_id)
-            .all()
+    if not curso_ids:
+        raise HTTPException(
+            status_code=404,
+            detail=f"El estudiante no está inscrito en la gestión {gestion_activa.anio}",
         )
 
-        if not inscripciones:
-            raise HTTPException(
-                status_code=404,
-                detail=f"El estudiante no está inscrito en la gestión {gestion_activa.anio}",
+    # 3. OBTENER PERIODOS DE LA GESTIÓN
+    periodos = (
+        (
+            await db.execute(
+                select(Periodo)
+                .filter_by(gestion_id=gestion_id)
+                .order_by(Periodo.fecha_inicio)
             )
+        )
+        .scalars()
+        .all()
+    )
 
-        # 3. OBTENER PERIODOS DE LA GESTIÓN
-        periodos = (
-            db.query(Periodo)
-            .filter_by(gestion_id=gestion_id)
-            .order_by(Periodo.fecha_inicio)
-            .all()
+    if not periodos:
+        raise HTTPException(
+            status_code=404, detail="No hay periodos definidos para esta gestión"
+        )
+
+    # 4. MATERIAS DE TODOS LOS CURSOS DEL ESTUDIANTE (una sola consulta
+    # a nivel de columnas: tuplas ligeras en vez de objetos CursoMateria)
+    filas_curso_materia = (
+        await db.execute(
+            select(CursoMateria.curso_id, CursoMateria.materia_id).filter(
+                CursoMateria.curso_id.in_(curso_ids)
+            )
+        )
+    ).all()
+    materias_por_curso = {}
+    for curso_id, materia_id in filas_curso_materia:
+        materias_por_curso.setdefault(curso_id, []).append(materia_id)
+    materia_ids = {materia_id for _, materia_id in filas_curso_materia}
+
+    # 5. VALIDACIÓN ADICIONAL PARA DOCENTES
+    if user_type == "docente":
+        # Intersección materias del docente / materias del estudiante
+        # resuelta en una sola consulta con DISTINCT, sin set() en Python
+        materias_comunes = set(
+            (
+                await db.execute(
+                    select(DocenteMateria.materia_id)
+                    .distinct()
+                    .join(
+                        CursoMateria,
+                        CursoMateria.materia_id == DocenteMateria.materia_id,
+                    )
+                    .join(
+                        Inscripcion,
+                        Inscripcion.curso_id == CursoMateria.curso_id,
+                    )
+                    .filter(
+                        DocenteMateria.docente_id == user_id,
+                        Inscripcion.estudiante_id == estudiante_id,
+                        Inscripcion.gestion_id == gestion_id,
+                    )
+                )
+            ).scalars()
         )
 
-        if not periodos:
+        if not materias_comunes:
             raise HTTPException(
-                status_code=404, detail="No hay periodos definidos para esta gestión"
+                status_code=403,
+                detail="No tienes materias en común con este estudiante",
             )
 
-        # 5. VALIDACIÓN ADICIONAL PARA DOCENTES
-        if user_type == "docente":
-            # Verificar que el estudiante esté inscrito en materias del docente
-            docente_materias = (
-                db.query(DocenteMateria.materia_id).filter_by(docente_id=user_id).all()
+        # Filtrar solo las materias que enseña este docente
+        materia_ids_permitidas = list(materias_comunes)
+    else:
+        # Para otros usuarios, permitir todas las materias
+        materia_ids_permitidas = None
+
+    # 6. OBTENER TIPOS DE EVALUACIÓN (cache de proceso)
+    tipos = await listar_tipos_async(db)
+
+    # 6.1 PRECARGAR EN BLOQUE TODO LO QUE ANTES SE CONSULTABA DENTRO DEL LOOP
+    # Una consulta por tabla con .in_() y diccionarios en memoria, en lugar de
+    # un SELECT por cada combinación materia/periodo/tipo
+    materias_por_id = {
+        m.id: m
+        for m in (
+            await db.execute(select(Materia).filter(Materia.id.in_(materia_ids)))
+        ).scalars()
+    }
+
+    docente_por_materia = {}
+    for materia_id, docente_id in (
+        await db.execute(
+            select(DocenteMateria.materia_id, DocenteMateria.docente_id).filter(
+                DocenteMateria.materia_id.in_(materia_ids)
+            )
+        )
+    ):
+        # Se conserva el primer docente por materia (mismo criterio que .first())
+        docente_por_materia.setdefault(materia_id, docente_id)
+
+    docente_ids = set(docente_por_materia.values())
+    docentes_por_id = {
+        d.id: d
+        for d in (
+            await db.execute(select(Docente).filter(Docente.id.in_(docente_ids)))
+        ).scalars()
+    }
+
+    # Pesos de la gestión desde el cache de proceso (TTL 300s)
+    pesos_por_clave = await mapa_pesos_por_gestion_async(db, gestion_id)
+
+    evaluaciones_por_clave = {}
+    for evaluacion in (
+        await db.execute(
+            select(Evaluacion).filter(
+                Evaluacion.estudiante_id == estudiante_id,
+                Evaluacion.materia_id.in_(materia_ids),
             )
-            materia_ids_docente = [dm.materia_id for dm in docente_materias]
-
-            # Obtener materias del estudiante en esta gestión
-            materias_estudiante = []
-            for inscripcion in inscripciones:
-                curso_materias = (
-                    db.query(CursoMateria)
-                    .filter_by(curso_id=inscripcion.curso_id)
-                    .all()
+        )
+    ).scalars():
+        clave = (
+            evaluacion.materia_id,
+            evaluacion.periodo_id,
+            evaluacion.tipo_evaluacion_id,
+        )
+        evaluaciones_por_clave.setdefault(clave, []).append(evaluacion)
+
+    # Celdas (materia, periodo) con al menos una evaluación: permite
+    # saltar el loop de tipos en el caso común de celdas vacías
+    celdas_con_evaluaciones = {
+        (materia_id, periodo_id)
+        for materia_id, periodo_id, _ in evaluaciones_por_clave
+    }
+
+    rendimientos_por_clave = {
+        (r.materia_id, r.periodo_id): r
+        for r in (
+            await db.execute(
+                select(RendimientoFinal).filter(
+                    RendimientoFinal.estudiante_id == estudiante_id,
+                    RendimientoFinal.materia_id.in_(materia_ids),
                 )
-                materias_estudiante.extend([cm.materia_id for cm in curso_materias])
-
-            # Verificar si hay intersección entre materias del docente y del estudiante
-            materias_comunes = set(materia_ids_docente) & set(materias_estudiante)
-
-            if not materias_comunes:
-                raise HTTPException(
-                    status_code=403,
-                    detail="No tienes materias en común con este estudiante",
+            )
+        ).scalars()
+    }
+
+    predicciones_por_clave = {
+        (p.materia_id, p.periodo_id): p
+        for p in (
+            await db.execute(
+                select(PrediccionRendimiento).filter(
+                    PrediccionRendimiento.estudiante_id == estudiante_id,
+                    PrediccionRendimiento.materia_id.in_(materia_ids),
                 )
+            )
+        ).scalars()
+    }
+
+    # 7. PROCESAR CADA INSCRIPCIÓN
+    resultados = []
+    arrays_notas = []
+    arrays_predicciones = []
+    predicciones_pendientes = []
+    service = get_prediction_service()
+
+    # Timestamp del cálculo asignado en Python: evita depender de func.now()
+    # (que obligaría a refrescar cada fila) y permite un solo commit al final
+    fecha_calculo_actual = datetime.now(timezone.utc)
+
+    def _generar_predicciones_batch(celdas):
+        """Genera las predicciones faltantes en lote, con sesión propia"""
+        sesion = SessionLocal()
+        try:
+            service.predecir_estudiante_batch(sesion, estudiante_id, celdas)
+        finally:
+            sesion.close()
+
+    def _procesar_materia(curso_id: int, materia_id: int):
+        """Procesa una materia sobre los datos ya precargados.
+
+        Puro cómputo en memoria: las consultas se hicieron en bloque
+        antes del loop y la inferencia ML faltante se difiere a
+        background_tasks, así que no hay nada que esperar.
+        """
+        materia = materias_por_id[materia_id]
+
+        # Información del docente
+        docente_id = docente_por_materia.get(materia_id)
+
+        docente_info = None
+        if docente_id:
+            docente = docentes_por_id.get(docente_id)
+            if docente:
+                docente_info = {
+                    "id": docente.id,
+                    "nombre": docente.nombre,
+                    "apellido": docente.apellido,
+                    "correo": docente.correo,
+                    "telefono": docente.telefono,
+                }
 
-            # Filtrar solo las materias que enseña este docente
-            materia_ids_permitidas = list(materias_comunes)
-        else:
-            # Para otros usuarios, permitir todas las materias
-            materia_ids_permitidas = None
-
-        # 6. OBTENER TIPOS DE EVALUACIÓN
-        tipos = db.query(TipoEvaluacion).all()
-
-        # 7. PROCESAR CADA INSCRIPCIÓN
-        resultados = []
-        service = get_prediction_service()
-
-        for inscripcion in inscripciones:
-            curso_id = inscripcion.curso_id
-
-            # Obtener materias del curso
-            curso_materias = db.query(CursoMateria).filter_by(curso_id=curso_id).all()
+        # 6. PROCESAR CADA PERIODO
+        periodos_data = []
+        predicciones_generadas = 0
 
-            for curso_materia in curso_materias:
-                materia_id = curso_materia.materia_id
+        for periodo in periodos:
+            periodo_id = periodo.id
 
-                # Filtrar materias para docentes
-                if (
-                    materia_ids_permitidas is not None
-                    and materia_id not in materia_ids_permitidas
-                ):
-                    continue
+            # CALCULAR RENDIMIENTO FINAL
+            nota_final = 0.0
+            detalle_evaluaciones = []
 
-                # Información de la materia
-                materia = db.query(Materia).filter_by(id=materia_id).first()
-                if not materia:
-                    continue
+            if docente_id and (materia_id, periodo_id) in celdas_con_evaluaciones:
+                for tipo in tipos:
+                    # Porcentaje definido por el docente
+                    porcentaje = pesos_por_clave.get(
+                        (docente_id, materia_id, tipo.id)
+                    )
 
-                # Información del docente
-                docente_materia = (
-                    db.query(DocenteMateria).filter_by(materia_id=materia_id).first()
-                )
+                    if not porcentaje:
+                        continue
 
-                docente_info = None
-                if docente_materia:
-                    docente = (
-                        db.query(Docente)
-                        .filter_by(id=docente_materia.docente_id)
-                        .first()
-                    )
-                    if docente:
-                        docente_info = {
-                            "id": docente.id,
-                            "nombre": docente.nombre,
-                            "apellido": docente.apellido,
-                            "correo": docente.correo,
-                            "telefono": docente.telefono,
-                        }
-
-                # 6. PROCESAR CADA PERIODO
-                periodos_data = []
-
-                for periodo in periodos:
-                    periodo_id = periodo.id
-
-                    # CALCULAR RENDIMIENTO FINAL
-                    nota_final = 0.0
-                    detalle_evaluaciones = []
-
-                    if docente_materia:
-                        docente_id = docente_materia.docente_id
-
-                        for tipo in tipos:
-                            # Peso definido por el docente
-                            peso = (
-                                db.query(PesoTipoEvaluacion)
-                                .filter_by(
-                                    docente_id=docente_id,
-                                    materia_id=materia_id,
-                                    gestion_id=gestion_id,
-                                    tipo_evaluacion_id=tipo.id,
-                                )
-                                .first()
-                            )
-
-                            if not peso:
-                                continue
-
-                            # Evaluaciones del estudiante
-                            evaluaciones = (
-                                db.query(Evaluacion)
-                                .filter_by(
-                                    estudiante_id=estudiante_id,
-                                    materia_id=materia_id,
-                                    periodo_id=periodo_id,
-                                    tipo_evaluacion_id=tipo.id,
-                                )
-                                .all()
-                            )
-
-                            if evaluaciones:
-                                promedio = sum(e.valor for e in evaluaciones) / len(
-                                    evaluaciones
-                                )
-                                aporte = (promedio * peso.porcentaje) / 100
-                                nota_final += aporte
-
-                                detalle_evaluaciones.append(
-                                    {
-                                        "tipo_evaluacion_id": tipo.id,
-                                        "tipo_nombre": tipo.nombre,
-                                        "promedio": round(promedio, 2),
-                                        "peso": peso.porcentaje,
-                                        "aporte": round(aporte, 2),
-                                        "cantidad_evaluaciones": len(evaluaciones),
-                                    }
-                                )
-
-                    nota_final = round(nota_final, 2)
-
-                    # GUARDAR/ACTUALIZAR RENDIMIENTO FINAL
-                    existente_rendimiento = (
-                        db.query(RendimientoFinal)
-                        .filter_by(
-                            estudiante_id=estudiante_id,
-                            materia_id=materia_id,
-                            periodo_id=periodo_id,
-                        )
-                        .first()
+                    # Evaluaciones del estudiante
+                    evaluaciones = evaluaciones_por_clave.get(
+                        (materia_id, periodo_id, tipo.id), []
                     )
 
-                    if existente_rendimiento:
-                        existente_rendimiento.nota_final = nota_final
-                        existente_rendimiento.fecha_calculo = func.now()
-                    else:
-                        existente_rendimiento = RendimientoFinal(
-                            estudiante_id=estudiante_id,
-                            materia_id=materia_id,
-                            periodo_id=periodo_id,
-                            nota_final=nota_final,
+                    if evaluaciones:
+                        promedio = sum(e.valor for e in evaluaciones) / len(
+                            evaluaciones
                         )
-                        db.add(existente_rendimiento)
-
-                    db.commit()
-
-                    # GENERAR/OBTENER PREDICCIONES ML
-                    prediccion_data = None
-                    try:
-                        # Verificar si ya existe predicción
-                        prediccion_existente = (
-                            db.query(PrediccionRendimiento)
-                            .filter_by(
-                                estudiante_id=estudiante_id,
-                                materia_id=materia_id,
-                                periodo_id=periodo_id,
-                            )
-                            .first()
+                        aporte = (promedio * porcentaje) / 100
+                        nota_final += aporte
+
+                        detalle_evaluaciones.append(
+                            {
+                                "tipo_evaluacion_id": tipo.id,
+                                "tipo_nombre": tipo.nombre,
+                                "promedio": round(promedio, 2),
+                                "peso": porcentaje,
+                                "aporte": round(aporte, 2),
+                                "cantidad_evaluaciones": len(evaluaciones),
+                            }
                         )
 
-                        if not prediccion_existente:
-                            # Generar nueva predicción
-                            service.predecir_estudiante_por_bd(
-                                db, estudiante_id, materia_id, periodo_id
-                            )
-
-                            # Buscar la predicción recién creada
-                            prediccion_existente = (
-                                db.query(PrediccionRendimiento)
-                                .filter_by(
-                                    estudiante_id=estudiante_id,
-                                    materia_id=materia_id,
-                                    periodo_id=periodo_id,
-                                )
-                                .first()
-                            )
-
-                        if prediccion_existente:
-                            prediccion_data = {
-                                "id": prediccion_existente.id,
-                                "promedio_notas": prediccion_existente.promedio_notas,
-                                "porcentaje_asistencia": prediccion_existente.porcentaje_asistencia,
-                                "promedio_participacion": prediccion_existente.promedio_participacion,
-                                "resultado_numerico": prediccion_existente.resultado_numerico,
-                                "clasificacion": prediccion_existente.clasificacion,
-                                "fecha_generada": prediccion_existente.fecha_generada.isoformat(),
-                            }
+            nota_final = round(nota_final, 2)
 
-                    except Exception as e:
-                        logger.warning(
-                            f"Error generando predicción para estudiante {estudiante_id}, "
-                            f"materia {materia_id}, periodo {periodo_id}: {str(e)}"
-                        )
+            # GUARDAR/ACTUALIZAR RENDIMIENTO FINAL
+            existente_rendimiento = rendimientos_por_clave.get(
+                (materia_id, periodo_id)
+            )
 
-                    # Agregar datos del periodo
-                    periodos_data.append(
-                        {
-                            "periodo_id": periodo_id,
-                            "periodo_nombre": periodo.nombre,
-                            "fecha_inicio": periodo.fecha_inicio.isoformat(),
-                            "fecha_fin": periodo.fecha_fin.isoformat(),
-                            "rendimiento": {
-                                "nota_final": nota_final,
-                                "detalle_evaluaciones": detalle_evaluaciones,
-                                "fecha_calculo": (
-                                    existente_rendimiento.fecha_calculo.isoformat()
-                                    if existente_rendimiento.fecha_calculo
-                                    else None
-                                ),
-                            },
-                            "prediccion_ml": prediccion_data,
-                        }
-                    )
+            if existente_rendimiento:
+                existente_rendimiento.nota_final = nota_final
+                existente_rendimiento.fecha_calculo = fecha_calculo_actual
+            else:
+                existente_rendimiento = RendimientoFinal(
+                    estudiante_id=estudiante_id,
+                    materia_id=materia_id,
+                    periodo_id=periodo_id,
+                    nota_final=nota_final,
+                    fecha_calculo=fecha_calculo_actual,
+                )
+                db.add(existente_rendimiento)
+                rendimientos_por_clave[(materia_id, periodo_id)] = (
+                    existente_rendimiento
+                )
 
-                # Calcular estadísticas generales de la materia
-                notas_finales = [
-                    p["rendimiento"]["nota_final"]
-                    for p in periodos_data
-                    if p["rendimiento"]["nota_final"] > 0
-                ]
-                predicciones_numericas = [
-                    p["prediccion_ml"]["resultado_numerico"]
-                    for p in periodos_data
-                    if p["prediccion_ml"] and p["prediccion_ml"]["resultado_numerico"]
-                ]
-
-                estadisticas = {
-                    "promedio_rendimiento": (
-                        round(sum(notas_finales) / len(notas_finales), 2)
-                        if notas_finales
-                        else 0
-                    ),
-                    "promedio_prediccion": (
-                        round(
-                            sum(predicciones_numericas) / len(predicciones_numericas), 2
-                        )
-                        if predicciones_numericas
-                        else 0
-                    ),
-                    "mejor_periodo": max(notas_finales) if notas_finales else 0,
-                    "peor_periodo": min(notas_finales) if notas_finales else 0,
-                    "total_periodos_evaluados": len(notas_finales),
-                }
+            # GENERAR/OBTENER PREDICCIONES ML
+            prediccion_data = None
+            try:
+                # Verificar si ya existe predicción (precargadas en bloque)
+                prediccion_existente = predicciones_por_clave.get(
+                    (materia_id, periodo_id)
+                )
 
-                # Agregar resultado de la materia
-                resultados.append(
-                    {
-                        "materia": {
-                            "id": materia_id,
-                            "nombre": materia.nombre,
-                            "descripcion": materia.descripcion,
-                        },
-                        "docente": docente_info,
-                        "curso_id": curso_id,
-                        "periodos": periodos_data,
-                        "estadisticas": estadisticas,
+                if not prediccion_existente:
+                    # Generación diferida tras la respuesta: la inferencia
+                    # ML sale del camino crítico y el cliente re-consulta
+                    # cuando esté lista
+                    predicciones_pendientes.append((materia_id, periodo_id))
+
+                if prediccion_existente:
+                    prediccion_data = {
+                        "id": prediccion_existente.id,
+                        "promedio_notas": prediccion_existente.promedio_notas,
+                        "porcentaje_asistencia": prediccion_existente.porcentaje_asistencia,
+                        "promedio_participacion": prediccion_existente.promedio_participacion,
+                        "resultado_numerico": prediccion_existente.resultado_numerico,
+                        "clasificacion": prediccion_existente.clasificacion,
+                        "fecha_generada": prediccion_existente.fecha_generada,
                     }
+
+            except Exception as e:
+                logger.warning(
+                    f"Error generando predicción para estudiante {estudiante_id}, "
+                    f"materia {materia_id}, periodo {periodo_id}: {str(e)}"
                 )
 
-        # 8. ESTADÍSTICAS GENERALES DEL ESTUDIANTE
-        todas_las_notas = []
-        todas_las_predicciones = []
-
-        for resultado in resultados:
-            for periodo in resultado["periodos"]:
-                if periodo["rendimiento"]["nota_final"] > 0:
-                    todas_las_notas.append(periodo["rendimiento"]["nota_final"])
-                if (
-                    periodo["prediccion_ml"]
-                    and periodo["prediccion_ml"]["resultado_numerico"]
-                ):
-                    todas_las_predicciones.append(
-                        periodo["prediccion_ml"]["resultado_numerico"]
-                    )
+            if prediccion_data:
+                predicciones_generadas += 1
+
+            # Agregar datos del periodo
+            periodos_data.append(
+                {
+                    "periodo_id": periodo_id,
+                    "periodo_nombre": periodo.nombre,
+                    "fecha_inicio": periodo.fecha_inicio,
+                    "fecha_fin": periodo.fecha_fin,
+                    "rendimiento": {
+                        "nota_final": nota_final,
+                        "detalle_evaluaciones": detalle_evaluaciones,
+                        "fecha_calculo": existente_rendimiento.fecha_calculo,
+                    },
+                    "prediccion_ml": prediccion_data,
+                }
+            )
 
-        estadisticas_generales = {
-            "promedio_general": (
-                round(sum(todas_las_notas) / len(todas_las_notas), 2)
-                if todas_las_notas
-                else 0
+        # Calcular estadísticas de la materia (reducciones NumPy en
+        # una pasada en vez de sum/max/min por separado)
+        arr_notas = np.asarray(
+            [
+                p["rendimiento"]["nota_final"]
+                for p in periodos_data
+                if p["rendimiento"]["nota_final"] > 0
+            ],
+            dtype=np.float32,
+        )
+        arr_predicciones = np.asarray(
+            [
+                p["prediccion_ml"]["resultado_numerico"]
+                for p in periodos_data
+                if p["prediccion_ml"]
+                and p["prediccion_ml"]["resultado_numerico"]
+            ],
+            dtype=np.float32,
+        )
+        estadisticas = {
+            "promedio_rendimiento": (
+                round(float(arr_notas.mean()), 2) if arr_notas.size else 0
             ),
-            "promedio_predicciones": (
-                round(sum(todas_las_predicciones) / len(todas_las_predicciones), 2)
-                if todas_las_predicciones
+            "promedio_prediccion": (
+                round(float(arr_predicciones.mean()), 2)
+                if arr_predicciones.size
                 else 0
             ),
-            "total_materias": len(resultados),
-            "total_evaluaciones": len(todas_las_notas),
-            "mejor_materia": (
-                max(
-                    resultados, key=lambda x: x["estadisticas"]["promedio_rendimiento"]
-                )["materia"]["nombre"]
-                if resultados
-                else None
+            "mejor_periodo": (
+                round(float(arr_notas.max()), 2) if arr_notas.size else 0
             ),
+            "peor_periodo": (
+                round(float(arr_notas.min()), 2) if arr_notas.size else 0
+            ),
+            "total_periodos_evaluados": int(arr_notas.size),
         }
 
-        # Mensaje personalizado según el usuario
-        mensajes_por_tipo = {
-            "estudiante": "Tu información académica completa ha sido obtenida exitosamente",
-            "padre": f"Información académica de tu hijo/a {estudiante.nombre} {estudiante.apellido} obtenida exitosamente",
-            "docente": f"Información académica del estudiante {estudiante.nombre} {estudiante.apellido} en tus materias",
-            "admin": f"Información académica completa del estudiante {estudiante.nombre} {estudiante.apellido}",
+        # Resultado de la materia
+        resultado_materia = {
+            "materia": {
+                "id": materia_id,
+                "nombre": materia.nombre,
+                "descripcion": materia.descripcion,
+            },
+            "docente": docente_info,
+            "curso_id": curso_id,
+            "periodos": periodos_data,
+            "estadisticas": estadisticas,
         }
 
-        mensaje_personalizado = mensajes_por_tipo.get(
-            user_type,
-            f"Información académica obtenida para gestión {gestion_activa.anio}",
+        return resultado_materia, arr_notas, arr_predicciones, predicciones_generadas
+
+
+    pares = []
+    for curso_id in curso_ids:
+        for materia_id in materias_por_curso.get(curso_id, []):
+            # Filtrar materias para docentes
+            if (
+                materia_ids_permitidas is not None
+                and materia_id not in materia_ids_permitidas
+            ):
+                continue
+            if materia_id not in materias_por_id:
+                continue
+            pares.append((curso_id, materia_id))
+
+    # Sin I/O por materia no hay nada que paralelizar: se itera directo
+    # (un gather aquí solo agregaría el overhead de crear corrutinas)
+    procesados = [
+        _procesar_materia(curso_id, materia_id) for curso_id, materia_id in pares
+    ]
+    total_predicciones_generadas = 0
+    for resultado_materia, arr_notas, arr_predicciones, generadas in procesados:
+        resultados.append(resultado_materia)
+        arrays_notas.append(arr_notas)
+        arrays_predicciones.append(arr_predicciones)
+        total_predicciones_generadas += generadas
+
+    # Todas las celdas faltantes en un solo job batch (una pasada del
+    # modelo sobre la matriz completa) en lugar de un task por celda
+    if predicciones_pendientes:
+        # Fallar acá y no en el background task: sin modelos cargados el
+        # job moriría en silencio y las celdas quedarían sin predicción
+        if not service.models_loaded:
+            raise PrediccionError(
+                "Modelos ML no cargados: no se pueden generar las "
+                f"{len(predicciones_pendientes)} predicciones faltantes"
+            )
+        background_tasks.add_task(
+            _generar_predicciones_batch, list(predicciones_pendientes)
         )
 
-        # Preparar la respuesta básica
-        respuesta = {
-            "success": True,
-            "mensaje": mensaje_personalizado,
-            "gestion": {
-                "id": gestion_activa.id,
-                "anio": gestion_activa.anio,
-                "descripcion": gestion_activa.descripcion,
-            },
-            "estudiante": {
-                "id": estudiante_id,
-                "nombre": estudiante.nombre,
-                "apellido": estudiante.apellido,
-                "correo": estudiante.correo,
-                "codigo": f"EST{estudiante_id:03d}",
-            },
-            "usuario_consultante": {
-                "id": user_id,
-                "tipo": user_type,
-                "permisos": {
-                    "puede_ver_todas_materias": user_type
-                    in ["admin", "estudiante", "padre"],
-                    "materias_limitadas": (
-                        materia_ids_permitidas if user_type == "docente" else None
-                    ),
-                },
-            },
-            "estadisticas_generales": estadisticas_generales,
-            "materias": resultados,
-            "metadatos": {
-                "fecha_consulta": hoy.isoformat(),
-                "total_periodos": len(periodos),
-                "predicciones_generadas": sum(
-                    1
-                    for resultado in resultados
-                    for periodo in resultado["periodos"]
-                    if periodo["prediccion_ml"]
+    # Un solo commit para todos los rendimientos upserteados en los loops
+    await db.commit()
+
+    # 8. ESTADÍSTICAS GENERALES DEL ESTUDIANTE
+    # Concatenar los arrays por materia evita re-recorrer los dicts
+    todas_las_notas = (
+        np.concatenate(arrays_notas)
+        if arrays_notas
+        else np.empty(0, dtype=np.float32)
+    )
+    todas_las_predicciones = (
+        np.concatenate(arrays_predicciones)
+        if arrays_predicciones
+        else np.empty(0, dtype=np.float32)
+    )
+
+    estadisticas_generales = {
+        "promedio_general": (
+            round(float(todas_las_notas.mean()), 2) if todas_las_notas.size else 0
+        ),
+        "promedio_predicciones": (
+            round(float(todas_las_predicciones.mean()), 2)
+            if todas_las_predicciones.size
+            else 0
+        ),
+        "total_materias": len(resultados),
+        "total_evaluaciones": int(todas_las_notas.size),
+        "mejor_materia": (
+            max(
+                resultados, key=lambda x: x["estadisticas"]["promedio_rendimiento"]
+            )["materia"]["nombre"]
+            if resultados
+            else None
+        ),
+    }
+
+    # Mensaje personalizado según el usuario
+    mensajes_por_tipo = {
+        "estudiante": "Tu información académica completa ha sido obtenida exitosamente",
+        "padre": f"Información académica de tu hijo/a {estudiante.nombre} {estudiante.apellido} obtenida exitosamente",
+        "docente": f"Información académica del estudiante {estudiante.nombre} {estudiante.apellido} en tus materias",
+        "admin": f"Información académica completa del estudiante {estudiante.nombre} {estudiante.apellido}",
+    }
+
+    mensaje_personalizado = mensajes_por_tipo.get(
+        user_type,
+        f"Información académica obtenida para gestión {gestion_activa.anio}",
+    )
+
+    # Preparar la respuesta básica
+    respuesta = {
+        "success": True,
+        "mensaje": mensaje_personalizado,
+        "gestion": {
+            "id": gestion_activa.id,
+            "anio": gestion_activa.anio,
+            "descripcion": gestion_activa.descripcion,
+        },
+        "estudiante": {
+            "id": estudiante_id,
+            "nombre": estudiante.nombre,
+            "apellido": estudiante.apellido,
+            "correo": estudiante.correo,
+            "codigo": f"EST{estudiante_id:03d}",
+        },
+        "usuario_consultante": {
+            "id": user_id,
+            "tipo": user_type,
+            "permisos": {
+                "puede_ver_todas_materias": user_type
+                in ["admin", "estudiante", "padre"],
+                "materias_limitadas": (
+                    materia_ids_permitidas if user_type == "docente" else None
                 ),
-                "materias_filtradas_por_permisos": materia_ids_permitidas is not None,
             },
-        }
+        },
+        "estadisticas_generales": estadisticas_generales,
+        "materias": resultados,
+        "metadatos": {
+            "fecha_consulta": hoy,
+            "total_periodos": len(periodos),
+            # Acumulado mientras se procesan las materias, sin re-recorrer
+            # los resultados materializados
+            "predicciones_generadas": total_predicciones_generadas,
+            "predicciones_pendientes": len(predicciones_pendientes),
+            "materias_filtradas_por_permisos": materia_ids_permitidas is not None,
+        },
+    }
+
+    # 🆕 ENVÍO POR CORREO ELECTRÓNICO
+    if enviar_por_correo:
+        email_info = {"enviado": False, "mensaje": "", "destinatario": ""}
+
+        try:
+            # Obtener correo del usuario consultante
+            correo_destinatario = None
+            nombre_destinatario = ""
 
-        # 🆕 ENVÍO POR CORREO ELECTRÓNICO
-        if enviar_por_correo:
-            email_info = {"enviado": False, "mensaje": "", "destinatario": ""}
+            if user_type == "estudiante":
+                correo_destinatario = estudiante.correo
+                nombre_destinatario = f"{estudiante.nombre} {estudiante.apellido}"
 
-            try:
-                # Obtener correo del usuario consultante
-                correo_destinatario = None
-                nombre_destinatario = ""
+            elif user_type == "padre":
+                from app.models import Padre
 
-                if user_type == "estudiante":
-                    correo_destinatario = estudiante.correo
-                    nombre_destinatario = f"{estudiante.nombre} {estudiante.apellido}"
+                padre = await db.get(Padre, user_id)
+                if padre:
+                    correo_destinatario = padre.correo
+                    nombre_destinatario = f"{padre.nombre} {padre.apellido}"
 
-                elif user_type == "padre":
-                    from app.models import Padre
-
-                    padre = db.query(Padre).filter_by(id=user_id).first()
-                    if padre:
-                        correo_destinatario = padre.correo
-                        nombre_destinatario = f"{padre.nombre} {padre.apellido}"
-
-                elif user_type == "docente" or user_type == "admin":
-                    from app.models import Docente
-
-                    docente = db.query(Docente).filter_by(id=user_id).first()
-                    if docente:
-                        correo_destinatario = docente.correo
-                        nombre_destinatario = f"{docente.nombre} {docente.apellido}"
-
-                if correo_destinatario:
-                    # Enviar el reporte por correo
-                    email_service = EmailService()
-                    envio_exitoso = email_service.enviar_reporte_academico(
-                        destinatario=correo_destinatario,
-                        nombre_destinatario=nombre_destinatario,
-                        datos_reporte=respuesta,
-                        tipo_usuario=user_type,
-                    )
+            elif user_type == "docente" or user_type == "admin":
+                docente = await db.get(Docente, user_id)
+                if docente:
+                    correo_destinatario = docente.correo
+                    nombre_destinatario = f"{docente.nombre} {docente.apellido}"
 
-                    if envio_exitoso:
-                        email_info = {
-                            "enviado": True,
-                            "mensaje": f"Reporte enviado exitosamente a {correo_destinatario}",
-                            "destinatario": correo_destinatario,
-                        }
-                        logger.info(
-                            f"Reporte académico enviado por correo a {correo_destinatario}"
-                        )
-                    else:
-                        email_info = {
-                            "enviado": False,
-                            "mensaje": "Error al enviar el correo. Verifique la configuración SMTP.",
-                            "destinatario": correo_destinatario,
-                        }
+            if correo_destinatario:
+                # Enviar el reporte por correo (SMTP bloqueante → threadpool)
+                email_service = EmailService()
+                envio_exitoso = await run_in_threadpool(
+                    email_service.enviar_reporte_academico,
+                    destinatario=correo_destinatario,
+                    nombre_destinatario=nombre_destinatario,
+                    datos_reporte=respuesta,
+                    tipo_usuario=user_type,
+                )
+
+                if envio_exitoso:
+                    email_info = {
+                        "enviado": True,
+                        "mensaje": f"Reporte enviado exitosamente a {correo_destinatario}",
+                        "destinatario": correo_destinatario,
+                    }
+                    logger.info(
+                        f"Reporte académico enviado por correo a {correo_destinatario}"
+                    )
                 else:
                     email_info = {
                         "enviado": False,
-                        "mensaje": "No se encontró correo electrónico del usuario",
-                        "destinatario": "",
+                        "mensaje": "Error al enviar el correo. Verifique la configuración SMTP.",
+                        "destinatario": correo_destinatario,
                     }
-
-            except Exception as e:
-                logger.error(f"Error enviando reporte por correo: {str(e)}")
+            else:
                 email_info = {
                     "enviado": False,
-                    "mensaje": f"Error interno al enviar correo: {str(e)}",
-                    "destinatario": correo_destinatario or "",
+                    "mensaje": "No se encontró correo electrónico del usuario",
+                    "destinatario": "",
                 }
 
-            # Agregar información del envío por correo a la respuesta
-            respuesta["envio_correo"] = email_info
+        except Exception as e:
+            logger.error(f"Error enviando reporte por correo: {str(e)}")
+            email_info = {
+                "enviado": False,
+                "mensaje": f"Error interno al enviar correo: {str(e)}",
+                "destinatario": correo_destinatario or "",
+            }
+
+        # Agregar información del envío por correo a la respuesta
+        respuesta["envio_correo"] = email_info
+
+    # Proyección del payload: el cliente puede pedir solo el encabezado
+    # y ahorrarse la serialización/transferencia del detalle. El cálculo
+    # sí se ejecuta siempre porque persiste los rendimientos.
+    incluidas = (
+        {seccion.strip() for seccion in include.split(",") if seccion.strip()}
+        if include
+        else {"materias", "estadisticas"}
+    )
+    if "materias" not in incluidas:
+        respuesta.pop("materias", None)
+    if "estadisticas" not in incluidas:
+        respuesta.pop("estadisticas_generales", None)
+
+    return respuesta
+
+
+@router.get("/estudiante-completo")
+async def obtener_rendimientos_y_predicciones_completos(
+    background_tasks: BackgroundTasks,
+    estudiante_id: int = Query(..., description="ID del estudiante"),
+    enviar_por_correo: bool = Query(
+        False, description="Enviar reporte por correo electrónico"
+    ),
+    include: str = Query(
+        None,
+        description="Secciones a incluir separadas por coma (materias,estadisticas); por defecto todas",
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    payload: dict = Depends(usuario_autenticado),
+):
+    """
+    🎯 Obtener rendimientos académicos y predicciones ML completos de un estudiante
 
-        return respuesta
+    **Acceso por roles:**
+    - 🎓 **Estudiante**: Solo puede ver sus propios datos
+    - 👨‍👩‍👧‍👦 **Padre**: Puede ver datos de sus hijos registrados
+    - 👨‍🏫 **Docente**: Puede ver datos de estudiantes en sus materias
+    - 🔧 **Admin**: Puede ver datos de cualquier estudiante
+
+    **Ejemplos de uso:**
+    ```
+    # Estudiante consultando sus datos
+    GET /info-academica/estudiante-completo?estudiante_id=123
+    Authorization: Bearer [token_estudiante_123]
+
+    # Padre consultando datos de su hijo
+    GET /info-academica/estudiante-completo?estudiante_id=456
+    Authorization: Bearer [token_padre_789]
+
+    # Docente consultando estudiante en sus materias
+    GET /info-academica/estudiante-completo?estudiante_id=456
+    Authorization: Bearer [token_docente_101]
+
+    # Admin consultando cualquier estudiante
+    GET /info-academica/estudiante-completo?estudiante_id=456
+    Authorization: Bearer [token_admin_202]
+    ```
+
+    **Parámetros de consulta:**
+    - `estudiante_id`: ID del estudiante (requerido)
+    - `enviar_por_correo`: Enviar reporte por email (opcional, default: False)
+
+    **Funcionalidades:**
+    - Detecta automáticamente la gestión activa actual
+    - Calcula rendimientos finales por materia y periodo
+    - Genera predicciones ML automáticamente si no existen
+    - Incluye información completa de materias y docentes
+    - **NUEVO**: Envía el reporte completo por correo electrónico
+    - Un solo endpoint para toda la información académica
+
+    **Respuesta incluye:**
+    - Rendimientos calculados por tipo de evaluación
+    - Predicciones de Machine Learning
+    - Información del docente asignado
+    - Datos de la materia y periodos
+    - Estadísticas y recomendaciones
+    - Estado del envío por correo (si se solicitó)
+    """
+    try:
+        respuesta = await _construir_reporte_completo(
+            background_tasks=background_tasks,
+            estudiante_id=estudiante_id,
+            enviar_por_correo=enviar_por_correo,
+            include=include,
+            db=db,
+            payload=payload,
+        )
+
+        # Respuesta en streaming: el payload puede ser grande (todas las
+        # materias con sus periodos) y así no se duplica en un solo buffer
+        return StreamingResponse(
+            _stream_respuesta_completa(respuesta), media_type="application/json"
+        )
 
     except HTTPException:
         raise
     except PermissionError as e:
-        logger.error(f"Error de permisos para usuario {user_id}: {str(e)}")
+        logger.error(
+            f"Error de permisos consultando estudiante {estudiante_id}: {str(e)}"
+        )
         raise HTTPException(
             status_code=403, detail="No tienes permisos para acceder a esta información"
         )
-    except Exception as e:
-        logger.error(
-            f"Error en obtener_rendimientos_y_predicciones_completos: {str(e)}"
+    except GestionError as e:
+        logger.error(f"Error de gestión académica: {str(e)}")
+        raise HTTPException(
+            status_code=404, detail="Error relacionado con gestión académica"
         )
-
-        # Errores más específicos para mejor debugging
-        if "gestión" in str(e).lower():
-            raise HTTPException(
-                status_code=404, detail="Error relacionado con gestión académica"
-            )
-        elif "predicción" in str(e).lower():
-            raise HTTPException(
-                status_code=500, detail="Error en el sistema de predicciones ML"
-            )
-        else:
-            raise HTTPException(
-                status_code=500, detail=f"Error interno del servidor: {str(e)}"
-            )
+    except PrediccionError as e:
+        logger.error(f"Error del sistema de predicciones: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail="Error en el sistema de predicciones ML"
+        )
+    except Exception:
+        logger.exception("Error en obtener_rendimientos_y_predicciones_completos")
+        raise HTTPException(status_code=500, detail="Error interno del servidor")
 
 
 @router.post("/enviar-reporte-por-correo")
-def enviar_reporte_academico_por_correo(
+async def enviar_reporte_academico_por_correo(
+    background_tasks: BackgroundTasks,
     estudiante_id: int = Query(..., description="ID del estudiante"),
     correo_personalizado: str = Query(
         None, description="Correo alternativo (opcional)"
     ),
     incluir_predicciones: bool = Query(True, description="Incluir predicciones ML"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(usuario_autenticado),
 ):
     """
@@ -700,9 +892,11 @@ def enviar_reporte_academico_por_correo(
     """
     try:
         # Obtener el reporte completo (reutilizar la lógica existente)
-        reporte_response = obtener_rendimientos_y_predicciones_completos(
+        reporte_response = await _construir_reporte_completo(
+            background_tasks=background_tasks,
             estudiante_id=estudiante_id,
             enviar_por_correo=False,  # No enviar automáticamente
+            include=None,
             db=db,
             payload=payload,
         )
@@ -727,7 +921,7 @@ def enviar_reporte_academico_por_correo(
             if user_type == "estudiante":
                 from app.models import Estudiante
 
-                estudiante = db.query(Estudiante).filter_by(id=user_id).first()
+                estudiante = await db.get(Estudiante, user_id)
                 if estudiante:
                     correo_destinatario = estudiante.correo
                     nombre_destinatario = f"{estudiante.nombre} {estudiante.apellido}"
@@ -735,7 +929,7 @@ def enviar_reporte_academico_por_correo(
             elif user_type == "padre":
                 from app.models import Padre
 
-                padre = db.query(Padre).filter_by(id=user_id).first()
+                padre = await db.get(Padre, user_id)
                 if padre:
                     correo_destinatario = padre.correo
                     nombre_destinatario = f"{padre.nombre} {padre.apellido}"
@@ -743,7 +937,7 @@ def enviar_reporte_academico_por_correo(
             elif user_type in ["docente", "admin"]:
                 from app.models import Docente
 
-                docente = db.query(Docente).filter_by(id=user_id).first()
+                docente = await db.get(Docente, user_id)
                 if docente:
                     correo_destinatario = docente.correo
                     nombre_destinatario = f"{docente.nombre} {docente.apellido}"
@@ -764,7 +958,8 @@ def enviar_reporte_academico_por_correo(
         from app.services.email_service import EmailService
 
         email_service = EmailService()
-        envio_exitoso = email_service.enviar_reporte_academico(
+        envio_exitoso = await run_in_threadpool(
+            email_service.enviar_reporte_academico,
             destinatario=correo_destinatario,
             nombre_destinatario=nombre_destinatario,
             datos_reporte=reporte_response,
@@ -790,6 +985,16 @@ def enviar_reporte_academico_por_correo(
 
     except HTTPException:
         raise
+    except GestionError as e:
+        logger.error(f"Error de gestión académica: {str(e)}")
+        raise HTTPException(
+            status_code=404, detail="Error relacionado con gestión académica"
+        )
+    except PrediccionError as e:
+        logger.error(f"Error del sistema de predicciones: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail="Error en el sistema de predicciones ML"
+        )
     except Exception as e:
         logger.error(f"Error enviando reporte por correo: {str(e)}")
         raise HTTPException(
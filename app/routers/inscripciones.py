@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.deps import get_db
 from app.schemas.inscripcion import (
     InscripcionCreate,
     InscripcionUpdate,
@@ -13,14 +13,6 @@ from app.auth.roles import admin_required
 router = APIRouter(prefix="/inscripciones", tags=["Inscripciones"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/", response_model=InscripcionOut)
 def crear(
     datos: InscripcionCreate,
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.deps import get_db
 from app.schemas.materia import MateriaCreate, MateriaUpdate, MateriaOut
 from app.crud import materia as crud
 from app.auth.roles import admin_required, docente_o_admin_required
@@ -8,14 +8,6 @@ from app.auth.roles import admin_required, docente_o_admin_required
 router = APIRouter(prefix="/materias", tags=["Materias"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 def validar_campo(nombre: str, valor: str):
     if not valor or valor.strip() == "":
         raise HTTPException(
@@ -8,7 +8,7 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel, validator
-from app.database import SessionLocal
+from app.deps import get_db
 from app.auth.roles import docente_o_admin_required, usuario_autenticado
 import logging
 
@@ -48,14 +48,6 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/ml", tags=["Machine Learning - Predicción de Rendimiento"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # ================ MODELOS PYDANTIC ================
 
 
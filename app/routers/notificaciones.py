@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.deps import get_db
 from app.auth.roles import (
     usuario_autenticado,
     admin_required,
@@ -26,14 +26,6 @@ router = APIRouter(
 )
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # ========== ENDPOINTS UNIFICADOS PARA PADRES Y ESTUDIANTES ==========
 
 
@@ -389,8 +381,11 @@ def notificar_evaluacion_sistema_dual(
 ):
     """👨‍🏫 Notificar evaluación con sistema dual: SIEMPRE al estudiante, solo a padres si está debajo del umbral"""
     try:
+        evaluacion = NotificationService.cargar_evaluacion_para_notificar(
+            db, evaluacion_id
+        )
         resultado = NotificationService.notificar_evaluacion_completa(
-            db, evaluacion_id, umbral_padres
+            db, evaluacion, umbral_padres
         )
 
         if "error" in resultado:
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.deps import get_db
 from app.schemas.padre import PadreCreate, PadreOut, PadreUpdate, PadreConHijos
 from app.schemas.estudiante import EstudianteOut
 from app.schemas.sesion_asistencia import AsistenciaEstudianteOut
+from pydantic import TypeAdapter
 from app.crud import padre as crud
 from app.crud import sesion_asistencia as asistencia_crud
 from app.auth.roles import admin_required, usuario_autenticado, propietario_o_admin
@@ -17,13 +18,9 @@ from app.schemas.estudiante_info_academica import (
 
 router = APIRouter(prefix="/padres", tags=["👨‍👩‍👧‍👦 Padres"])
 
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# TypeAdapter compartido: valida la lista completa en una sola llamada
+# de pydantic-core en vez de un from_orm por fila
+_ASISTENCIAS_TA = TypeAdapter(List[AsistenciaEstudianteOut])
 
 
 # ========== RUTAS ESPECÍFICAS (DEBEN IR PRIMERO) ==========
@@ -198,9 +195,9 @@ def obtener_asistencias_todos_hijos(
                     "apellido": hijo.apellido,
                     "codigo": f"EST{hijo.id:03d}",
                 },
-                "asistencias": [
-                    AsistenciaEstudianteOut.from_orm(a) for a in asistencias
-                ],
+                "asistencias": _ASISTENCIAS_TA.validate_python(
+                    asistencias, from_attributes=True
+                ),
                 "total_asistencias": len(asistencias),
             }
         )
@@ -348,7 +345,7 @@ def obtener_asistencias_de_hijo(
         db, estudiante_id, curso_id, materia_id
     )
 
-    return [AsistenciaEstudianteOut.from_orm(a) for a in asistencias]
+    return _ASISTENCIAS_TA.validate_python(asistencias, from_attributes=True)
 
 
 @router.get("/hijo/{estudiante_id}/resumen-asistencia-por-materia", response_model=dict)
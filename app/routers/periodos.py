@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.deps import get_db
 from app.schemas.periodo import PeriodoCreate, PeriodoUpdate, PeriodoOut
 from app.crud import periodo as crud
 from app.auth.roles import admin_required, docente_o_admin_required
@@ -8,14 +8,6 @@ from app.auth.roles import admin_required, docente_o_admin_required
 router = APIRouter(prefix="/periodos", tags=["Periodos"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/", response_model=PeriodoOut)
 def crear(
     datos: PeriodoCreate,
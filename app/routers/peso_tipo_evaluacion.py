@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.deps import get_db
 from app.schemas.peso_tipo_evaluacion import (
     PesoTipoEvaluacionCreate,
     PesoTipoEvaluacionUpdate,
@@ -12,14 +12,6 @@ from app.auth.roles import docente_o_admin_required
 router = APIRouter(prefix="/pesos-evaluacion", tags=["PesoTipoEvaluacion"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/", response_model=PesoTipoEvaluacionOut)
 def crear(
     datos: PesoTipoEvaluacionCreate,
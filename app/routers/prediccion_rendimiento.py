@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.deps import get_db
 from app.schemas.prediccion_rendimiento import (
     PrediccionRendimientoCreate,
     PrediccionRendimientoOut,
@@ -10,14 +10,6 @@ from app.crud import prediccion_rendimiento as crud
 router = APIRouter(prefix="/predicciones", tags=["Predicción de Rendimiento"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/", response_model=PrediccionRendimientoOut)
 def crear_prediccion(
     payload: PrediccionRendimientoCreate, db: Session = Depends(get_db)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import func
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.deps import get_db
 from app.models.evaluacion import Evaluacion
 from app.models.peso_tipo_evaluacion import PesoTipoEvaluacion
 from app.models.tipo_evaluacion import TipoEvaluacion
@@ -12,14 +12,6 @@ from app.crud import rendimiento_final as crud
 router = APIRouter(prefix="/rendimientos", tags=["Rendimiento Final"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/", response_model=RendimientoFinalOut)
 def crear_rendimiento(
     datos: RendimientoFinalCreate,
@@ -2,7 +2,7 @@ from datetime import date
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, func
-from app.database import SessionLocal
+from app.deps import get_db
 from app.auth.roles import docente_o_admin_required, admin_required
 from app.models import Evaluacion, RendimientoFinal, Inscripcion, Periodo
 from app.models.curso import Curso
@@ -17,14 +17,6 @@ from app.models.tipo_evaluacion import TipoEvaluacion
 router = APIRouter(prefix="/resumen", tags=["Resumen Dashboard"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.get("/materia/completo")
 def resumen_materia_completo(
     curso_id: int,
@@ -1,8 +1,8 @@
 from operator import and_
 from app.models.sesion_asistencia import AsistenciaEstudiante
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from sqlalchemy.orm import Session, undefer
+from app.deps import get_db
 from app.schemas.sesion_asistencia import (
     SesionAsistenciaCreate,
     SesionAsistenciaEstudianteOut,
@@ -28,16 +28,14 @@ from app.auth.roles import (
 )
 from typing import List, Optional
 from datetime import datetime
+from pydantic import TypeAdapter
 
 router = APIRouter(prefix="/asistencia", tags=["📍 Asistencia por Geolocalización"])
 
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# TypeAdapters compartidos: validan la lista completa en una sola llamada
+# de pydantic-core en vez de un from_orm por fila
+_SESIONES_TA = TypeAdapter(List[SesionAsistenciaOut])
+_ASISTENCIAS_TA = TypeAdapter(List[AsistenciaEstudianteOut])
 
 
 def obtener_docente_id(payload: dict) -> int:
@@ -144,7 +142,7 @@ def listar_mis_sesiones(
             db, docente_id, estado, curso_id, materia_id, limite
         )
 
-        sesiones_out = [SesionAsistenciaOut.from_orm(s) for s in sesiones]
+        sesiones_out = _SESIONES_TA.validate_python(sesiones, from_attributes=True)
 
         # Contar por estado
         activas = len([s for s in sesiones if s.estado == "activa"])
@@ -407,6 +405,10 @@ def obtener_mis_sesiones_activas(
 
             mi_asistencia = (
                 db.query(AsistenciaEstudiante)
+                .options(
+                    undefer(AsistenciaEstudiante.observaciones),
+                    undefer(AsistenciaEstudiante.motivo_justificacion),
+                )
                 .filter(
                     and_(
                         AsistenciaEstudiante.sesion_id == sesion.id,
@@ -620,7 +622,7 @@ def obtener_mis_asistencias(
             db, estudiante_id, curso_id, materia_id
         )
 
-        return [AsistenciaEstudianteOut.from_orm(a) for a in asistencias]
+        return _ASISTENCIAS_TA.validate_python(asistencias, from_attributes=True)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
@@ -652,7 +654,10 @@ def listar_todas_las_sesiones(
         # Implementar lógica para obtener todas las sesiones con filtros
         # (Esta función debería agregarse al CRUD)
 
-        query = db.query(crud.SesionAsistencia)
+        query = db.query(crud.SesionAsistencia).options(
+            undefer(crud.SesionAsistencia.descripcion),
+            undefer(crud.SesionAsistencia.direccion_referencia),
+        )
 
         if estado:
             query = query.filter(crud.SesionAsistencia.estado == estado)
@@ -669,7 +674,7 @@ def listar_todas_las_sesiones(
             .all()
         )
 
-        return [SesionAsistenciaOut.from_orm(s) for s in sesiones]
+        return _SESIONES_TA.validate_python(sesiones, from_attributes=True)
 
     except HTTPException:
         raise
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.deps import get_db
 from app.schemas.tipo_evaluacion import (
     TipoEvaluacionCreate,
     TipoEvaluacionUpdate,
@@ -12,14 +12,6 @@ from app.auth.roles import admin_required, docente_o_admin_required
 router = APIRouter(prefix="/tipo-evaluacion", tags=["TipoEvaluacion"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/", response_model=TipoEvaluacionOut)
 def crear(
     datos: TipoEvaluacionCreate,
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 
 class CursoBase(BaseModel):
@@ -7,6 +7,19 @@ class CursoBase(BaseModel):
     paralelo: str
     turno: str
 
+    class Config:
+        # Pydantic (núcleo en Rust) recorta espacios al parsear, sin
+        # strips/validaciones extra por campo en el router
+        str_strip_whitespace = True
+
+    @field_validator("nombre", "nivel", "paralelo", "turno")
+    @classmethod
+    def campo_no_vacio(cls, valor: str, info):
+        if not valor:
+            raise ValueError(f"El campo '{info.field_name}' no puede estar vacío")
+        return valor
+
+
 class CursoCreate(CursoBase):
     pass
 
@@ -1,6 +1,11 @@
-from pydantic import BaseModel, EmailStr
+from fastapi import Form, HTTPException
+from pydantic import BaseModel, EmailStr, StringConstraints, ValidationError
 from datetime import date
-from typing import Optional
+from typing import Annotated, Optional
+
+# Campo de texto obligatorio: recorta espacios y rechaza vacíos en
+# pydantic-core, sin chequeos manuales en el router
+CampoTexto = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
 
 
 class EstudianteBase(BaseModel):
@@ -49,3 +54,58 @@ class EstudianteUpdate(BaseModel):
 class EstudianteLogin(BaseModel):
     correo: EmailStr
     contrasena: str
+
+
+class EstudiantesBulkIn(BaseModel):
+    """Lote de IDs para consultar varios estudiantes en una sola llamada"""
+
+    ids: list[int]
+
+
+class EstudianteFormIn(BaseModel):
+    """Formulario multipart de alta/edición de estudiante.
+
+    La validación de campos vacíos y el parseo de la fecha corren en
+    pydantic-core en lugar de validar_campo + fromisoformat a mano.
+    """
+
+    nombre: CampoTexto
+    apellido: CampoTexto
+    fecha_nacimiento: date
+    genero: CampoTexto
+    nombre_tutor: CampoTexto
+    telefono_tutor: CampoTexto
+    direccion_casa: CampoTexto
+    correo: Optional[EmailStr] = None
+    contrasena: Optional[str] = None
+
+    @classmethod
+    def as_form(
+        cls,
+        nombre: str = Form(...),
+        apellido: str = Form(...),
+        fecha_nacimiento: date = Form(...),
+        genero: str = Form(...),
+        nombre_tutor: str = Form(...),
+        telefono_tutor: str = Form(...),
+        direccion_casa: str = Form(...),
+        correo: str = Form(None),
+        contrasena: str = Form(None),
+    ) -> "EstudianteFormIn":
+        try:
+            return cls(
+                nombre=nombre,
+                apellido=apellido,
+                fecha_nacimiento=fecha_nacimiento,
+                genero=genero,
+                nombre_tutor=nombre_tutor,
+                telefono_tutor=telefono_tutor,
+                direccion_casa=direccion_casa,
+                correo=correo if correo else None,
+                contrasena=contrasena if contrasena else None,
+            )
+        except ValidationError as e:
+            campos = ", ".join(str(err["loc"][0]) for err in e.errors())
+            raise HTTPException(
+                status_code=400, detail=f"Campos inválidos o vacíos: {campos}"
+            )
@@ -1,10 +1,22 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 
 class GestionBase(BaseModel):
     anio: str
     descripcion: str
 
+    class Config:
+        # Pydantic (núcleo en Rust) recorta espacios al parsear, sin
+        # strips/validaciones extra por campo en el router
+        str_strip_whitespace = True
+
+    @field_validator("anio", "descripcion")
+    @classmethod
+    def campo_no_vacio(cls, valor: str, info):
+        if not valor:
+            raise ValueError(f"El campo '{info.field_name}' no puede estar vacío")
+        return valor
+
 
 class GestionCreate(GestionBase):
     pass
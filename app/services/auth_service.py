@@ -1,4 +1,6 @@
+from sqlalchemy import literal, select, union_all
 from sqlalchemy.orm import Session
+from cachetools import TTLCache
 from app.models.docente import Docente
 from app.models.estudiante import Estudiante
 from app.models.padre import Padre
@@ -8,6 +10,44 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Cache corto correo -> tipo detectado, para que reintentos de login y
+# llamadas de perfil no repitan la búsqueda UNION sobre las tres tablas
+_tipo_usuario_cache: TTLCache = TTLCache(maxsize=2048, ttl=60)
+
+# Tabla de despacho dominio -> tipo de usuario, construida una sola vez:
+# lookup O(1) por login en lugar de una cadena de endswith()
+DOMAIN_TO_TYPE = {
+    "colegio.edu.bo": "docente",
+    "sistema.edu": "docente",
+    "admin.edu": "docente",
+    "docente.edu": "docente",
+    "estudiante.edu.bo": "estudiante",
+    "student.edu": "estudiante",
+    "alumno.edu": "estudiante",
+    "padre.com": "padre",
+    "madre.com": "padre",
+    "family.com": "padre",
+    "padres.edu": "padre",
+}
+
+
+def _consulta_tipo_por_correo(correo: str):
+    """UNION ALL sobre las tres tablas de usuarios restringido por correo.
+
+    Un solo round-trip (cada rama usa el índice único de correo) en lugar
+    de hasta tres SELECTs secuenciales; la forma de la sentencia es
+    estable, así que el cache de compilación de SQLAlchemy la reutiliza.
+    """
+    return union_all(
+        select(Docente.id, literal("docente").label("tipo")).where(
+            Docente.correo == correo
+        ),
+        select(Estudiante.id, literal("estudiante").label("tipo")).where(
+            Estudiante.correo == correo
+        ),
+        select(Padre.id, literal("padre").label("tipo")).where(Padre.correo == correo),
+    )
+
 
 class AuthService:
 
@@ -55,69 +95,48 @@ class AuthService:
     ) -> Optional[Tuple[Any, str]]:
         """Auto-detección del tipo de usuario"""
 
-        # Estrategia 1: Detectar por dominio del email (más eficiente)
-        if AuthService._is_admin_or_docente_email(correo):
+        # Estrategia 1: Detectar por dominio del email (lookup O(1))
+        dominio = correo.rpartition("@")[2].lower()
+        tipo_por_dominio = DOMAIN_TO_TYPE.get(dominio)
+
+        if tipo_por_dominio == "docente":
             logger.info(f"   🎯 Email de docente/admin detectado por dominio")
             result = AuthService._try_docente(db, correo, contrasena)
             if result:
                 return result
 
-        elif AuthService._is_estudiante_email(correo):
+        elif tipo_por_dominio == "estudiante":
             logger.info(f"   🎯 Email de estudiante detectado por dominio")
             result = AuthService._try_estudiante(db, correo, contrasena)
             if result:
                 return result
 
-        elif AuthService._is_padre_email(correo):
+        elif tipo_por_dominio == "padre":
             logger.info(f"   🎯 Email de padre detectado por dominio")
             result = AuthService._try_padre(db, correo, contrasena)
             if result:
                 return result
 
-        # Estrategia 2: Si no se detecta por dominio, buscar en todas las tablas
-        logger.info(f"   🔍 Dominio no reconocido, buscando en todas las tablas...")
-
-        # Intentar como docente/admin
-        result = AuthService._try_docente(db, correo, contrasena)
-        if result:
-            return result
-
-        # Intentar como estudiante
-        result = AuthService._try_estudiante(db, correo, contrasena)
-        if result:
-            return result
-
-        # Intentar como padre
-        result = AuthService._try_padre(db, correo, contrasena)
-        if result:
-            return result
+        # Estrategia 2: Si no se detecta por dominio, un solo UNION ALL
+        # sobre las tres tablas (en vez de hasta tres SELECTs secuenciales)
+        tipo = _tipo_usuario_cache.get(correo)
+        if tipo is None:
+            logger.info(f"   🔍 Dominio no reconocido, buscando con UNION ALL...")
+            fila = db.execute(_consulta_tipo_por_correo(correo)).first()
+            if fila:
+                tipo = fila.tipo
+                _tipo_usuario_cache[correo] = tipo
+
+        if tipo == "docente":
+            return AuthService._try_docente(db, correo, contrasena)
+        elif tipo == "estudiante":
+            return AuthService._try_estudiante(db, correo, contrasena)
+        elif tipo == "padre":
+            return AuthService._try_padre(db, correo, contrasena)
 
         logger.warning(f"🚫 No se encontró usuario con ese correo en ninguna tabla")
         return None
 
-    @staticmethod
-    def _is_admin_or_docente_email(correo: str) -> bool:
-        """Detectar si el email es de admin o docente por dominio"""
-        dominios_docente = [
-            "@colegio.edu.bo",
-            "@sistema.edu",
-            "@admin.edu",
-            "@docente.edu",
-        ]
-        return any(correo.endswith(dominio) for dominio in dominios_docente)
-
-    @staticmethod
-    def _is_estudiante_email(correo: str) -> bool:
-        """Detectar si el email es de estudiante por dominio"""
-        dominios_estudiante = ["@estudiante.edu.bo", "@student.edu", "@alumno.edu"]
-        return any(correo.endswith(dominio) for dominio in dominios_estudiante)
-
-    @staticmethod
-    def _is_padre_email(correo: str) -> bool:
-        """Detectar si el email es de padre por dominio"""
-        dominios_padre = ["@padre.com", "@madre.com", "@family.com", "@padres.edu"]
-        return any(correo.endswith(dominio) for dominio in dominios_padre)
-
     @staticmethod
     def _try_docente(
         db: Session, correo: str, contrasena: str
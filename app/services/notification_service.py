@@ -1,5 +1,6 @@
 # app/services/notification_service.py - SERVICIO ACTUALIZADO
 
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import desc
 from app.schemas.notificacion import NotificacionCreate
@@ -10,40 +11,47 @@ logger = logging.getLogger(__name__)
 
 
 class NotificationService:
+    @staticmethod
+    def cargar_evaluacion_para_notificar(db: Session, evaluacion_id: int):
+        """Evaluación con estudiante y materia ya cargados (un solo SELECT)"""
+        from app.models.evaluacion import Evaluacion
+
+        return (
+            db.query(Evaluacion)
+            .options(
+                joinedload(Evaluacion.estudiante),
+                joinedload(Evaluacion.materia),
+            )
+            .filter(Evaluacion.id == evaluacion_id)
+            .first()
+        )
+
     @staticmethod
     def notificar_evaluacion_completa(
-        db: Session, evaluacion_id: int, umbral_padres: float = 50.0
+        db: Session, evaluacion, umbral_padres: float = 50.0
     ) -> dict:
         """
         Notificación completa:
         - SIEMPRE notifica al estudiante (sin umbral)
         - Solo notifica a padres si está debajo del umbral
+
+        Recibe la Evaluacion ya cargada por el llamador (idealmente vía
+        cargar_evaluacion_para_notificar) en lugar de re-consultarla por id.
         """
         try:
-            from app.models.evaluacion import Evaluacion
             from app.models.padre_estudiante import PadreEstudiante
             from app.crud import notificacion as crud_notificacion
 
-            # Obtener la evaluación
-            evaluacion = (
-                db.query(Evaluacion)
-                .options(
-                    joinedload(Evaluacion.estudiante),
-                    joinedload(Evaluacion.materia),
-                    joinedload(Evaluacion.tipo_evaluacion),
-                )
-                .filter(Evaluacion.id == evaluacion_id)
-                .first()
-            )
-
             if not evaluacion:
-                logger.error(f"Evaluación {evaluacion_id} no encontrada")
+                logger.error("Evaluación no encontrada para notificar")
                 return {
                     "estudiante": [],
                     "padres": [],
                     "error": "Evaluación no encontrada",
                 }
 
+            evaluacion_id = evaluacion.id
+
             notificaciones_estudiante = []
             notificaciones_padres = []
 
@@ -155,10 +163,125 @@ class NotificationService:
                 "notificacion_padre_activada": evaluacion.valor < umbral_padres,
             }
 
-        except Exception as e:
+        except SQLAlchemyError as e:
             logger.error(f"Error en notificar_evaluacion_completa: {str(e)}")
             return {"estudiante": [], "padres": [], "error": str(e)}
 
+    @staticmethod
+    def notificar_evaluaciones_en_lote(
+        db: Session, evaluaciones, umbral_padres: float = 50.0
+    ) -> dict:
+        """Versión por lote de notificar_evaluacion_completa.
+
+        Prefetch de padres y de notificaciones ya existentes con un
+        SELECT IN(...) cada uno para todo el lote, y un solo commit al
+        final: el reenvío de una materia/periodo pasa de ~3 consultas por
+        evaluación a 3 por tanda. Las evaluaciones deben venir con
+        estudiante y materia ya cargados (joinedload).
+        """
+        try:
+            from app.models.padre_estudiante import PadreEstudiante
+            from app.crud import notificacion as crud_notificacion
+
+            Notificacion = crud_notificacion.Notificacion
+
+            evaluaciones = [e for e in evaluaciones if e is not None]
+            if not evaluaciones:
+                return {"estudiante": 0, "padres": 0}
+
+            est_ids = {e.estudiante_id for e in evaluaciones}
+            eval_ids = [e.id for e in evaluaciones]
+
+            # Padres de todos los estudiantes del lote en una consulta
+            padres_por_estudiante = {}
+            for relacion in db.query(PadreEstudiante).filter(
+                PadreEstudiante.estudiante_id.in_(est_ids)
+            ):
+                padres_por_estudiante.setdefault(
+                    relacion.estudiante_id, []
+                ).append(relacion.padre_id)
+
+            # Notificaciones ya emitidas para estas evaluaciones, para la
+            # deduplicación sin un SELECT por notificación
+            existentes_estudiante = set()
+            existentes_padre = set()
+            for fila in db.query(
+                Notificacion.evaluacion_id,
+                Notificacion.padre_id,
+                Notificacion.para_estudiante,
+                Notificacion.tipo,
+            ).filter(Notificacion.evaluacion_id.in_(eval_ids)):
+                if fila.para_estudiante:
+                    existentes_estudiante.add(fila.evaluacion_id)
+                elif fila.tipo == "calificacion_baja":
+                    existentes_padre.add((fila.evaluacion_id, fila.padre_id))
+
+            nuevas = []
+            total_estudiante = 0
+            total_padres = 0
+
+            for evaluacion in evaluaciones:
+                if evaluacion.id not in existentes_estudiante:
+                    nuevas.append(
+                        Notificacion(
+                            titulo=f"📝 Nueva Calificación - {evaluacion.materia.nombre}",
+                            mensaje=(
+                                f"Tu calificación en {evaluacion.descripcion} "
+                                f"de la materia {evaluacion.materia.nombre} es: {evaluacion.valor} puntos. "
+                                f"Fecha de evaluación: {evaluacion.fecha.strftime('%d/%m/%Y')}"
+                            ),
+                            tipo="evaluacion",
+                            padre_id=None,
+                            estudiante_id=evaluacion.estudiante_id,
+                            evaluacion_id=evaluacion.id,
+                            para_estudiante=True,
+                        )
+                    )
+                    total_estudiante += 1
+
+                if evaluacion.valor < umbral_padres:
+                    titulo_padre = (
+                        f"⚠️ Calificación Baja - {evaluacion.estudiante.nombre}"
+                    )
+                    mensaje_padre = (
+                        f"Su hijo(a) {evaluacion.estudiante.nombre} {evaluacion.estudiante.apellido} "
+                        f"obtuvo {evaluacion.valor} puntos en {evaluacion.descripcion} "
+                        f"de la materia {evaluacion.materia.nombre}. "
+                        f"Le recomendamos estar atento al rendimiento académico."
+                    )
+                    for padre_id in padres_por_estudiante.get(
+                        evaluacion.estudiante_id, []
+                    ):
+                        if (evaluacion.id, padre_id) in existentes_padre:
+                            continue
+                        nuevas.append(
+                            Notificacion(
+                                titulo=titulo_padre,
+                                mensaje=mensaje_padre,
+                                tipo="calificacion_baja",
+                                padre_id=padre_id,
+                                estudiante_id=evaluacion.estudiante_id,
+                                evaluacion_id=evaluacion.id,
+                                para_estudiante=False,
+                            )
+                        )
+                        total_padres += 1
+
+            if nuevas:
+                db.add_all(nuevas)
+                db.commit()
+                logger.info(
+                    f"Notificaciones en lote: {total_estudiante} estudiante, "
+                    f"{total_padres} padres ({len(evaluaciones)} evaluaciones)"
+                )
+
+            return {"estudiante": total_estudiante, "padres": total_padres}
+
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Error en notificar_evaluaciones_en_lote: {str(e)}")
+            return {"estudiante": 0, "padres": 0, "error": str(e)}
+
     @staticmethod
     def crear_notificacion_solo_estudiante(
         db: Session,
@@ -255,7 +378,13 @@ class NotificationService:
 
             # Obtener evaluaciones sin notificaciones para estudiantes
             evaluaciones = (
-                db.query(Evaluacion).filter(Evaluacion.fecha >= fecha_limite).all()
+                db.query(Evaluacion)
+                .options(
+                    joinedload(Evaluacion.estudiante),
+                    joinedload(Evaluacion.materia),
+                )
+                .filter(Evaluacion.fecha >= fecha_limite)
+                .all()
             )
 
             total_procesadas = 0
@@ -264,7 +393,7 @@ class NotificationService:
 
             for evaluacion in evaluaciones:
                 resultado = NotificationService.notificar_evaluacion_completa(
-                    db, evaluacion.id, umbral_padres
+                    db, evaluacion, umbral_padres
                 )
 
                 if "error" not in resultado:
@@ -290,8 +419,11 @@ class NotificationService:
         db: Session, evaluacion_id: int, umbral: float = 50.0
     ) -> List[int]:
         """Función de compatibilidad - ahora usa el sistema dual"""
+        evaluacion = NotificationService.cargar_evaluacion_para_notificar(
+            db, evaluacion_id
+        )
         resultado = NotificationService.notificar_evaluacion_completa(
-            db, evaluacion_id, umbral
+            db, evaluacion, umbral
         )
         # Retorna solo las notificaciones de padres para mantener compatibilidad
         return resultado.get("padres", [])
@@ -304,9 +436,12 @@ class NotificationService:
         umbral: float = 50.0,
     ) -> List[int]:
         """Función de compatibilidad - ahora usa el sistema dual"""
+        evaluacion = NotificationService.cargar_evaluacion_para_notificar(
+            db, evaluacion_id
+        )
         if solo_calificaciones_bajas:
             resultado = NotificationService.notificar_evaluacion_completa(
-                db, evaluacion_id, umbral
+                db, evaluacion, umbral
             )
             # Retorna notificaciones de padres y estudiantes
             notificaciones = resultado.get("padres", []) + resultado.get(
@@ -316,7 +451,7 @@ class NotificationService:
         else:
             # Forzar notificación (establecer umbral muy alto)
             resultado = NotificationService.notificar_evaluacion_completa(
-                db, evaluacion_id, 100.0
+                db, evaluacion, 100.0
             )
             notificaciones = resultado.get("padres", []) + resultado.get(
                 "estudiante", []
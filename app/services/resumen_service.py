@@ -0,0 +1,186 @@
+# app/services/resumen_service.py - Núcleo compartido de los resúmenes
+
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.cache.lookup_cache import cache_de_modelo
+from app.crud import tipo_evaluacion as tipo_crud
+from app.models import Evaluacion, PesoTipoEvaluacion
+
+# Los dashboards de notas son muy leídos y el resumen solo depende de
+# Evaluacion y PesoTipoEvaluacion: las escrituras ORM sobre esos modelos
+# invalidan el cache vía los eventos del mapper.
+_cache_resumen = cache_de_modelo(
+    Evaluacion, PesoTipoEvaluacion, maxsize=10_000, ttl=600
+)
+
+
+def invalidar_cache_resumen():
+    """Invalida todos los resúmenes cacheados.
+
+    Los registros masivos insertan con Core (insert().returning()), que
+    no pasa por los eventos del mapper, así que esos endpoints deben
+    invalidar explícitamente después del commit.
+    """
+    _cache_resumen.clear()
+
+
+def calcular_resumen(
+    db: Session,
+    estudiante_id: int,
+    materia_id: int,
+    periodo_id: int,
+    docente_id: Optional[int] = None,
+    gestion_id: Optional[int] = None,
+    incluir_detalle: bool = False,
+) -> dict:
+    """Resumen por tipo de evaluación de un estudiante en una materia/periodo.
+
+    Los cuatro endpoints de resumen del router de evaluaciones comparten
+    este cálculo; cualquier optimización hecha acá aplica a todas las
+    rutas. Sin docente_id/gestion_id devuelve promedios simples; con
+    ambos, pondera cada tipo por los pesos del docente y calcula
+    promedio_general (los tipos sin peso definido se omiten).
+
+    Los agregados (promedio, total, presentes) se calculan en SQL con un
+    GROUP BY por tipo; el detalle de evaluaciones solo se consulta si
+    incluir_detalle es True.
+
+    Devuelve {"resumen": {...}, "promedio_general": float | None}.
+
+    El resultado queda memoizado por (estudiante, materia, periodo,
+    docente, gestion, detalle) hasta la próxima escritura sobre
+    Evaluacion/PesoTipoEvaluacion o el vencimiento del TTL.
+    """
+    clave = (
+        estudiante_id,
+        materia_id,
+        periodo_id,
+        docente_id,
+        gestion_id,
+        incluir_detalle,
+    )
+    calculado = _cache_resumen.get(clave)
+    if calculado is not None:
+        return calculado
+
+    # Lista de tipos e id de "Asistencia" desde el cache de proceso del
+    # crud: cero SELECTs sobre la tabla de referencia una vez poblado
+    tipos = sorted(tipo_crud.listar_tipos(db), key=lambda t: t.id)
+    asistencia_id = tipo_crud.obtener_id_por_nombre(db, "Asistencia")
+
+    con_pesos = docente_id is not None and gestion_id is not None
+    pesos_por_tipo = {}
+    if con_pesos:
+        # Pesos del docente en una sola consulta, indexados por tipo
+        pesos_por_tipo = {
+            p.tipo_evaluacion_id: p
+            for p in db.scalars(
+                select(PesoTipoEvaluacion).where(
+                    PesoTipoEvaluacion.docente_id == docente_id,
+                    PesoTipoEvaluacion.materia_id == materia_id,
+                    PesoTipoEvaluacion.gestion_id == gestion_id,
+                )
+            )
+        }
+
+    # Agregados por tipo calculados en SQL: el request solo transfiere
+    # una fila por tipo; las filas crudas se cargan únicamente si el
+    # caller pide el detalle.
+    filtros = (
+        Evaluacion.estudiante_id == estudiante_id,
+        Evaluacion.materia_id == materia_id,
+        Evaluacion.periodo_id == periodo_id,
+    )
+    agregados_por_tipo = {
+        fila.tipo_evaluacion_id: fila
+        for fila in db.execute(
+            select(
+                Evaluacion.tipo_evaluacion_id,
+                func.avg(Evaluacion.valor).label("promedio"),
+                func.count().label("total"),
+                func.sum(case((Evaluacion.valor >= 1, 1), else_=0)).label(
+                    "presentes"
+                ),
+            )
+            .where(*filtros)
+            .group_by(Evaluacion.tipo_evaluacion_id)
+        )
+    }
+
+    detalle_por_tipo = defaultdict(list)
+    if incluir_detalle:
+        filas_detalle = db.execute(
+            select(
+                Evaluacion.tipo_evaluacion_id,
+                Evaluacion.fecha,
+                Evaluacion.descripcion,
+                Evaluacion.valor,
+            ).where(*filtros)
+        )
+        for fila in filas_detalle:
+            detalle_por_tipo[fila.tipo_evaluacion_id].append(
+                {
+                    "fecha": fila.fecha,
+                    "descripcion": fila.descripcion,
+                    "valor": fila.valor,
+                }
+            )
+
+    resumen = {}
+    total_ponderado = 0
+    total_puntos = 0
+
+    for tipo in tipos:
+        agregado = agregados_por_tipo.get(tipo.id)
+        if agregado is None:
+            continue
+
+        if con_pesos:
+            peso = pesos_por_tipo.get(tipo.id)
+            if not peso:
+                continue  # si no hay peso definido, lo omitimos
+            puntos_tipo = peso.porcentaje
+
+        key = str(tipo.id)
+        detalle = detalle_por_tipo.get(tipo.id, [])
+
+        if tipo.id == asistencia_id:
+            porcentaje = round((agregado.presentes / agregado.total) * 100, 2)
+            resumen[key] = {
+                "id": tipo.id,
+                "nombre": tipo.nombre,
+                "porcentaje": porcentaje,
+                "total": agregado.total,
+                "detalle": detalle,
+            }
+        else:
+            promedio = round(agregado.promedio, 2)
+            resumen[key] = {
+                "id": tipo.id,
+                "nombre": tipo.nombre,
+                "promedio": promedio,
+                "total": agregado.total,
+                "detalle": detalle,
+            }
+            if con_pesos:
+                total_ponderado += promedio * (puntos_tipo / 100)
+                total_puntos += puntos_tipo
+
+        if con_pesos:
+            resumen[key]["puntos"] = puntos_tipo
+
+    promedio_general = None
+    if con_pesos:
+        promedio_general = (
+            round((total_ponderado / total_puntos) * 100, 2)
+            if total_puntos > 0
+            else 0.0
+        )
+
+    calculado = {"resumen": resumen, "promedio_general": promedio_general}
+    _cache_resumen[clave] = calculado
+    return calculado
@@ -3,6 +3,8 @@ import math
 from typing import Tuple, Dict, List
 from dataclasses import dataclass
 
+import numpy as np
+
 
 @dataclass
 class Coordenada:
@@ -27,6 +29,28 @@ class AreaGeografica:
     nombre: str = "Área"
 
 
+def haversine_batch(lat0: float, lon0: float, lats, lons) -> np.ndarray:
+    """Distancias Haversine de un punto a muchos puntos, vectorizado.
+
+    Para monitoreo en vivo ("distancia del docente a cada estudiante")
+    calcular en un loop de Python con math.sin/cos es 20-50x más lento.
+    Recibe listas o arrays de latitudes/longitudes y retorna un array
+    de distancias en metros.
+    """
+    lats = np.radians(np.asarray(lats, dtype=np.float64))
+    lons = np.radians(np.asarray(lons, dtype=np.float64))
+    phi0 = math.radians(lat0)
+    lam0 = math.radians(lon0)
+
+    dphi = lats - phi0
+    dlam = lons - lam0
+
+    a = np.sin(dphi / 2) ** 2 + math.cos(phi0) * np.cos(lats) * np.sin(dlam / 2) ** 2
+    distancias = 2 * GeolocalizacionUtils.RADIO_TIERRA_METROS * np.arcsin(np.sqrt(a))
+
+    return np.round(distancias, 2)
+
+
 class GeolocalizacionUtils:
     """Utilidades para cálculos geográficos y validaciones"""
 
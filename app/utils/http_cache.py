@@ -0,0 +1,33 @@
+# app/utils/http_cache.py
+import hashlib
+
+import orjson
+from fastapi import Request, Response
+
+
+def respuesta_con_etag(
+    request: Request, payload, cache_control: str = None
+) -> Response:
+    """Respuesta JSON con ETag calculado por hash del contenido.
+
+    Si el If-None-Match del cliente coincide con el hash, devuelve 304
+    sin cuerpo: el cliente reutiliza su copia y el servidor se ahorra
+    la transferencia. El payload se serializa una sola vez con orjson.
+    Con cache_control el navegador ni siquiera consulta durante esa
+    ventana (p. ej. "private, max-age=60").
+    """
+    cuerpo = orjson.dumps(payload)
+    etag = hashlib.blake2b(cuerpo, digest_size=16).hexdigest()
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+
+    return Response(
+        content=cuerpo,
+        media_type="application/json",
+        headers=headers,
+    )
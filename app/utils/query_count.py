@@ -0,0 +1,33 @@
+# app/utils/query_count.py
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.database import engine
+
+
+@contextmanager
+def contar_consultas():
+    """Cuenta las consultas SQL emitidas dentro del bloque.
+
+    Guardia manual contra regresiones N+1 en los endpoints optimizados
+    (el proyecto no tiene suite de tests). Uso típico en una sesión de
+    diagnóstico local:
+
+        with contar_consultas() as consultas:
+            client.get("/estudiantes/dashboard-academico", headers=...)
+        assert len(consultas) <= 2, consultas
+
+    La lista acumula cada sentencia ejecutada, así que ante un exceso
+    se puede inspeccionar qué SELECT se coló.
+    """
+    consultas = []
+
+    def _registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _registrar)
+    try:
+        yield consultas
+    finally:
+        event.remove(engine, "before_cursor_execute", _registrar)